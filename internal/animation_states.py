@@ -0,0 +1,208 @@
+"""
+Модуль автомата анимаций бойцов.
+Состояния (анимации), их флаги и переходы по событиям описаны
+таблицей STATES. Для каждого персонажа таблица один раз компилируется
+в списки, индексируемые номерами состояний и событий, так что шаг
+бойца сводится к нескольким обращениям к спискам вместо сравнения
+имён анимаций. Набор атак, их стоимость, длительность кадров
+и особые переходы персонажа берутся из таблицы персонажей.
+"""
+
+from projectiles import RANGED_ATTACKS
+
+# События автомата
+EVENTS = ("move", "stop", "jump", "attack", "end")
+MOVE, STOP, JUMP, ATTACK, END = range(len(EVENTS))
+
+# Цель перехода: случайная атака из доступных персонажу
+RANDOM_ATTACK = "*attack"
+# Цель перехода: случайная анимация бездействия (равновероятно)
+RANDOM_IDLE = (("idle", 1), ("idle_2", 1))
+
+# Состояние каждой атаки персонажа
+ATTACK_STATE = {
+    "loop": False,
+    "interruptible": False,
+    # Новая атака начинается только после окончания текущей
+    # (нажатие атаки ждёт в буфере ввода)
+    "on": {"jump": "jump", "end": "idle"},
+}
+
+# Состояния автомата:
+# loop — анимация повторяется, иначе по её окончании происходит
+# событие end; interruptible — движение прерывает анимацию (иначе
+# персонаж только смещается, не меняя анимацию); on — переходы
+# {событие: цель}. Цель — имя состояния, RANDOM_ATTACK или пары
+# (состояние, вес) для случайного выбора. Состояния и цели, которых
+# нет среди анимаций персонажа, пропускаются.
+# Атаки персонажа получают состояние ATTACK_STATE.
+STATES = {
+    "idle": {
+        "loop": False,
+        "interruptible": True,
+        "on": {
+            "move": "walk",
+            "jump": "jump",
+            "attack": RANDOM_ATTACK,
+            "end": RANDOM_IDLE,
+        },
+    },
+    "idle_2": {
+        "loop": False,
+        "interruptible": True,
+        "on": {
+            "move": "walk",
+            "jump": "jump",
+            "attack": RANDOM_ATTACK,
+            "end": RANDOM_IDLE,
+        },
+    },
+    "walk": {
+        "loop": True,
+        "interruptible": True,
+        "on": {"stop": "idle", "jump": "jump", "attack": RANDOM_ATTACK},
+    },
+    "jump": {
+        "loop": False,
+        "interruptible": True,
+        "on": {
+            "move": "walk",
+            "stop": "idle",
+            "attack": RANDOM_ATTACK,
+            "end": "idle",
+        },
+    },
+}
+
+
+class AnimationMachine:
+    """
+    Автомат анимаций персонажа, скомпилированный в списки.
+    Состояние — номер в names; переходы — transitions[состояние][событие]:
+    None или пара (номера целей, накопленные веса или None).
+    """
+
+    def __init__(self, kind, table, frame_counts):
+        """
+        Компиляция таблицы STATES для персонажа.
+
+        :param kind: Номер персонажа в таблице персонажей.
+        :param table: Таблица персонажей (CharacterTable).
+        :param frame_counts: Словарь {анимация: число кадров}.
+        """
+        character = table.names[kind]
+        attacks = table.attack_costs[kind]
+        specs = {
+            **STATES,
+            **{name: ATTACK_STATE for name in table.attacks[kind]},
+        }
+        self.names = [name for name in specs if name in frame_counts]
+        self.ids = {name: state for state, name in enumerate(self.names)}
+        self.idle = self.ids["idle"]
+        self.attacks = tuple(
+            self.ids[name] for name in table.attacks[kind] if name in self.ids
+        )
+        self.frame_counts = [frame_counts[name] for name in self.names]
+        self.loops = [specs[name]["loop"] for name in self.names]
+        self.interruptible = [
+            specs[name]["interruptible"] for name in self.names
+        ]
+        # Стоимость перехода в состояние (маной или выносливостью)
+        self.costs = [attacks.get(name, 0) for name in self.names]
+        # Длительность каждого кадра анимации в миллисекундах
+        self.frame_durations = [
+            table.frame_durations(kind, name, frame_counts[name])
+            for name in self.names
+        ]
+        # Кадр удара или выстрела (-1, если анимация не атакует)
+        self.strike_frames = [-1] * len(self.names)
+        for state in self.attacks:
+            name = self.names[state]
+            ranged = RANGED_ATTACKS.get((character, name))
+            self.strike_frames[state] = (
+                # Удар наносится на среднем кадре анимации атаки
+                ranged[0] if ranged else frame_counts[name] // 2
+            )
+        # Особые переходы персонажа дополняют общие
+        overrides = table.transitions[kind]
+        self.transitions = []
+        for name in self.names:
+            on = {**specs[name]["on"], **overrides.get(name, {})}
+            self.transitions.append(
+                [self._compile_target(on.get(event)) for event in EVENTS]
+            )
+
+    def _compile_target(self, target):
+        """Цель перехода в виде (номера состояний, накопленные веса)."""
+        if target is None:
+            return None
+        if target == RANDOM_ATTACK:
+            return (self.attacks, None) if self.attacks else None
+        if isinstance(target, str):
+            target = ((target, 1),)
+        states, weights = [], []
+        for name, weight in target:
+            if name in self.ids:
+                states.append(self.ids[name])
+                weights.append(weight + (weights[-1] if weights else 0))
+        if not states:
+            return None
+        return tuple(states), tuple(weights) if len(states) > 1 else None
+
+    def next_state(self, state, event, rng):
+        """
+        Состояние после события.
+
+        :param state: Текущее состояние.
+        :param event: Событие (MOVE, STOP, JUMP, ATTACK или END).
+        :param rng: Генератор случайных чисел для случайных переходов.
+        :return: Новое состояние или -1, если перехода нет.
+        """
+        target = self.transitions[state][event]
+        if target is None:
+            return -1
+        states, weights = target
+        if len(states) == 1:
+            return states[0]
+        if weights is None:
+            return rng.choice(states)
+        return rng.choices(states, cum_weights=weights)[0]
+
+
+class AnimationClock:
+    """
+    Часы одной анимации вне боя (например, на экране выбора
+    персонажей): кадры переключаются по прошедшему времени,
+    пропущенные кадры догоняются.
+    """
+
+    def __init__(self):
+        """Часы на первом кадре."""
+        self.frame = 0
+        self.time = 0.0  # Время, прошедшее на текущем кадре
+        self.last = None  # Время последнего вызова advance
+
+    def reset(self):
+        """Возврат к первому кадру (при смене анимации)."""
+        self.frame = 0
+        self.time = 0.0
+
+    def advance(self, now, durations):
+        """
+        Продвижение часов до текущего времени.
+
+        :param now: Текущее время в миллисекундах.
+        :param durations: Длительности кадров анимации.
+        :return: Номер текущего кадра.
+        """
+        if self.last is not None:
+            self.time += now - self.last
+        self.last = now
+        if self.frame >= len(durations):
+            self.reset()
+        # После долгой паузы целые круги анимации пропускаются
+        self.time %= sum(durations)
+        while self.time >= durations[self.frame]:
+            self.time -= durations[self.frame]
+            self.frame = (self.frame + 1) % len(durations)
+        return self.frame
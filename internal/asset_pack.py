@@ -0,0 +1,185 @@
+"""
+Модуль архива ресурсов.
+Упаковывает папку assets в один файл с индексом в заголовке
+и читает его через mmap без распаковки во временные файлы.
+
+Формат архива (все числа little-endian):
+    заголовок: b"GPAK", версия (uint16), количество записей (uint32);
+    индекс: для каждой записи длина имени (uint16), имя (UTF-8),
+    смещение (uint64), размер (uint64), формат (4 байта, расширение);
+    далее данные файлов подряд.
+
+Кадры персонажей, уже упакованные в листы атласа, в архив не попадают.
+
+Сборка архива (после сборки атласов):
+    python asset_pack.py
+"""
+
+import io
+import json
+import mmap
+import os
+import struct
+
+PACK_MAGIC = b"GPAK"
+PACK_VERSION = 1
+PACK_NAME = "assets.pak"  # Имя архива относительно ресурсов
+
+HEADER = struct.Struct("<4sHI")
+NAME_LENGTH = struct.Struct("<H")
+ENTRY = struct.Struct("<QQ4s")
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Файловый объект для чтения из буфера без копирования всего буфера.
+    Позволяет декодировать изображение прямо из отображённой памяти.
+    """
+
+    def __init__(self, buffer):
+        """
+        :param buffer: Буфер с данными (bytes или memoryview).
+        """
+        super().__init__()
+        self.buffer = memoryview(buffer)
+        self.position = 0
+
+    def readable(self):
+        """Объект поддерживает чтение."""
+        return True
+
+    def seekable(self):
+        """Объект поддерживает перемещение по буферу."""
+        return True
+
+    def readinto(self, target):
+        """Чтение данных в переданный буфер."""
+        chunk = self.buffer[self.position : self.position + len(target)]
+        target[: len(chunk)] = chunk
+        self.position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """Перемещение позиции чтения."""
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.buffer)
+        self.position = max(0, min(offset, len(self.buffer)))
+        return self.position
+
+    def tell(self):
+        """Текущая позиция чтения."""
+        return self.position
+
+
+def pack_name(path, root):
+    """Имя файла в архиве: путь относительно root через "/"."""
+    return os.path.relpath(path, root).replace(os.sep, "/")
+
+
+def build_pack(src_dir, out_path, root=None, exclude=()):
+    """
+    Сборка архива из папки с ресурсами.
+
+    :param src_dir: Папка, файлы которой попадут в архив.
+    :param out_path: Путь к создаваемому архиву.
+    :param root: Папка, относительно которой записываются имена файлов
+    (по умолчанию родительская папка src_dir).
+    :param exclude: Имена файлов (относительно root), которые
+    не попадают в архив.
+    :return: Количество файлов в архиве.
+    """
+    root = root or os.path.dirname(os.path.abspath(src_dir))
+    exclude = set(exclude)
+    files = sorted(
+        path
+        for folder, _, names in os.walk(src_dir)
+        for path in (os.path.join(folder, name) for name in names)
+        if pack_name(path, root) not in exclude
+    )
+    names = [pack_name(path, root).encode("utf-8") for path in files]
+    sizes = [os.path.getsize(path) for path in files]
+
+    # Данные начинаются сразу после заголовка и индекса
+    offset = HEADER.size + sum(
+        NAME_LENGTH.size + len(name) + ENTRY.size for name in names
+    )
+    with open(out_path, "wb") as pack_file:
+        pack_file.write(HEADER.pack(PACK_MAGIC, PACK_VERSION, len(files)))
+        for name, size, path in zip(names, sizes, files):
+            file_format = os.path.splitext(path)[1][1:5].lower().encode()
+            pack_file.write(NAME_LENGTH.pack(len(name)))
+            pack_file.write(name)
+            pack_file.write(ENTRY.pack(offset, size, file_format))
+            offset += size
+        for path in files:
+            with open(path, "rb") as src_file:
+                pack_file.write(src_file.read())
+    return len(files)
+
+
+class AssetPack:
+    """
+    Архив ресурсов, отображённый в память через mmap.
+    Данные файлов отдаются как memoryview без копирования.
+    """
+
+    def __init__(self, path):
+        """
+        Открытие архива и чтение индекса.
+
+        :param path: Путь к файлу архива.
+        """
+        with open(path, "rb") as pack_file:
+            self.data = mmap.mmap(
+                pack_file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        magic, version, count = HEADER.unpack_from(self.data, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"Неподдерживаемый архив ресурсов: {path}")
+
+        self.index = {}  # Имя -> (смещение, размер, формат)
+        position = HEADER.size
+        for _ in range(count):
+            (name_length,) = NAME_LENGTH.unpack_from(self.data, position)
+            position += NAME_LENGTH.size
+            name = self.data[position : position + name_length].decode()
+            position += name_length
+            offset, size, file_format = ENTRY.unpack_from(self.data, position)
+            position += ENTRY.size
+            self.index[name] = (offset, size, file_format.rstrip(b"\0"))
+
+    def __contains__(self, name):
+        """Проверка наличия файла в архиве."""
+        return name in self.index
+
+    def view(self, name):
+        """Содержимое файла в виде memoryview на отображённую память."""
+        offset, size, _ = self.index[name]
+        return memoryview(self.data)[offset : offset + size]
+
+
+def main():
+    """
+    Сборка архива из папки assets рядом с модулем
+    без кадров, которые уже есть в листах атласа.
+    """
+    # Импорт в функции: helper импортирует этот модуль, а atlas — helper
+    from atlas import atlas_frame_paths  # pylint: disable=C0415,R0401
+
+    base_path = os.path.abspath(os.path.dirname(__file__))
+    # Манифест читается с диска, а не из старого архива
+    manifest_path = os.path.join(base_path, "assets", "manifest.json")
+    with open(manifest_path, encoding="utf-8") as manifest_file:
+        exclude = atlas_frame_paths(json.load(manifest_file))
+    count = build_pack(
+        os.path.join(base_path, "assets"),
+        os.path.join(base_path, PACK_NAME),
+        exclude=exclude,
+    )
+    print(f"{PACK_NAME}: {count} файлов")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""
+Модуль менеджера ресурсов.
+Хранит загруженные поверхности в пределах бюджета памяти,
+считает ссылки на используемые ресурсы и вытесняет неиспользуемые.
+Изображения адресуются по хэшу содержимого файла, поэтому одинаковые
+файлы декодируются один раз, даже если загружаются разными модулями.
+"""
+
+import hashlib
+import os
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Sequence
+
+import pygame
+from asset_pack import BufferReader
+from constants import ASSET_BUDGET_MB
+from helper import read_resource, resource_path
+from profiler import boot_profiler
+
+
+def content_digest(data):
+    """Хэш содержимого файла, по которому адресуются изображения."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def asset_path(path):
+    """Нормализованный полный путь к ресурсу."""
+    return os.path.normpath(resource_path(path))
+
+
+def read_image_file(full_path):
+    """
+    Чтение файла изображения (из архива ресурсов или с диска).
+
+    :return: Кортеж (хэш содержимого, байты файла).
+    """
+    data = read_resource(full_path)
+    return content_digest(data), data
+
+
+def decode_image_data(data, full_path):
+    """Декодирование изображения из байтов файла или отображённой памяти."""
+    started = time.perf_counter()
+    surface = pygame.image.load(
+        BufferReader(data), os.path.basename(full_path)
+    )
+    boot_profiler.record_decode(
+        full_path,
+        len(data),
+        surface_bytes(surface),
+        time.perf_counter() - started,
+    )
+    return surface
+
+
+def surface_bytes(surface):
+    """Объём пикселей поверхности в байтах."""
+    return surface.get_pitch() * surface.get_height()
+
+
+class AssetManager:
+    """
+    Менеджер ресурсов с бюджетом памяти.
+    Ресурсы с ненулевым счётчиком ссылок не вытесняются,
+    остальные удаляются в порядке давности использования (LRU).
+    """
+
+    def __init__(self, budget_bytes):
+        """
+        Инициализация менеджера.
+
+        :param budget_bytes: Бюджет памяти под ресурсы в байтах.
+        """
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()  # Ключ -> (ресурс, размер в байтах)
+        self.refs = {}  # Ключ -> количество ссылок
+        self.size_bytes = 0
+        self.evictions = 0
+        self.digests = {}  # Полный путь -> хэш содержимого файла
+        self.names = {}  # Хэш содержимого -> путь (для отчёта)
+        # Хэш содержимого -> декодированная поверхность, пока она
+        # используется хоть где-то в игре
+        self.decoded = weakref.WeakValueDictionary()
+        self.decodes = 0
+        self.decode_hits = 0
+
+    def get(self, key):
+        """
+        Получение ресурса по ключу.
+
+        :return: Ресурс или None, если его нет в менеджере.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def peek(self, key):
+        """Получение ресурса без обновления порядка вытеснения."""
+        entry = self.entries.get(key)
+        return None if entry is None else entry[0]
+
+    def put(self, key, value, size_bytes):
+        """
+        Добавление или обновление ресурса.
+
+        :param key: Ключ ресурса.
+        :param value: Ресурс (поверхность или набор поверхностей).
+        :param size_bytes: Занимаемая ресурсом память в байтах.
+        """
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size_bytes -= old[1]
+        self.entries[key] = (value, size_bytes)
+        self.size_bytes += size_bytes
+        self.trim()
+        return value
+
+    def decode(self, path):
+        """
+        Декодирование изображения с учётом уже декодированных копий.
+        Если файл с таким же содержимым уже декодирован и используется,
+        возвращается та же поверхность.
+
+        :param path: Путь к изображению относительно ресурсов.
+        :return: Кортеж (хэш содержимого, поверхность).
+        """
+        full_path = asset_path(path)
+        digest = self.digests.get(full_path)
+        surface = None if digest is None else self.decoded.get(digest)
+        if surface is None:
+            digest, data = read_image_file(full_path)
+            self.digests[full_path] = digest
+            self.names.setdefault(digest, path)
+            surface = self.decoded.get(digest)
+        if surface is None:
+            surface = decode_image_data(data, full_path)
+            self.decoded[digest] = surface
+            self.decodes += 1
+        else:
+            self.decode_hits += 1
+        return digest, surface
+
+    def add_decoded(self, path, digest, surface):
+        """
+        Регистрация изображения, декодированного вне менеджера
+        (например, фоновым загрузчиком).
+
+        :param path: Путь к изображению относительно ресурсов.
+        :param digest: Хэш содержимого файла.
+        :param surface: Декодированная поверхность.
+        :return: Поверхность, хранящаяся в менеджере.
+        """
+        self.digests[asset_path(path)] = digest
+        self.names.setdefault(digest, path)
+        existing = self.decoded.get(digest)
+        if existing is not None:
+            # Изображение уже успели декодировать синхронно: его память
+            # учтена там, где оно хранится
+            self.decode_hits += 1
+            return existing
+        self.decoded[digest] = surface
+        self.decodes += 1
+        self.put(("image", digest, None), surface, surface_bytes(surface))
+        return surface
+
+    def load_image(self, path, size=None):
+        """
+        Загрузка изображения через менеджер.
+
+        :param path: Путь к изображению относительно ресурсов.
+        :param size: Размер (ширина, высота), до которого нужно
+        масштабировать изображение (опционально).
+        :return: Поверхность с изображением.
+        """
+        digest = self.digests.get(asset_path(path))
+        surface = None if digest is None else self.get(("image", digest, size))
+        if surface is None:
+            digest, surface = self.decode(path)
+            if size is not None:
+                surface = pygame.transform.scale(surface, size)
+            self.put(("image", digest, size), surface, surface_bytes(surface))
+        return surface
+
+    def discard(self, key):
+        """
+        Удаление ресурса из менеджера (например, когда им завладел
+        другой ресурс, и его память учитывается там).
+        Закреплённый ресурс не удаляется.
+        """
+        if key in self.refs or key not in self.entries:
+            return
+        _, size_bytes = self.entries.pop(key)
+        self.size_bytes -= size_bytes
+
+    def image_key(self, path, size=None):
+        """
+        Ключ изображения в менеджере.
+
+        :return: Ключ или None, если файл ещё не читался.
+        """
+        digest = self.digests.get(asset_path(path))
+        return None if digest is None else ("image", digest, size)
+
+    def acquire(self, key):
+        """Увеличение счётчика ссылок: ресурс не будет вытеснен."""
+        self.refs[key] = self.refs.get(key, 0) + 1
+
+    def release(self, key):
+        """Уменьшение счётчика ссылок на ресурс."""
+        count = self.refs.get(key, 0) - 1
+        if count > 0:
+            self.refs[key] = count
+        else:
+            self.refs.pop(key, None)
+            self.trim()
+
+    def trim(self):
+        """Вытеснение неиспользуемых ресурсов сверх бюджета."""
+        if self.size_bytes <= self.budget_bytes:
+            return
+        for key in list(self.entries):
+            if self.size_bytes <= self.budget_bytes:
+                break
+            if key in self.refs:
+                continue
+            _, size_bytes = self.entries.pop(key)
+            self.size_bytes -= size_bytes
+            self.evictions += 1
+
+    def report(self):
+        """
+        Отчёт о содержимом менеджера.
+
+        :return: Словарь с бюджетом, занятой памятью и списком ресурсов
+        от давно использованных к недавним.
+        """
+        return {
+            "budget_bytes": self.budget_bytes,
+            "size_bytes": self.size_bytes,
+            "evictions": self.evictions,
+            "decodes": self.decodes,
+            "decode_hits": self.decode_hits,
+            "entries": [
+                {
+                    "key": key,
+                    "name": self.names.get(key[1], key[1]),
+                    "size_bytes": size_bytes,
+                    "refs": self.refs.get(key, 0),
+                }
+                for key, (_, size_bytes) in self.entries.items()
+            ],
+        }
+
+
+class ImageList(Sequence):
+    """
+    Список изображений, загружаемых через менеджер по индексу.
+    Заменяет список заранее загруженных поверхностей.
+    """
+
+    def __init__(self, manager, paths):
+        """
+        :param manager: Менеджер ресурсов.
+        :param paths: Пути к изображениям относительно ресурсов.
+        """
+        self.manager = manager
+        self.paths = list(paths)
+
+    def __getitem__(self, index):
+        """Поверхность изображения с указанным индексом."""
+        return self.manager.load_image(self.paths[index])
+
+    def __len__(self):
+        """Количество изображений."""
+        return len(self.paths)
+
+
+# Общий менеджер ресурсов игры
+# (бюджет можно переопределить переменной окружения GAME_ASSET_BUDGET_MB)
+asset_manager = AssetManager(
+    int(os.environ.get("GAME_ASSET_BUDGET_MB", ASSET_BUDGET_MB)) * 1024 * 1024
+)
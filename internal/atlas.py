@@ -0,0 +1,173 @@
+"""
+Модуль текстурных атласов персонажей.
+Упаковывает кадры анимаций каждого персонажа в один или несколько листов
+и загружает их обратно в виде подповерхностей (subsurface).
+Расположение кадров в листах хранится в манифесте анимаций.
+
+Сборка манифеста, атласов и форм кадров для столкновений
+(офлайн, перед запуском или сборкой бинарника):
+    python atlas.py
+"""
+
+import os
+
+import pygame
+from assets import asset_manager
+from helper import resource_path
+from manifest import frame_path, save_manifest, scan_characters
+from shapes import SHAPES_DIR, build_shapes
+
+ATLAS_DIR = "assets/atlas"  # Папка с атласами относительно ресурсов
+ATLAS_MAX_SIZE = 2048  # Максимальный размер листа атласа (в пикселях)
+
+
+def pack_rects(sizes, max_size=ATLAS_MAX_SIZE):
+    """
+    Упаковка прямоугольников по полкам (shelf packing).
+
+    :param sizes: Список размеров (ширина, высота).
+    :param max_size: Максимальная ширина и высота листа.
+    :return: Список позиций (лист, x, y) в порядке входных размеров
+    и список размеров листов [(ширина, высота), ...].
+    """
+    positions = [None] * len(sizes)
+    sheets = []
+    sheet, shelf_x, shelf_y, shelf_height = 0, 0, 0, 0
+    used_width, used_height = 0, 0
+
+    # Высокие прямоугольники первыми, чтобы полки заполнялись плотнее
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    for i in order:
+        width, height = sizes[i]
+        if width > max_size or height > max_size:
+            raise ValueError(f"Кадр {width}x{height} не помещается в атлас")
+        if shelf_x + width > max_size:
+            # Переходим на следующую полку
+            shelf_y += shelf_height
+            shelf_x, shelf_height = 0, 0
+        if shelf_y + height > max_size:
+            # Текущий лист заполнен, начинаем новый
+            sheets.append((used_width, used_height))
+            sheet += 1
+            shelf_x, shelf_y, shelf_height = 0, 0, 0
+            used_width, used_height = 0, 0
+        positions[i] = (sheet, shelf_x, shelf_y)
+        shelf_x += width
+        shelf_height = max(shelf_height, height)
+        used_width = max(used_width, shelf_x)
+        used_height = max(used_height, shelf_y + shelf_height)
+    if used_width and used_height:
+        sheets.append((used_width, used_height))
+    return positions, sheets
+
+
+def build_atlas(character, entry, out_dir, max_size=ATLAS_MAX_SIZE):
+    """
+    Сборка атласа одного персонажа.
+    Записывает в запись манифеста имена листов и расположение кадров.
+
+    :param character: Имя персонажа.
+    :param entry: Запись персонажа в манифесте.
+    :param out_dir: Папка, куда сохраняются листы атласа.
+    :param max_size: Максимальный размер листа.
+    :return: Имена листов атласа.
+    """
+    frame_keys = [
+        (name, i)
+        for name, animation in entry["animations"].items()
+        for i in range(animation["count"])
+    ]
+    images = [
+        pygame.image.load(
+            resource_path(
+                frame_path(character, entry["animations"][name]["folder"], i)
+            )
+        )
+        for name, i in frame_keys
+    ]
+    positions, sheet_sizes = pack_rects(
+        [image.get_size() for image in images], max_size
+    )
+
+    sheets = [
+        pygame.Surface(size, pygame.SRCALPHA, 32) for size in sheet_sizes
+    ]
+    for animation in entry["animations"].values():
+        animation["offsets"] = []
+    for (name, _), image, (sheet, x, y) in zip(frame_keys, images, positions):
+        sheets[sheet].blit(image, (x, y))
+        entry["animations"][name]["offsets"].append(
+            [sheet, x, y, image.get_width(), image.get_height()]
+        )
+
+    os.makedirs(out_dir, exist_ok=True)
+    entry["sheets"] = []
+    for index, surface in enumerate(sheets):
+        sheet_name = f"{character}_{index}.png"
+        pygame.image.save(surface, os.path.join(out_dir, sheet_name))
+        entry["sheets"].append(sheet_name)
+    return entry["sheets"]
+
+
+def atlas_sheet_paths(entry):
+    """
+    Пути к листам атласа персонажа относительно ресурсов.
+
+    :param entry: Запись персонажа в манифесте.
+    :return: Список путей (пустой, если атлас не собран).
+    """
+    return [f"{ATLAS_DIR}/{sheet_name}" for sheet_name in entry["sheets"]]
+
+
+def atlas_frame_paths(manifest):
+    """
+    Пути к файлам кадров, которые уже упакованы в листы атласа
+    (такие кадры не нужны в архиве ресурсов).
+
+    :param manifest: Манифест анимаций.
+    :return: Множество путей относительно ресурсов.
+    """
+    return {
+        frame_path(character, animation["folder"], i)
+        for character, entry in manifest["characters"].items()
+        if entry["sheets"]
+        for animation in entry["animations"].values()
+        for i in range(animation["count"])
+    }
+
+
+def load_atlas(entry):
+    """
+    Загрузка атласа персонажа.
+
+    :param entry: Запись персонажа в манифесте.
+    :return: Словарь {анимация: [подповерхности кадров]} или None,
+    если атлас не собран.
+    """
+    if not entry["sheets"]:
+        return None
+    sheets = [
+        asset_manager.decode(path)[1] for path in atlas_sheet_paths(entry)
+    ]
+    return {
+        name: [
+            sheets[sheet].subsurface((x, y, width, height))
+            for sheet, x, y, width, height in animation["offsets"]
+        ]
+        for name, animation in entry["animations"].items()
+    }
+
+
+def main():
+    """Сборка манифеста, атласов и форм кадров для всех персонажей."""
+    manifest = scan_characters()
+    out_dir = resource_path(ATLAS_DIR)
+    shapes_dir = resource_path(SHAPES_DIR)
+    for character, entry in manifest["characters"].items():
+        print(character, build_atlas(character, entry, out_dir))
+        build_shapes(character, entry, shapes_dir)
+    save_manifest(manifest)
+
+
+if __name__ == "__main__":
+    main()
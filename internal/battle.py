@@ -0,0 +1,440 @@
+"""
+Модуль логики боя.
+Не зависит от экрана и отрисовки: бой шагается одинаково в игре
+и в безоконном режиме (см. модуль headless).
+"""
+
+import random
+
+import pygame
+from animation_states import ATTACK, JUMP, MOVE, STOP, AnimationMachine
+from charecters import Player, character_table, shape_registry
+from collision import CollisionWorld
+from constants import (
+    PHYSICS_FPS,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    SIMULATION_HZ,
+    SPRITE_SCALE,
+)
+from controls import (
+    ACTION_ATTACK,
+    ACTION_JUMP,
+    ACTION_LEFT,
+    ACTION_RIGHT,
+    InputMapper,
+    load_controls,
+)
+from entities import EntityStore
+from projectiles import ARROW_SPEED, RANGED_ATTACKS, ProjectilePool
+
+REGEN_DELAY = 1000  # Период восполнения маны/стамины (в миллисекундах)
+GROUND_Y = SCREEN_HEIGHT - 600  # Уровень земли на поле сражения
+
+STEP_MS = 1000 / SIMULATION_HZ  # Длительность шага симуляции
+STEP_DT = PHYSICS_FPS / SIMULATION_HZ  # Шаг в кадрах PHYSICS_FPS
+# Предел времени, набираемого за один кадр: после долгой паузы
+# симуляция замедляется, а не пытается догнать её сотнями шагов
+MAX_FRAME_MS = 250
+
+
+def sprite_topleft(position, size):
+    """
+    Левый верхний угол спрайта персонажа на поле сражения.
+
+    :param position: Положение персонажа (x, y).
+    :param size: Размер кадра в исходном масштабе.
+    """
+    return position[0] - size[0] // 2, position[1] - size[1] // 2
+
+
+class Fighter:
+    """
+    Боец: персонаж, номер управляющего им игрока и формы кадров.
+    Состояние анимации и кадр хранятся у персонажа (Player).
+    """
+
+    def __init__(self, player, slot, frame_sizes, shapes=None):
+        """
+        :param player: Персонаж (Player) с автоматом анимаций.
+        :param slot: Номер игрока в настройках управления.
+        :param frame_sizes: Словарь {анимация: размер кадра}.
+        :param shapes: Формы кадров {анимация: [FrameShape]}
+        или None, если формы не собраны.
+        """
+        self.player = player
+        self.store = player.store  # Хранилище сущностей персонажа
+        self.slot = slot
+        self.frame_sizes = frame_sizes
+        self.shapes = shapes
+
+    @property
+    def entity(self):
+        """Номер строки персонажа в хранилище."""
+        return self.player.entity
+
+    @property
+    def animation(self):
+        """Имя текущей анимации."""
+        return self.player.animation
+
+    @property
+    def frame(self):
+        """Номер текущего кадра анимации."""
+        return self.player.frame
+
+    def hurtbox(self):
+        """
+        Область уязвимости бойца: непрозрачная часть текущего кадра
+        в том виде, в котором он нарисован на поле сражения.
+
+        :return: Кортеж (прямоугольник, маска, левый верхний угол маски);
+        без собранных форм — прямоугольник тела и маска None.
+        """
+        player = self.player
+        if self.shapes is None:
+            return player.hurtbox(), None, None
+        shape = self.shapes[self.animation][self.frame]
+        key = (SPRITE_SCALE, player.direction == -1)
+        origin = sprite_topleft(
+            (round(player.st_x), round(player.st_y)),
+            shape.masks[(1, False)].get_size(),
+        )
+        return shape.rects[key].move(origin), shape.masks[key], origin
+
+    def muzzle(self):
+        """
+        Положение наконечника стрелы на поле сражения
+        (None, если текущая анимация не выпускает стрелу).
+        """
+        ranged = RANGED_ATTACKS.get((self.player.character, self.animation))
+        if ranged is None:
+            return None
+        player = self.player
+        size = self.frame_sizes[self.animation]
+        left, top = sprite_topleft(
+            (round(player.st_x), round(player.st_y)), size
+        )
+        muzzle_x, muzzle_y = ranged[1]
+        if player.direction == -1:
+            muzzle_x = size[0] - muzzle_x
+        return (
+            left + muzzle_x * SPRITE_SCALE,
+            top + muzzle_y * SPRITE_SCALE,
+        )
+
+    def position(self, alpha):
+        """
+        Положение персонажа между двумя последними шагами.
+
+        :param alpha: Доля шага, прошедшая после последнего шага (0..1).
+        :return: Координаты (x, y), округлённые до пикселя.
+        """
+        store, entity = self.store, self.entity
+        previous_x, previous_y = (
+            store.previous_x[entity],
+            store.previous_y[entity],
+        )
+        return (
+            round(previous_x + (store.x[entity] - previous_x) * alpha),
+            round(previous_y + (store.y[entity] - previous_y) * alpha),
+        )
+
+    @property
+    def is_attacking(self):
+        """Анимация атаки не прерывается движением."""
+        player = self.player
+        return not player.machine.interruptible[player.state]
+
+
+class Battle:
+    """
+    Состояние боя двух игроков: персонажи, их анимации,
+    восполнение маны/стамины и часы анимаций бойцов.
+    Бой шагается с постоянным шагом STEP_MS независимо от частоты
+    отрисовки: в реальном времени (advance) или с неограниченной
+    скоростью (step).
+    """
+
+    def __init__(
+        self,
+        characters,
+        registry,
+        now=0,
+        *,
+        seed=None,
+        animations=None,
+        controls=None,
+    ):
+        """
+        Инициализация боя.
+
+        :param characters: Персонажи игроков (Player 1, Player 2).
+        :param registry: Реестр анимаций (число кадров берётся
+        из манифеста, сами кадры не загружаются).
+        :param now: Текущее время в миллисекундах (для advance).
+        :param seed: Зерно генератора случайных чисел (по умолчанию
+        случайное); одинаковое зерно и нажатия дают одинаковый бой.
+        :param animations: Анимации персонажей для отрисовки
+        (None в безоконном режиме).
+        :param controls: Настройки управления (по умолчанию
+        см. controls.load_controls).
+        """
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.seed = seed  # Сохраняется в записи ввода для повтора
+        self.rng = random.Random(seed)
+        self.input = InputMapper(controls or load_controls())
+        # Действия-нажатия: действие -> обработчик(боец)
+        self.commands = {
+            ACTION_JUMP: self._jump,
+            ACTION_ATTACK: self._attack,
+        }
+        self.entities = EntityStore()
+        self.world = CollisionWorld()
+        self.projectiles = ProjectilePool(SPRITE_SCALE)
+        if animations is None:
+            animations = (None,) * len(characters)
+        starts = (200, SCREEN_WIDTH - 300)
+        # Автоматы анимаций компилируются один раз на персонажа
+        machines = {
+            character: AnimationMachine(
+                character_table.ids[character],
+                character_table,
+                registry.frame_counts(character),
+            )
+            for character in characters
+        }
+        self.fighters = [
+            Fighter(
+                Player(
+                    character,  # character
+                    st_x,  # st_x
+                    GROUND_Y,  # st_y
+                    character_animations,  # animations
+                    self.entities,  # store
+                    machines[character],  # machine
+                ),
+                slot,
+                registry.frame_sizes(character),
+                shape_registry.get(character),
+            )
+            for slot, (character, st_x, character_animations) in enumerate(
+                zip(characters, starts, animations)
+            )
+        ]
+        self.clock = now  # Реальное время последнего вызова advance
+        self.accumulator = 0.0  # Реальное время, ещё не отданное шагам
+        self.alpha = 0.0  # Доля шага для интерполяции при отрисовке
+        self.time = 0.0  # Время симуляции в миллисекундах
+        self.regen_time = 0.0
+        self.ticks = 0  # Количество шагов боя
+        self.recording = None  # Список нажатий при записи ввода
+
+    def handle_event(self, event):
+        """
+        Обработка события pygame: клавиши управления переводятся
+        в действия игроков.
+
+        :return: True, если событие — клавиша управления.
+        """
+        if event.type == pygame.KEYDOWN:
+            return self.key_down(event.key)
+        if event.type == pygame.KEYUP:
+            return self.key_up(event.key)
+        if event.type == pygame.WINDOWFOCUSLOST:
+            self.focus_lost()
+        return False
+
+    def key_down(self, key):
+        """Нажатие клавиши: действие попадает в буфер игрока."""
+        if self.recording is not None:
+            self.recording.append([self.ticks, "down", pygame.key.name(key)])
+        return self.input.key_down(key, self.time)
+
+    def key_up(self, key):
+        """Отпускание клавиши."""
+        if self.recording is not None:
+            self.recording.append([self.ticks, "up", pygame.key.name(key)])
+        return self.input.key_up(key)
+
+    def focus_lost(self):
+        """
+        Потеря фокуса окном: отпускание клавиш вне окна не придёт,
+        поэтому зажатые действия и буферы нажатий сбрасываются.
+        """
+        if self.recording is not None:
+            self.recording.append([self.ticks, "clear", ""])
+        self.input.clear()
+
+    def _perform(self, fighter, action):
+        """
+        Выполнение действия-нажатия из буфера.
+
+        :return: True, если действие выполнено (иначе оно ждёт в буфере).
+        """
+        return self.commands[action](fighter)
+
+    def _jump(self, fighter):
+        """Прыжок, если персонаж стоит на земле."""
+        player = fighter.player
+        if player.is_jumping:
+            return False
+        player.jump()
+        player.trigger(JUMP, self.rng)
+        return True
+
+    def _attack(self, fighter):
+        """Атака, если её можно начать и хватает маны/стамины."""
+        player = fighter.player
+        # Случайный выбор анимации атаки из доступных персонажу
+        state = player.machine.next_state(player.state, ATTACK, self.rng)
+        if state < 0:
+            return False
+        cost = player.machine.costs[state]
+        if player.resource < cost:
+            return False
+        player.resource -= cost
+        player.enter(state)
+        return True
+
+    def advance(self, now):
+        """
+        Продвижение боя до текущего реального времени.
+        Выполняется столько шагов, сколько их уместилось
+        с прошлого вызова; остаток переходит в следующий кадр.
+
+        :param now: Текущее время в миллисекундах.
+        :return: Доля шага для интерполяции при отрисовке (0..1).
+        """
+        self.accumulator += min(now - self.clock, MAX_FRAME_MS)
+        self.clock = now
+        while self.accumulator >= STEP_MS:
+            self.step()
+            self.accumulator -= STEP_MS
+        self.alpha = self.accumulator / STEP_MS
+        return self.alpha
+
+    def step(self):
+        """Шаг боя длительностью STEP_MS."""
+        self.ticks += 1
+        self.time += STEP_MS
+        self._regen(self.time)
+        strikers = self._advance_frames()
+        self.entities.save_positions()
+        for fighter in self.fighters:
+            # Нажатия из буфера выполняются, как только это возможно
+            self.input.consume(fighter.slot, self.time, self._perform, fighter)
+            self._handle_movement(fighter)
+        # Прыжки, гравитация и границы поля — сразу для всех сущностей
+        self.entities.integrate(STEP_DT)
+        self.entities.clamp(50, 50, SCREEN_WIDTH - 100, SCREEN_HEIGHT - 100)
+        self._resolve_hits(strikers)
+        # Полёт и попадания стрел — одним проходом по пулу
+        self.projectiles.update(STEP_DT, self.world, 0, SCREEN_WIDTH)
+
+    def _regen(self, now):
+        """Автоматическое восполнение маны/стамины раз в секунду."""
+        if now - self.regen_time <= REGEN_DELAY:
+            return
+        self.regen_time = now
+        for fighter in self.fighters:
+            player = fighter.player
+            table, kind = player.table, player.kind
+            player.resource = min(
+                table.resource_max[kind], player.resource + table.regen[kind]
+            )
+
+    def _advance_frames(self):
+        """
+        Переключение кадров анимации: у каждого бойца свои часы
+        и свои длительности кадров текущей анимации.
+
+        :return: Бойцы, атака которых дошла до кадра удара
+        или выстрела.
+        """
+        return [
+            fighter
+            for fighter in self.fighters
+            if fighter.player.advance_animation(STEP_MS, self.rng)
+        ]
+
+    def _resolve_hits(self, strikers):
+        """
+        Перестроение областей уязвимости, удары атакующих
+        и выпуск стрел.
+        """
+        self.world.clear()
+        for fighter in self.fighters:
+            rect, mask, origin = fighter.hurtbox()
+            self.world.add(rect, fighter.player, mask, origin)
+        for fighter in strikers:
+            player = fighter.player
+            damage = player.table.attack_damage[player.kind]
+            muzzle = fighter.muzzle()
+            if muzzle is None:
+                player.attack(self.world, damage)
+                continue
+            # Стрела выпускается наконечником вперёд
+            direction = player.direction
+            self.projectiles.spawn(
+                muzzle[0] - direction * self.projectiles.hitbox.width / 2,
+                muzzle[1],
+                direction * ARROW_SPEED,
+                player,
+                damage,
+            )
+
+    def _handle_movement(self, fighter):
+        """Движение бойца по зажатым действиям игрока."""
+        player = fighter.player
+        left = self.input.is_held(fighter.slot, ACTION_LEFT)
+        right = self.input.is_held(fighter.slot, ACTION_RIGHT)
+        if fighter.is_attacking:
+            # Движение во время атаки сохраняется, если персонажу
+            # это разрешено (Archer при выстреле стоит на месте)
+            if player.table.moves_while_attacking[player.kind]:
+                self._drift(player, left, right)
+        elif player.is_jumping:
+            player.trigger(JUMP, self.rng)
+            # Сохраняем движение во время прыжка
+            self._drift(player, left, right)
+        elif left or right:
+            player.move(-1 if left else 1, dt=STEP_DT)
+            player.trigger(MOVE, self.rng)
+        else:
+            player.trigger(STOP, self.rng)
+
+    @staticmethod
+    def _drift(player, left, right):
+        """Смещение персонажа без смены анимации."""
+        if left:
+            player.st_x -= player.speed_walk * STEP_DT
+            player.direction = -1
+        elif right:
+            player.st_x += player.speed_walk * STEP_DT
+            player.direction = 1
+
+    def summary(self):
+        """Состояние бойцов для отчётов (сериализуется в JSON)."""
+        return {
+            "ticks": self.ticks,
+            "projectiles": {
+                "alive": len(self.projectiles),
+                "spawned": self.projectiles.spawned,
+                "hits": self.projectiles.hits,
+            },
+            "fighters": [
+                {
+                    "character": fighter.player.character,
+                    "x": fighter.player.st_x,
+                    "y": fighter.player.st_y,
+                    "hp": fighter.player.hp,
+                    "mana": fighter.player.mana,
+                    "stamina": fighter.player.stamina,
+                    "animation": fighter.animation,
+                    "frame": fighter.frame,
+                }
+                for fighter in self.fighters
+            ],
+        }
@@ -6,10 +6,12 @@
 import sys
 
 import pygame
+from assets import asset_manager
 
 # Константы для размеров экрана и кнопок
 from constants import (
     BUTTON_HEIGHT,
+    BUTTON_PRESS_MS,
     BUTTON_WIDTH,
     CELL_SIZE,
     COLS,
@@ -22,10 +24,11 @@ from constants import (
     PADDING_Y,
     SCREEN_WIDTH,
 )
-from helper import resource_path
+from profiler import boot_profiler
 
 # Инициализация Pygame
-pygame.init()
+with boot_profiler.phase("pygame.init (buttons)"):
+    pygame.init()
 
 
 class Buttons(pygame.sprite.Sprite):
@@ -43,6 +46,8 @@ class Buttons(pygame.sprite.Sprite):
         width=None,
         height=None,
         pressed_source_path=None,
+        action=None,
+        pinned=False,
     ):
         """
         Инициализация кнопки.
@@ -55,38 +60,82 @@ class Buttons(pygame.sprite.Sprite):
         :param height: Высота кнопки (опционально).
         :param pressed_source_path: Путь к изображению кнопки
         при нажатии (опционально).
+        :param action: Действие кнопки, вызывается как action(game_state)
+        (опционально).
+        :param pinned: True, чтобы изображения кнопки после загрузки
+        закреплялись в менеджере ресурсов и не вытеснялись.
         """
         super().__init__()
         self.x = x
         self.y = y
         self.name = name
-        self.source_path = pygame.image.load(resource_path(source_path))
-        self.width, self.height = self.source_path.get_size()
+        # Изображения хранятся в менеджере ресурсов, кнопка хранит пути
+        self.image_path = source_path
+        self.pressed_image_path = pressed_source_path
+        self.image_size = None
         if width is not None and height is not None:
-            self.source_path = pygame.transform.scale(
-                self.source_path, (int(width), int(height))
-            )
-            self.width, self.height = self.source_path.get_size()
-        self.rect = self.source_path.get_rect()
-
-        # Загрузка изображения для состояния нажатия
-        self.pressed_source_path = None
-        if pressed_source_path:
-            self.pressed_source_path = pygame.image.load(
-                resource_path(pressed_source_path)
-            )
-            if width is not None and height is not None:
-                self.pressed_source_path = pygame.transform.scale(
-                    self.pressed_source_path, (int(width), int(height))
-                )
+            self.image_size = (int(width), int(height))
+        self.pinned = pinned
+        self.pins = set()  # Ключи закреплённых изображений
 
         self.is_pressed = (
             False  # Инициализация флага для отслеживания состояния нажатия
         )
+        self.release_time = 0  # Время окончания анимации нажатия
+        self.is_hovered = False  # Мышь над кнопкой
+        self.action = action
+
+    @property
+    def width(self):
+        """Ширина кнопки."""
+        if self.image_size is not None:
+            return self.image_size[0]
+        return self.source_path.get_width()
+
+    @property
+    def height(self):
+        """Высота кнопки."""
+        if self.image_size is not None:
+            return self.image_size[1]
+        return self.source_path.get_height()
+
+    @property
+    def rect(self):
+        """Прямоугольник кнопки на экране."""
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    @property
+    def image_paths(self):
+        """Пути ко всем изображениям кнопки (для фоновой загрузки)."""
+        return [
+            path for path in (self.image_path, self.pressed_image_path) if path
+        ]
+
+    def load_image(self, path):
+        """Загрузка изображения кнопки (с закреплением, если нужно)."""
+        image = asset_manager.load_image(path, self.image_size)
+        if self.pinned:
+            key = asset_manager.image_key(path, self.image_size)
+            if key not in self.pins:
+                asset_manager.acquire(key)
+                self.pins.add(key)
+        return image
+
+    @property
+    def source_path(self):
+        """Изображение кнопки."""
+        return self.load_image(self.image_path)
+
+    @property
+    def pressed_source_path(self):
+        """Изображение кнопки при нажатии (или None)."""
+        if not self.pressed_image_path:
+            return None
+        return self.load_image(self.pressed_image_path)
 
     def paint(self, screen):
         """Отрисовка кнопки на экране."""
-        if self.is_pressed and self.pressed_source_path:
+        if self.is_pressed and self.pressed_image_path:
             screen.blit(self.pressed_source_path, (self.x, self.y))
         else:
             screen.blit(self.source_path, (self.x, self.y))
@@ -118,165 +167,158 @@ class Buttons(pygame.sprite.Sprite):
             self.y <= mouse_y <= self.y + self.height
         )
 
-    def funct(self, game_state, screen, backgrounds):
+    def press(self, now):
         """
-        Обработка функциональности кнопки.
+        Нажатие кнопки: кнопка показывается нажатой BUTTON_PRESS_MS
+        миллисекунд, после чего в update выполняется её действие.
+        Действие кнопки без изображения нажатия выполняется сразу.
 
-        :param game_state: Текущее состояние игры.
-        :param screen: Экран для отрисовки.
-        :param backgrounds: Список фоновых изображений.
+        :param now: Текущее время pygame.time.get_ticks().
         """
-        # Переключаем кнопку в состояние нажатия
         self.is_pressed = True
+        self.release_time = now + (
+            BUTTON_PRESS_MS if self.pressed_image_path else 0
+        )
 
-        # Отрисовываем весь экран заново с состоянием нажатия
-        self.draw_screen(game_state, screen, backgrounds)
-        pygame.display.flip()  # Обновляем экран
-
-        # Задержка для анимации нажатия (например, 200 миллисекунд)
-        pygame.time.delay(200)
+    def update(self, now, game_state):
+        """
+        Завершение нажатия по окончании анимации.
+        Вызывается из игрового цикла каждый кадр и не блокирует его.
 
-        # Возвращаем кнопку в обычное состояние
+        :param now: Текущее время pygame.time.get_ticks().
+        :param game_state: Текущее состояние игры.
+        :return: True, если нажатие завершено и действие выполнено.
+        """
+        if not self.is_pressed or now < self.release_time:
+            return False
         self.is_pressed = False
+        self.funct(game_state)
+        return True
 
-        # Отрисовываем весь экран заново с обычным состоянием
-        self.draw_screen(game_state, screen, backgrounds)
-        pygame.display.flip()  # Обновляем экран
-
-        # Выполняем действие в зависимости от имени кнопки
-        if self.name == "00.jpeg":  # Кнопка "Start"
-            game_state["show_inventory"] = True
-        elif self.name == "01.jpeg":  # Кнопка "Quit"
-            pygame.quit()
-            sys.exit()
-        elif self.name == "02.jpeg":  # Кнопка "Settings"
-            game_state["show_settings"] = True
-        elif self.name == "play_button":  # Кнопка "Play"
-            game_state["show_inventory"] = False
-            game_state["show_battle_field"] = True
-            # Сбрасываем персонажей, чтобы создать новых с выбранными характеристиками
-            global player1, player2
-            player1 = None
-            player2 = None
-        elif self.name == "castle.png":  # Выбор фона "Castle"
-            game_state["main_background"] = pygame.image.load(
-                resource_path("assets/Maps/castle.png")
-            )
-            game_state["show_settings"] = False
-        elif self.name == "dead forest.png":  # Выбор фона "Dead Forest"
-            game_state["main_background"] = pygame.image.load(
-                resource_path("assets/Maps/dead forest.png")
-            )
-            game_state["show_settings"] = False
-        elif self.name == "terrace.png":  # Выбор фона "Terrace"
-            game_state["main_background"] = pygame.image.load(
-                resource_path("assets/Maps/terrace.png")
-            )
-            game_state["show_settings"] = False
-        elif self.name == "throne room.png":  # Выбор фона "Throne Room"
-            game_state["main_background"] = pygame.image.load(
-                resource_path("assets/Maps/throne room.png")
-            )
-            game_state["show_settings"] = False
-
-    def draw_screen(self, game_state, screen, backgrounds):
+    def funct(self, game_state):
         """
-        Отрисовка всего экрана в зависимости от состояния игры и кнопки.
+        Выполнение действия кнопки.
 
         :param game_state: Текущее состояние игры.
-        :param screen: Экран для отрисовки.
         """
-        # Отрисовка фона
-        if game_state["show_battle_field"]:
-            screen.blit(game_state["main_background"], (0, 0))
-        elif game_state["show_inventory"]:
-            screen.blit(backgrounds[3], (0, 0))
-        elif game_state["show_settings"]:
-            screen.blit(backgrounds[3], (0, 0))
-        else:
-            screen.blit(backgrounds[1], (0, 0))
-
-        # Отрисовка кнопок
-        if game_state["show_inventory"]:
-            for button in inventory_buttons:
-                button.paint(screen)
-        elif game_state["show_settings"]:
-            for button in settings_buttons:
-                button.paint(screen)
-        else:
-            for button in menu_buttons:
-                button.paint(screen)
+        if self.action is not None:
+            self.action(game_state)
+
+
+def start_game(game_state):
+    """Кнопка "Start": переход к выбору персонажей."""
+    game_state["show_inventory"] = True
+
+
+def quit_game(_game_state):
+    """Кнопка "Quit": выход из игры."""
+    pygame.quit()
+    sys.exit()
+
+
+def open_settings(game_state):
+    """Кнопка "Settings": переход к настройкам."""
+    game_state["show_settings"] = True
+
+
+def start_battle(game_state):
+    """Кнопка "Play": переход к бою."""
+    game_state["show_inventory"] = False
+    game_state["show_battle_field"] = True
+
+
+def select_background(path):
+    """Действие кнопки выбора фона боя."""
+
+    def action(game_state):
+        """Выбор фона и возврат в главное меню."""
+        game_state["main_background"] = path
+        game_state["show_settings"] = False
+
+    return action
 
 
 # Создание кнопок
 b_start = Buttons(
     "00.jpeg",
-    resource_path("assets/buttons/00.png"),
+    "assets/buttons/00.png",
     SCREEN_WIDTH // 2 - 125,
     500,
     pressed_source_path="assets/buttons/10.png",
+    action=start_game,
 )
 b_quit = Buttons(
     "01.jpeg",
-    resource_path("assets/buttons/01.png"),
+    "assets/buttons/01.png",
     SCREEN_WIDTH // 2 - 125,
     800,
     pressed_source_path="assets/buttons/11.png",
+    action=quit_game,
 )
 b_settings = Buttons(
     "02.jpeg",
-    resource_path("assets/buttons/02.png"),
+    "assets/buttons/02.png",
     SCREEN_WIDTH // 2 - 125,
     650,
     pressed_source_path="assets/buttons/12.png",
+    action=open_settings,
 )
 b_play = Buttons(
     "play_button",
-    resource_path("assets/buttons/00.png"),
+    "assets/buttons/00.png",
     (SCREEN_WIDTH - 250) / 2,
     800,
     pressed_source_path="assets/buttons/10.png",
+    action=start_battle,
 )
 
-# Кнопки фонов с изменённым размером
+# Кнопки фонов с изменённым размером (экран настроек доступен
+# из главного меню в любой момент, поэтому уменьшенные фоны
+# закреплены в памяти)
 background_1 = Buttons(
     "castle.png",
-    resource_path("assets/Maps/castle.png"),
+    "assets/Maps/castle.png",
     OFFSET_X,
     OFFSET_Y,
     BUTTON_WIDTH,
     BUTTON_HEIGHT,
+    pinned=True,
+    action=select_background("assets/Maps/castle.png"),
 )
 background_2 = Buttons(
     "dead forest.png",
-    resource_path("assets/Maps/dead forest.png"),
+    "assets/Maps/dead forest.png",
     OFFSET_X + BUTTON_WIDTH + PADDING_X,
     OFFSET_Y,
     BUTTON_WIDTH,
     BUTTON_HEIGHT,
+    pinned=True,
+    action=select_background("assets/Maps/dead forest.png"),
 )
 background_3 = Buttons(
     "terrace.png",
-    resource_path("assets/Maps/terrace.png"),
+    "assets/Maps/terrace.png",
     OFFSET_X,
     OFFSET_Y + BUTTON_HEIGHT + PADDING_Y,
     BUTTON_WIDTH,
     BUTTON_HEIGHT,
+    pinned=True,
+    action=select_background("assets/Maps/terrace.png"),
 )
 background_4 = Buttons(
     "throne room.png",
-    resource_path("assets/Maps/throne room.png"),
+    "assets/Maps/throne room.png",
     OFFSET_X + BUTTON_WIDTH + PADDING_X,
     OFFSET_Y + BUTTON_HEIGHT + PADDING_Y,
     BUTTON_WIDTH,
     BUTTON_HEIGHT,
+    pinned=True,
+    action=select_background("assets/Maps/throne room.png"),
 )
 # Кнопки для переключения персонажей Player 1
 b_left_player1 = Buttons(
     "left_button_player1",
-    resource_path(
-        "assets/buttons2/left.png"
-    ),  # Путь к изображению кнопки "влево"
+    "assets/buttons2/left.png",  # Путь к изображению кнопки "влево"
     OFFSET_X1 - 100,  # Позиция слева от персонажа Player 1
     OFFSET_Y - 150,  # Выравнивание по высоте
     width=50,  # Ширина кнопки
@@ -285,9 +327,7 @@ b_left_player1 = Buttons(
 
 b_right_player1 = Buttons(
     "right_button_player1",
-    resource_path(
-        "assets/buttons2/right.png"
-    ),  # Путь к изображению кнопки "вправо"
+    "assets/buttons2/right.png",  # Путь к изображению кнопки "вправо"
     OFFSET_X1
     + (COLS * (CELL_SIZE + PADDING))
     + 50,  # Позиция справа от персонажа Player 1
@@ -299,9 +339,7 @@ b_right_player1 = Buttons(
 # Кнопки для переключения персонажей Player 2
 b_left_player2 = Buttons(
     "left_button_player2",
-    resource_path(
-        "assets/buttons2/left.png"
-    ),  # Путь к изображению кнопки "влево"
+    "assets/buttons2/left.png",  # Путь к изображению кнопки "влево"
     OFFSET_X2 - 100,  # Позиция слева от персонажа Player 2
     OFFSET_Y - 150,  # Выравнивание по высоте
     width=50,  # Ширина кнопки
@@ -310,9 +348,7 @@ b_left_player2 = Buttons(
 
 b_right_player2 = Buttons(
     "right_button_player2",
-    resource_path(
-        "assets/buttons2/right.png"
-    ),  # Путь к изображению кнопки "вправо"
+    "assets/buttons2/right.png",  # Путь к изображению кнопки "вправо"
     OFFSET_X2
     + (COLS * (CELL_SIZE + PADDING))
     + 50,  # Позиция справа от персонажа Player 2
@@ -0,0 +1,100 @@
+"""
+Модуль таблицы персонажей.
+Характеристики персонажей (здоровье, защита, скорости, мана или
+выносливость и её восполнение, набор атак и их стоимость,
+длительность кадров анимаций) описаны
+в файле assets/characters.json. При запуске описания компилируются
+в таблицу по столбцам: персонаж — номер строки, и в бою читаются
+поля по номеру вместо сравнения имён персонажей.
+
+Запись персонажа дополняет раздел defaults; персонажи, которых
+нет в файле, получают значения по умолчанию.
+"""
+
+import json
+from array import array
+
+from constants import FRAME_DELAY
+from helper import read_resource
+
+CHARACTERS_PATH = "assets/characters.json"  # Путь относительно ресурсов
+
+# Числовые столбцы таблицы и типы их элементов (см. модуль array)
+NUMERIC_COLUMNS = {
+    "hp": "l",  # Здоровье
+    "defend": "l",  # Защита
+    "speed_run": "d",  # Скорость бега
+    "speed_walk": "d",  # Скорость ходьбы
+    "jump_height": "d",  # Начальная скорость прыжка
+    "resource_max": "l",  # Запас маны или выносливости
+    "regen": "l",  # Восполнение маны/выносливости за период
+    "attack_damage": "l",  # Урон атаки до учёта защиты цели
+    "moves_while_attacking": "b",  # 1, если во время атаки можно двигаться
+}
+
+
+def load_character_data():
+    """Загрузка описаний персонажей."""
+    return json.loads(bytes(read_resource(CHARACTERS_PATH)))
+
+
+class CharacterTable:
+    """
+    Скомпилированная таблица персонажей.
+    Числовые характеристики — типизированные массивы (см. NUMERIC_COLUMNS),
+    остальные — списки; номер персонажа — ids[имя].
+    """
+
+    def __init__(self, data, characters):
+        """
+        :param data: Описания персонажей (см. load_character_data).
+        :param characters: Имена всех персонажей игры.
+        """
+        self.names = list(characters)
+        self.ids = {name: kind for kind, name in enumerate(self.names)}
+        records = [
+            {**data["defaults"], **data["characters"].get(name, {})}
+            for name in self.names
+        ]
+        for column, typecode in NUMERIC_COLUMNS.items():
+            setattr(
+                self,
+                column,
+                array(typecode, [record[column] for record in records]),
+            )
+        self.resources = [record["resource"] for record in records]
+        self.uses_mana = array(
+            "b", [record["resource"] == "mana" for record in records]
+        )
+        self.attacks = [tuple(record["attacks"]) for record in records]
+        # Стоимость каждой атаки: своя или общая attack_cost
+        self.attack_costs = [
+            {
+                name: record["attack_costs"].get(name, record["attack_cost"])
+                for name in record["attacks"]
+            }
+            for record in records
+        ]
+        # Длительность кадров: {анимация: мс на кадр или список по кадрам}
+        self.durations = [record["frame_durations"] for record in records]
+        self.transitions = [record["transitions"] for record in records]
+
+    def __len__(self):
+        """Количество персонажей."""
+        return len(self.names)
+
+    def frame_durations(self, kind, animation, count):
+        """
+        Длительность каждого кадра анимации.
+
+        :param kind: Номер персонажа.
+        :param animation: Имя анимации.
+        :param count: Число кадров анимации.
+        :return: Кортеж длительностей в миллисекундах
+        (по умолчанию FRAME_DELAY на кадр).
+        """
+        duration = self.durations[kind].get(animation, FRAME_DELAY)
+        if isinstance(duration, list):
+            # Список короче анимации повторяется по кругу
+            return tuple(duration[i % len(duration)] for i in range(count))
+        return (duration,) * count
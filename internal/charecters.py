@@ -3,11 +3,22 @@
 Содержит класс Player для создания и управления персонажами.
 """
 
-import pygame
+from collections import deque
+from collections.abc import Mapping
+
+from animation_states import END
+from assets import asset_manager, surface_bytes
+from atlas import atlas_sheet_paths, load_atlas
+from character_table import CharacterTable, load_character_data
+from collision import attack_box, body_box
 from constants import (
     CURRENT_CHARACTER_PLAYER1,
 )
+from entities import EntityField, EntityStore
+from frame_cache import FrameCache
 from helper import resource_path
+from manifest import frame_path, load_manifest
+from shapes import ShapeRegistry
 
 animations_path = resource_path("assets")
 
@@ -16,51 +27,154 @@ class Player:
     """
     Класс для создания персонажей.
     Обрабатывает действия и хар-ки персонажей.
+    Изменяемое состояние персонажа хранится в хранилище сущностей.
     """
 
+    st_x = EntityField("x")
+    st_y = EntityField("y")
+    jump_velocity = EntityField("velocity_y")
+    gravity = EntityField("gravity")
+    ground_y = EntityField("ground_y")
+    is_jumping = EntityField("jumping")
+    direction = EntityField("facing")
+    hp = EntityField("hp")
+    resource = EntityField("resource")  # Мана мага или выносливость
+    state = EntityField("animation")  # Состояние автомата анимаций
+    frame = EntityField("frame")  # Номер кадра анимации
+    frame_time = EntityField("frame_time")  # Часы текущего кадра (мс)
+
     def __init__(
         self,
         character,
         st_x,
         st_y,
-        hp,
-        defend,
-        speed_run,
-        jump_height,
-        speed_walk,
         animations,
+        store=None,
+        machine=None,
+        table=None,
     ):
         """
         Инициализация персонажа.
+        Характеристики берутся из таблицы персонажей.
+        store: хранилище сущностей боя (по умолчанию собственное)
+        machine: автомат анимаций персонажа (AnimationMachine)
+        table: таблица персонажей (по умолчанию character_table)
         """
+        table = table if table is not None else character_table
+        kind = table.ids[character]
         self.character = character
-        self.st_x = st_x
-        self.st_y = st_y
-        self.speed_run = speed_run
-        self.jump_height = jump_height
-        self.speed_walk = speed_walk
-        self.hp = hp
-        self.defend = defend
+        self.kind = kind  # Номер персонажа в таблице
+        self.table = table
+        self.speed_run = table.speed_run[kind]
+        self.jump_height = table.jump_height[kind]
+        self.speed_walk = table.speed_walk[kind]
+        self.defend = table.defend[kind]
         self.animations = animations
-        self.is_jumping = False
-        self.jump_velocity = 0
-        self.gravity = 0.7  # Увеличиваем гравитацию для более быстрого падения
-        self.ground_y = st_y  # Начальная позиция Y (земля)
-        # Устанавливаем начальное направление в зависимости от игрока
-        self.direction = 1 if character == CURRENT_CHARACTER_PLAYER1 else -1
-        # Добавляем ману и выносливость
-        self.mana = 100 if character == "Wizard" else 0
-        self.stamina = 100 if character != "Wizard" else 0
-
-    def move(self, direction, is_running=False):
+        self.uses_mana = bool(table.uses_mana[kind])
+        self.machine = machine
+        self.store = store if store is not None else EntityStore()
+        self.entity = self.store.spawn(
+            self,
+            x=st_x,
+            y=st_y,
+            previous_x=st_x,
+            previous_y=st_y,
+            # Увеличиваем гравитацию для более быстрого падения
+            gravity=0.7,
+            ground_y=st_y,  # Начальная позиция Y (земля)
+            # Устанавливаем начальное направление в зависимости от игрока
+            facing=1 if character == CURRENT_CHARACTER_PLAYER1 else -1,
+            hp=table.hp[kind],
+            resource=table.resource_max[kind],
+            animation=machine.idle if machine is not None else 0,
+        )
+
+    @property
+    def mana(self):
+        """Мана (есть только у мага)."""
+        return self.resource if self.uses_mana else 0
+
+    @property
+    def stamina(self):
+        """Выносливость (у всех, кроме мага)."""
+        return 0 if self.uses_mana else self.resource
+
+    @property
+    def animation(self):
+        """Имя текущей анимации."""
+        return self.machine.names[self.state]
+
+    def trigger(self, event, rng):
+        """
+        Событие автомата анимаций; при переходе анимация
+        начинается с первого кадра.
+        event: событие (см. animation_states.EVENTS)
+        rng: генератор случайных чисел для случайных переходов
+        Возвращает True, если состояние сменилось.
+        """
+        state = self.machine.next_state(self.state, event, rng)
+        if state < 0:
+            return False
+        self.enter(state)
+        return True
+
+    def enter(self, state):
+        """Переход в состояние автомата анимаций с первого кадра."""
+        self.state = state
+        self.frame = 0
+        self.frame_time = 0.0
+
+    def advance_animation(self, elapsed, rng):
+        """
+        Продвижение часов анимации персонажа.
+        Кадры переключаются по длительностям из автомата анимаций;
+        если прошло больше одного кадра, пропущенные кадры догоняются.
+        elapsed: прошедшее время в миллисекундах
+        rng: генератор случайных чисел для случайных переходов
+        Возвращает True, если атака дошла до кадра удара.
+        """
+        durations = self.machine.frame_durations
+        store, entity = self.store, self.entity
+        time = store.frame_time[entity] + elapsed
+        duration = durations[store.animation[entity]][store.frame[entity]]
+        if time < duration:
+            # Обычный шаг: кадр ещё не сменился
+            store.frame_time[entity] = time
+            return False
+        struck = False
+        while time >= duration:
+            time -= duration
+            struck = self.next_frame(rng) or struck
+            duration = durations[self.state][self.frame]
+        self.frame_time = time
+        return struck
+
+    def next_frame(self, rng):
+        """
+        Переход к следующему кадру анимации.
+        По окончании неповторяющейся анимации происходит событие END.
+        Возвращает True, если атака дошла до кадра удара.
+        """
+        machine, state = self.machine, self.state
+        frame = self.frame + 1
+        if frame == machine.frame_counts[state]:
+            self.frame = 0
+            if not machine.loops[state]:
+                self.trigger(END, rng)
+            return False
+        self.frame = frame
+        return frame == machine.strike_frames[state]
+
+    def move(self, direction, is_running=False, dt=1.0):
         """
         Обработка движения персонажа.
         direction: 1 для движения вправо, -1 для движения влево
         is_running: True для бега, False для ходьбы
+        dt: прошедшее время в кадрах PHYSICS_FPS
         """
         self.direction = direction  # Сохраняем направление движения
         speed = self.speed_run if is_running else self.speed_walk
-        self.st_x += direction * speed
+        self.st_x += direction * speed * dt
 
     def jump(self):
         """Обработка прыжка персонажа."""
@@ -70,22 +184,22 @@ class Player:
                 -self.jump_height
             )  # Возвращаем исходную скорость прыжка
 
-    def update(self):
-        """Обновление состояния персонажа."""
-        # Обработка прыжка и гравитации
-        if self.is_jumping:
-            self.st_y += self.jump_velocity
-            self.jump_velocity += self.gravity
-
-            # Проверка приземления
-            if self.st_y >= self.ground_y:
-                self.st_y = self.ground_y
-                self.is_jumping = False
-                self.jump_velocity = 0
+    def hurtbox(self):
+        """Область уязвимости персонажа на экране."""
+        return body_box(self.st_x, self.st_y)
 
-    def attack(self):
-        """Обработка атаки персонажа."""
-        pass  # Реализация атаки будет добавлена позже
+    def attack(self, world, damage):
+        """
+        Обработка атаки персонажа.
+        world: области уязвимости текущего шага (CollisionWorld)
+        damage: урон до учёта защиты цели
+        Возвращает персонажей, получивших урон.
+        """
+        hitbox = attack_box(self.st_x, self.st_y, self.direction)
+        targets = world.query(hitbox, exclude=self)
+        for target in targets:
+            target.take_damage(damage)
+        return targets
 
     def take_damage(self, damage):
         """
@@ -97,384 +211,201 @@ class Player:
         return self.hp <= 0  # Возвращает True, если персонаж умер
 
 
-# Создание переменной x для загрузки персонажей
-x = {
-    "Archer": {
-        "attack": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Archer/attack/{i}0.png")
-            )
-            for i in range(0, 4)
-        ],
-        "dead": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Archer/dead/{i}0.png")
-            )
-            for i in range(0, 3)
-        ],
-        "idle": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Archer/idle/{i}0.png")
-            )
-            for i in range(0, 6)
-        ],
-        "jump": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Archer/jump/{i}0.png")
-            )
-            for i in range(0, 9)
-        ],
-        "run": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Archer/run/{i}0.png")
-            )
-            for i in range(0, 8)
-        ],
-        "shot_1": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Archer/shot_1/{i}0.png")
-            )
-            for i in range(0, 14)
-        ],
-        "shot_2": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Archer/shot_2/{i}0.png")
-            )
-            for i in range(0, 13)
-        ],
-        "walk": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Archer/walk/{i}0.png")
-            )
-            for i in range(0, 8)
-        ],
-        "idle_2": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Archer/idle/{i}0.png")
-            )
-            for i in range(0, 3)
-        ],
-    },
-    "Enchantress": {
-        "attack_1": [
-            pygame.image.load(
-                resource_path(
-                    f"assets/characters/Enchantress/attack_1/{i}0.png"
-                )
-            )
-            for i in range(0, 6)
-        ],
-        "attack_2": [
-            pygame.image.load(
-                resource_path(
-                    f"assets/characters/Enchantress/attack_2/{i}0.png"
-                )
-            )
-            for i in range(0, 3)
-        ],
-        "attack_3": [
-            pygame.image.load(
-                resource_path(
-                    f"assets/characters/Enchantress/attack_3/{i}0.png"
-                )
-            )
-            for i in range(0, 3)
-        ],
-        "attack_4": [
-            pygame.image.load(
-                resource_path(
-                    f"assets/characters/Enchantress/attack_4/{i}0.png"
-                )
-            )
-            for i in range(0, 10)
-        ],
-        "dead": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Enchantress/dead/{i}0.png")
-            )
-            for i in range(0, 5)
-        ],
-        "hurt": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Enchantress/hurt/{i}0.png")
-            )
-            for i in range(0, 2)
-        ],
-        "idle": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Enchantress/idle/{i}0.png")
-            )
-            for i in range(0, 5)
-        ],
-        "jump": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Enchantress/jump/{i}0.png")
-            )
-            for i in range(0, 8)
-        ],
-        "run": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Enchantress/run/{i}0.png")
-            )
-            for i in range(0, 8)
-        ],
-        "walk": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Enchantress/walk/{i}0.png")
-            )
-            for i in range(0, 8)
-        ],
-    },
-    "Knight": {
-        "attack_1": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Knight/attack_1/{i}0.png")
-            )
-            for i in range(0, 5)
-        ],
-        "attack_2": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Knight/attack_2/{i}0.png")
-            )
-            for i in range(0, 2)
-        ],
-        "attack_3": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Knight/attack_3/{i}0.png")
-            )
-            for i in range(0, 5)
-        ],
-        "attack_4": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Knight/attack_4/{i}0.png")
-            )
-            for i in range(0, 5)
-        ],
-        "dead": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Knight/dead/{i}0.png")
-            )
-            for i in range(0, 4)
-        ],
-        "hurt": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Knight/hurt/{i}0.png")
-            )
-            for i in range(0, 3)
-        ],
-        "idle": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Knight/idle/{i}0.png")
-            )
-            for i in range(0, 6)
-        ],
-        "jump": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Knight/jump/{i}0.png")
-            )
-            for i in range(0, 6)
-        ],
-        "run": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Knight/run/{i}0.png")
-            )
-            for i in range(0, 7)
-        ],
-        "walk": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Knight/walk/{i}0.png")
-            )
-            for i in range(0, 8)
-        ],
-    },
-    "Musketeer": {
-        "attack_1": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Musketeer/attack_1/{i}0.png")
-            )
-            for i in range(0, 5)
-        ],
-        "attack_2": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Musketeer/attack_2/{i}0.png")
-            )
-            for i in range(0, 4)
-        ],
-        "attack_3": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Musketeer/attack_3/{i}0.png")
-            )
-            for i in range(0, 6)
-        ],
-        "attack_4": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Musketeer/attack_4/{i}0.png")
-            )
-            for i in range(0, 5)
-        ],
-        "dead": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Musketeer/dead/{i}0.png")
-            )
-            for i in range(0, 4)
-        ],
-        "hurt": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Musketeer/hurt/{i}0.png")
-            )
-            for i in range(0, 2)
-        ],
-        "idle": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Musketeer/idle/{i}0.png")
-            )
-            for i in range(0, 5)
-        ],
-        "jump": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Musketeer/jump/{i}0.png")
-            )
-            for i in range(0, 7)
-        ],
-        "run": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Musketeer/run/{i}0.png")
-            )
-            for i in range(0, 8)
-        ],
-        "walk": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Musketeer/walk/{i}0.png")
-            )
-            for i in range(0, 8)
-        ],
-    },
-    "Swordsman": {
-        "attack_1": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Swordsman/attack_1/{i}0.png")
-            )
-            for i in range(0, 6)
-        ],
-        "attack_2": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Swordsman/attack_2/{i}0.png")
-            )
-            for i in range(0, 3)
-        ],
-        "attack_3": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Swordsman/attack_3/{i}0.png")
-            )
-            for i in range(0, 4)
-        ],
-        "dead": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Swordsman/dead/{i}0.png")
-            )
-            for i in range(0, 3)
-        ],
-        "hurt": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Swordsman/hurt/{i}0.png")
-            )
-            for i in range(0, 3)
-        ],
-        "idle": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Swordsman/idle/{i}0.png")
-            )
-            for i in range(0, 8)
-        ],
-        "idle_2": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Swordsman/idle/{i}0.png")
-            )
-            for i in range(0, 3)
-        ],
-        "jump": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Swordsman/jump/{i}0.png")
-            )
-            for i in range(0, 3)
-        ],
-        "run": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Swordsman/run/{i}0.png")
-            )
-            for i in range(0, 8)
-        ],
-        "walk": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Swordsman/walk/{i}0.png")
-            )
-            for i in range(0, 8)
-        ],
-    },
-    "Wizard": {
-        "attack_1": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Wizard/attack_1/{i}0.png")
-            )
-            for i in range(0, 10)
-        ],
-        "attack_2": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Wizard/attack_2/{i}0.png")
-            )
-            for i in range(0, 4)
-        ],
-        "attack_3": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Wizard/attack_3/{i}0.png")
-            )
-            for i in range(0, 7)
-        ],
-        "dead": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Wizard/dead/{i}0.png")
-            )
-            for i in range(0, 4)
-        ],
-        "hurt": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Wizard/hurt/{i}0.png")
-            )
-            for i in range(0, 4)
-        ],
-        "idle": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Wizard/idle/{i}0.png")
-            )
-            for i in range(0, 6)
-        ],
-        "idle_2": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Wizard/idle_2/{i}0.png")
-            )
-            for i in range(0, 5)
-        ],
-        "jump": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Wizard/jump/{i}0.png")
-            )
-            for i in range(0, 11)
-        ],
-        "run": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Wizard/run/{i}0.png")
-            )
-            for i in range(0, 8)
-        ],
-        "walk": [
-            pygame.image.load(
-                resource_path(f"assets/characters/Wizard/walk/{i}0.png")
+def load_frames(character, folder, count):
+    """Загрузка кадров одной анимации персонажа с диска."""
+    return [
+        asset_manager.decode(frame_path(character, folder, i))[1]
+        for i in range(0, count)
+    ]
+
+
+def frames_bytes(animations):
+    """
+    Объём памяти, занятой кадрами анимаций.
+    Кадры из атласа учитываются по размеру листа, общие кадры — один раз.
+    """
+    owners = {}
+    for frames in animations.values():
+        for frame in frames:
+            owner = frame.get_parent() or frame
+            owners[id(owner)] = owner
+    return sum(surface_bytes(owner) for owner in owners.values())
+
+
+class AnimationRegistry(Mapping):
+    """
+    Ленивый реестр анимаций персонажей.
+    Ведёт себя как словарь {персонаж: {анимация: [кадры]}},
+    но загружает кадры персонажа только при первом обращении к нему.
+    Загруженные кадры хранятся в менеджере ресурсов.
+    """
+
+    def __init__(self, manifest, manager):
+        """
+        Инициализация реестра.
+
+        :param manifest: Манифест анимаций (см. модуль manifest).
+        :param manager: Менеджер ресурсов, в котором хранятся кадры.
+        """
+        self.manifest = manifest["characters"]
+        self.manager = manager
+        self.has_atlas = {}  # Персонаж -> собран ли для него атлас
+        self.pending = deque()  # Очередь (персонаж, анимация) на подгрузку
+
+    def __getitem__(self, character):
+        """Возвращает анимации персонажа, догружая недостающие."""
+        table = self.manifest[character]["animations"]
+        animations = self._animations(character)
+        if len(animations) < len(table):
+            for name in table:
+                self._load_animation(character, name)
+        return animations
+
+    def __iter__(self):
+        """Перебор имён персонажей в порядке карусели выбора."""
+        return iter(self.manifest)
+
+    def __len__(self):
+        """Количество персонажей в реестре."""
+        return len(self.manifest)
+
+    @staticmethod
+    def key(character):
+        """Ключ анимаций персонажа в менеджере ресурсов."""
+        return ("animations", character)
+
+    def frame_counts(self, character):
+        """Число кадров каждой анимации персонажа (без загрузки кадров)."""
+        return {
+            name: animation["count"]
+            for name, animation in self.manifest[character][
+                "animations"
+            ].items()
+        }
+
+    def frame_sizes(self, character):
+        """Размер кадров каждой анимации персонажа (без загрузки кадров)."""
+        return {
+            name: tuple(animation["size"])
+            for name, animation in self.manifest[character][
+                "animations"
+            ].items()
+        }
+
+    def _animations(self, character):
+        """Словарь уже загруженных анимаций персонажа из менеджера."""
+        animations = self.manager.get(self.key(character))
+        if animations is not None:
+            return animations
+
+        animations = None
+        if self.has_atlas.get(character, True):
+            animations = load_atlas(self.manifest[character])
+            self.has_atlas[character] = animations is not None
+        if animations is not None:
+            # Листы атласа, декодированные фоновым загрузчиком, теперь
+            # учитываются в анимациях персонажа (см. frames_bytes)
+            for path in atlas_sheet_paths(self.manifest[character]):
+                self.manager.discard(self.manager.image_key(path))
+        if animations is None:
+            animations = {}
+        return self.manager.put(
+            self.key(character), animations, frames_bytes(animations)
+        )
+
+    def _load_animation(self, character, name):
+        """Загрузка одной анимации персонажа, если она ещё не загружена."""
+        animations = self._animations(character)
+        if name not in animations:
+            # Атлас не собран: загружаем кадры отдельными файлами
+            animation = self.manifest[character]["animations"][name]
+            animations[name] = load_frames(
+                character, animation["folder"], animation["count"]
+            )
+            self.manager.put(
+                self.key(character), animations, frames_bytes(animations)
             )
-            for i in range(0, 7)
-        ],
-    },
-}
+
+    def is_loaded(self, character):
+        """Проверка, загружены ли все анимации персонажа."""
+        animations = self.manager.peek(self.key(character))
+        return animations is not None and len(animations) == len(
+            self.manifest[character]["animations"]
+        )
+
+    def asset_paths(self, character):
+        """
+        Пути к изображениям персонажа для фоновой загрузки:
+        листы атласа или, если атлас не собран, отдельные кадры.
+        """
+        entry = self.manifest[character]
+        if entry["sheets"]:
+            return atlas_sheet_paths(entry)
+        return [
+            frame_path(character, animation["folder"], i)
+            for animation in entry["animations"].values()
+            for i in range(animation["count"])
+        ]
+
+    def acquire(self, character):
+        """Закрепление анимаций персонажа в памяти на время боя."""
+        self.manager.acquire(self.key(character))
+        return self[character]
+
+    def release(self, character):
+        """Снятие закрепления анимаций персонажа."""
+        self.manager.release(self.key(character))
+
+    def neighbours(self, character):
+        """
+        Соседи персонажа в карусели выбора.
+
+        :return: Кортеж (предыдущий персонаж, следующий персонаж).
+        """
+        characters = list(self.manifest)
+        index = characters.index(character)
+        return (
+            characters[(index - 1) % len(characters)],
+            characters[(index + 1) % len(characters)],
+        )
+
+    def prefetch(self, character):
+        """Постановка анимаций персонажа в очередь на подгрузку."""
+        if self.is_loaded(character):
+            return
+        for name in self.manifest[character]["animations"]:
+            if (character, name) not in self.pending:
+                self.pending.append((character, name))
+
+    def prefetch_neighbours(self, character):
+        """Подгрузка персонажа и его соседей по карусели выбора."""
+        self.prefetch(character)
+        for neighbour in self.neighbours(character):
+            self.prefetch(neighbour)
+
+    def load_pending(self):
+        """
+        Загрузка одной анимации из очереди.
+        Вызывается раз в кадр, чтобы не блокировать игровой цикл.
+
+        :return: True, если в очереди ещё остались анимации.
+        """
+        if self.pending:
+            self._load_animation(*self.pending.popleft())
+        return bool(self.pending)
+
+
+# Реестр анимаций персонажей (кадры загружаются по требованию)
+animation_manifest = load_manifest()
+x = AnimationRegistry(animation_manifest, asset_manager)
+# Характеристики всех персонажей из манифеста
+character_table = CharacterTable(load_character_data(), x)
+# Формы кадров для столкновений (загружаются без кадров анимаций)
+shape_registry = ShapeRegistry(animation_manifest, asset_manager)
 
 # Загрузка анимаций для игроков Player 1  Player 2
 player2_animations = x
 player1_animations = x
+
+# Кэш увеличенных и отражённых кадров для экранов боя и выбора
+frame_cache = FrameCache(x, asset_manager)
@@ -0,0 +1,105 @@
+"""
+Модуль столкновений.
+Области уязвимости (hurtbox) сущностей раскладываются по сетке
+пространственного индекса, поэтому запрос «какие области задевает
+этот удар (hitbox)» проверяет только соседние сущности, а не все.
+Если у области есть маска кадра (см. модуль shapes), попадание
+проверяется с точностью до пикселя.
+"""
+
+import pygame
+from spatial import SpatialIndex
+
+COLLISION_CELL_SIZE = 128  # Размер ячейки сетки столкновений
+
+# Тело персонажа, если формы кадров не собраны: спрайт увеличен
+# в 2 раза и нарисован от (st_x - 64, st_y - 64), ноги внизу кадра
+BODY_WIDTH = 80
+BODY_HEIGHT = 130
+BODY_OFFSET_X = 64  # Центр тела относительно st_x
+BODY_OFFSET_Y = 192  # Ноги относительно st_y
+ATTACK_REACH = 90  # Дальность удара от края тела
+ATTACK_HEIGHT = 100
+
+
+def body_box(st_x, st_y):
+    """Область уязвимости персонажа в точке (st_x, st_y)."""
+    box = pygame.Rect(0, 0, BODY_WIDTH, BODY_HEIGHT)
+    box.midbottom = (round(st_x) + BODY_OFFSET_X, round(st_y) + BODY_OFFSET_Y)
+    return box
+
+
+def attack_box(st_x, st_y, facing):
+    """Область удара персонажа перед телом в сторону взгляда."""
+    body = body_box(st_x, st_y)
+    box = pygame.Rect(0, 0, ATTACK_REACH, ATTACK_HEIGHT)
+    box.centery = body.centery
+    if facing < 0:
+        box.right = body.left
+    else:
+        box.left = body.right
+    return box
+
+
+class CollisionWorld:
+    """
+    Области уязвимости сущностей на текущем шаге.
+    Широкая фаза — ячейки пространственного индекса,
+    узкая — пересечение прямоугольников и масок.
+    """
+
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        """
+        :param cell_size: Размер ячейки сетки в пикселях.
+        """
+        self.index = SpatialIndex(cell_size)
+        self.solid_masks = {}  # Размер -> заполненная маска удара
+        self.queries = 0
+        self.checks = 0  # Проверок пересечения в узкой фазе
+
+    def clear(self):
+        """Удаление всех областей (перед перестроением на новом шаге)."""
+        self.index.clear()
+
+    def add(self, rect, owner, mask=None, origin=None):
+        """
+        Добавление области уязвимости.
+
+        :param rect: Прямоугольник области.
+        :param owner: Владелец области (например, Player).
+        :param mask: Маска непрозрачных пикселей (опционально).
+        :param origin: Положение левого верхнего угла маски на экране.
+        """
+        self.index.insert(rect, (rect, owner, mask, origin))
+
+    def _solid_mask(self, size):
+        """Заполненная маска прямоугольника удара."""
+        mask = self.solid_masks.get(size)
+        if mask is None:
+            mask = self.solid_masks[size] = pygame.mask.Mask(size, fill=True)
+        return mask
+
+    def query(self, hitbox, exclude=None):
+        """
+        Владельцы областей уязвимости, которые задевает удар.
+
+        :param hitbox: Прямоугольник удара.
+        :param exclude: Владелец, которого не нужно учитывать
+        (обычно сам атакующий).
+        :return: Список владельцев без повторов.
+        """
+        self.queries += 1
+        owners = []
+        for rect, owner, mask, origin in self.index.query_rect(hitbox):
+            if owner is exclude or owner in owners:
+                continue
+            self.checks += 1
+            if not hitbox.colliderect(rect):
+                continue
+            if mask is not None and not mask.overlap(
+                self._solid_mask(hitbox.size),
+                (hitbox.x - origin[0], hitbox.y - origin[1]),
+            ):
+                continue
+            owners.append(owner)
+        return owners
@@ -27,8 +27,7 @@ PADDING_Y = 100
 OFFSET_X = (SCREEN_WIDTH - (2 * BUTTON_WIDTH + PADDING_X)) // 2
 
 # переменные для анимации персонажей
-FRAME_TIME = 0  # Время для переключения кадров
-FRAME_DELAY = 100  # Задержка между кадрами (в миллисекундах)
+FRAME_DELAY = 100  # Длительность кадра по умолчанию (в миллисекундах)
 
 # Переменные для второго игрока
 CURRENT_CHARACTER_INDEX_PLAYER1 = 0  # Индекс текущего персонажа для Player 1
@@ -37,9 +36,29 @@ CURRENT_CHARACTER_INDEX_PLAYER2 = 0  # Индекс текущего персо
 # Переменные для первого игрока
 CURRENT_CHARACTER_PLAYER1 = "Archer"  # Текущий персонаж для Player 1
 CURRENT_ANIMATION_PLAYER1 = "idle"  # Текущая анимация для Player 1
-CURRENT_FRAME_PLAYER1 = 0  # Текущий кадр анимации для Player 1
 
 # Переменные для второго игрока
 CURRENT_CHARACTER_PLAYER2 = "Archer"  # Текущий персонаж для Player 2
 CURRENT_ANIMATION_PLAYER2 = "idle"  # Текущая анимация для Player 2
-CURRENT_FRAME_PLAYER2 = 0  # Текущий кадр анимации для Player 2
+
+# Бюджет памяти под загруженные изображения (в мегабайтах).
+# Рабочий набор игры около 90 МБ: фоны (4 x 8 МБ), листы атласов
+# (6 x 4-5 МБ), слои экранов (~16 МБ), кэш увеличенных кадров (~12 МБ),
+# формы кадров и кнопки; остальное — запас на смену персонажей
+ASSET_BUDGET_MB = 128
+
+# Шрифт заголовков и количество надписей в кэше отрисованного текста
+TITLE_FONT = "candara"
+TEXT_CACHE_ENTRIES = 256
+
+# Длительность анимации нажатия кнопки (в миллисекундах)
+BUTTON_PRESS_MS = 200
+
+# Увеличение спрайтов персонажей на поле сражения
+SPRITE_SCALE = 2
+
+# Частота отрисовки и частота шагов симуляции боя (в герцах);
+# скорости и гравитация персонажей заданы в кадрах PHYSICS_FPS
+RENDER_FPS = 60
+SIMULATION_HZ = 120
+PHYSICS_FPS = 60
@@ -0,0 +1,145 @@
+"""
+Модуль управления: перевод нажатий клавиш в действия игроков.
+Клавиши игроков задаются в файле assets/controls.json и при запуске
+собираются в таблицу {код клавиши: (игрок, действие)}, так что
+событие клавиатуры обрабатывается одним поиском в словаре.
+Нажатия прыжка и атаки запоминаются в буфере игрока на buffer_ms
+миллисекунд: нажатие, сделанное чуть раньше, чем действие стало
+возможным (например, до окончания атаки), всё равно срабатывает.
+
+Переназначение клавиш — свой файл в том же формате:
+    GAME_CONTROLS=my_controls.json
+"""
+
+import json
+import os
+from collections import deque
+
+import pygame
+from helper import read_resource
+
+CONTROLS_PATH = "assets/controls.json"  # Путь относительно ресурсов
+
+# Действия игрока
+ACTIONS = ("left", "right", "jump", "attack")
+ACTION_LEFT, ACTION_RIGHT, ACTION_JUMP, ACTION_ATTACK = range(len(ACTIONS))
+# Действия-нажатия, которые ждут выполнения в буфере
+BUFFERED_ACTIONS = (ACTION_JUMP, ACTION_ATTACK)
+BUFFER_SIZE = 8  # Наибольшее число нажатий в буфере игрока
+
+
+def load_controls(path=None):
+    """
+    Загрузка настроек управления.
+
+    :param path: Файл настроек (по умолчанию из переменной окружения
+    GAME_CONTROLS, а если она не задана — assets/controls.json).
+    """
+    path = path or os.environ.get("GAME_CONTROLS")
+    if path:
+        with open(path, encoding="utf-8") as controls_file:
+            return json.load(controls_file)
+    return json.loads(bytes(read_resource(CONTROLS_PATH)))
+
+
+def compile_bindings(players):
+    """
+    Таблица действий по кодам клавиш.
+
+    :param players: Клавиши игроков [{действие: имя клавиши
+    или список имён}] (имена как в pygame.key.name).
+    :return: Словарь {код клавиши: ((игрок, действие), ...)}.
+    """
+    dispatch = {}
+    for player, bindings in enumerate(players):
+        for action, names in bindings.items():
+            if isinstance(names, str):
+                names = [names]
+            for name in names:
+                dispatch.setdefault(pygame.key.key_code(name), []).append(
+                    (player, ACTIONS.index(action))
+                )
+    return {key: tuple(targets) for key, targets in dispatch.items()}
+
+
+class PlayerInput:
+    """Состояние ввода одного игрока: зажатые действия и буфер нажатий."""
+
+    __slots__ = ("held", "buffer")
+
+    def __init__(self):
+        """Ничего не зажато, буфер пуст."""
+        self.held = bytearray(len(ACTIONS))  # Число зажатых клавиш действия
+        self.buffer = deque(maxlen=BUFFER_SIZE)  # (время, действие)
+
+
+class InputMapper:
+    """
+    Слой действий: принимает события клавиатуры и хранит
+    для каждого игрока зажатые действия и буфер нажатий.
+    Время нажатий задаёт вызывающий (в бою — время симуляции).
+    """
+
+    def __init__(self, config):
+        """
+        :param config: Настройки управления (см. load_controls).
+        """
+        self.dispatch = compile_bindings(config["players"])
+        self.buffer_ms = config["buffer_ms"]
+        self.players = [PlayerInput() for _ in config["players"]]
+
+    def key_down(self, key, now):
+        """
+        Нажатие клавиши.
+
+        :return: True, если клавиша назначена действию.
+        """
+        targets = self.dispatch.get(key, ())
+        for player, action in targets:
+            state = self.players[player]
+            state.held[action] = min(255, state.held[action] + 1)
+            if action in BUFFERED_ACTIONS:
+                state.buffer.append((now, action))
+        return bool(targets)
+
+    def key_up(self, key):
+        """
+        Отпускание клавиши.
+
+        :return: True, если клавиша назначена действию.
+        """
+        targets = self.dispatch.get(key, ())
+        for player, action in targets:
+            held = self.players[player].held
+            held[action] = max(0, held[action] - 1)
+        return bool(targets)
+
+    def is_held(self, player, action):
+        """Проверка, зажата ли клавиша действия игрока."""
+        return self.players[player].held[action] > 0
+
+    def consume(self, player, now, perform, *args):
+        """
+        Выполнение нажатий из буфера игрока.
+        Устаревшие нажатия отбрасываются, невыполненные остаются
+        в буфере до следующего вызова.
+
+        :param player: Номер игрока.
+        :param now: Текущее время в миллисекундах.
+        :param perform: Функция perform(*args, действие), возвращающая
+        True, если действие выполнено.
+        """
+        buffer = self.players[player].buffer
+        while buffer and now - buffer[0][0] > self.buffer_ms:
+            buffer.popleft()
+        if not buffer:
+            return
+        pending = [item for item in buffer if not perform(*args, item[1])]
+        buffer.clear()
+        buffer.extend(pending)
+
+    def clear(self):
+        """Сброс зажатых действий и буферов (например, при потере фокуса)."""
+        for state in self.players:
+            state.held[:] = bytes(len(ACTIONS))
+            state.buffer.clear()
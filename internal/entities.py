@@ -0,0 +1,153 @@
+"""
+Модуль хранилища сущностей боя.
+Состояние всех сущностей (бойцов, а в будущем призванных существ
+и снарядов) хранится по столбцам в типизированных массивах,
+а прыжки, гравитация и ограничение границами поля обновляются
+одним проходом по столбцам сразу для всех сущностей.
+"""
+
+from array import array
+
+# Столбцы хранилища и типы их элементов (см. модуль array)
+COLUMNS = {
+    "x": "d",  # Координата X
+    "y": "d",  # Координата Y
+    "previous_x": "d",  # X до последнего шага (для интерполяции)
+    "previous_y": "d",  # Y до последнего шага (для интерполяции)
+    "velocity_y": "d",  # Вертикальная скорость прыжка
+    "gravity": "d",  # Ускорение свободного падения
+    "ground_y": "d",  # Уровень земли
+    "jumping": "b",  # 1, пока сущность в прыжке
+    "facing": "b",  # Направление взгляда: 1 вправо, -1 влево
+    "hp": "l",  # Здоровье
+    "resource": "l",  # Мана или выносливость
+    "animation": "H",  # Состояние автомата анимаций (см. animation_states)
+    "frame": "H",  # Номер кадра анимации
+    "frame_time": "d",  # Время, прошедшее на текущем кадре (мс)
+}
+
+
+class EntityField:
+    """
+    Атрибут объекта-владельца, хранящийся в столбце хранилища.
+    Владелец должен иметь атрибуты store (хранилище)
+    и entity (номер своей строки).
+    """
+
+    def __init__(self, column):
+        """
+        :param column: Имя столбца (см. COLUMNS).
+        """
+        self.column = column
+
+    def __get__(self, owner, owner_type=None):
+        """Значение из столбца."""
+        if owner is None:
+            return self
+        return getattr(owner.store, self.column)[owner.entity]
+
+    def __set__(self, owner, value):
+        """Запись значения в столбец."""
+        getattr(owner.store, self.column)[owner.entity] = value
+
+
+class EntityStore:
+    """
+    Хранилище сущностей в виде структуры массивов.
+    Сущность — номер строки во всех столбцах; объект-владелец
+    (например, Player) обращается к своим полям по этому номеру.
+    """
+
+    def __init__(self):
+        """Инициализация пустого хранилища."""
+        # Столбцы (по одному массиву на каждый из COLUMNS)
+        self.x = array(COLUMNS["x"])
+        self.y = array(COLUMNS["y"])
+        self.previous_x = array(COLUMNS["previous_x"])
+        self.previous_y = array(COLUMNS["previous_y"])
+        self.velocity_y = array(COLUMNS["velocity_y"])
+        self.gravity = array(COLUMNS["gravity"])
+        self.ground_y = array(COLUMNS["ground_y"])
+        self.jumping = array(COLUMNS["jumping"])
+        self.facing = array(COLUMNS["facing"])
+        self.hp = array(COLUMNS["hp"])
+        self.resource = array(COLUMNS["resource"])
+        self.animation = array(COLUMNS["animation"])
+        self.frame = array(COLUMNS["frame"])
+        self.frame_time = array(COLUMNS["frame_time"])
+        self.owners = []  # Владельцы строк (для перенумерации при удалении)
+
+    def __len__(self):
+        """Количество сущностей."""
+        return len(self.owners)
+
+    def spawn(self, owner, **values):
+        """
+        Добавление сущности.
+
+        :param owner: Владелец строки; при перемещении строки
+        его атрибут entity получает новый номер.
+        :param values: Начальные значения столбцов (остальные нули).
+        :return: Номер сущности.
+        """
+        for name in COLUMNS:
+            getattr(self, name).append(values.get(name, 0))
+        self.owners.append(owner)
+        return len(self.owners) - 1
+
+    def remove(self, index):
+        """Удаление сущности: на её место переносится последняя."""
+        last = len(self.owners) - 1
+        for name in COLUMNS:
+            column = getattr(self, name)
+            column[index] = column[last]
+            column.pop()
+        owner = self.owners.pop()
+        if index != last:
+            self.owners[index] = owner
+            owner.entity = index
+
+    def save_positions(self):
+        """Запоминание положений перед шагом симуляции."""
+        self.previous_x[:] = self.x
+        self.previous_y[:] = self.y
+
+    def integrate(self, dt):
+        """
+        Прыжок и гравитация для всех сущностей одним проходом:
+        строки сущностей в прыжке обновляются на месте.
+
+        :param dt: Прошедшее время в кадрах PHYSICS_FPS.
+        """
+        jumping = self.jumping
+        if not any(jumping):
+            return
+        y, velocity_y = self.y, self.velocity_y
+        gravity, ground_y = self.gravity, self.ground_y
+        for index, jump in enumerate(jumping):
+            if not jump:
+                continue
+            y[index] += velocity_y[index] * dt
+            velocity_y[index] += gravity[index] * dt
+            # Проверка приземления
+            if y[index] >= ground_y[index]:
+                y[index] = ground_y[index]
+                jumping[index] = 0
+                velocity_y[index] = 0.0
+
+    def clamp(self, left, top, right, bottom):
+        """
+        Ограничение положений всех сущностей прямоугольником поля.
+        Столбец обходится, только если кто-то вышел за границы.
+        """
+        for column, low, high in (
+            (self.x, left, right),
+            (self.y, top, bottom),
+        ):
+            if not column or low <= min(column) and max(column) <= high:
+                continue
+            for index, value in enumerate(column):
+                if value < low:
+                    column[index] = low
+                elif value > high:
+                    column[index] = high
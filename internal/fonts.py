@@ -0,0 +1,90 @@
+"""
+Модуль шрифтов и кэша отрисованного текста.
+Шрифт создаётся один раз на пару (гарнитура, размер), а одинаковые
+надписи берутся из кэша вместо повторного вызова Font.render.
+"""
+
+from collections import OrderedDict
+
+import pygame
+from constants import TEXT_CACHE_ENTRIES
+
+
+class TextCache:
+    """
+    Реестр шрифтов и ограниченный кэш отрисованного текста.
+    Надписи хранятся с ключом (текст, гарнитура, размер, цвет,
+    сглаживание) и вытесняются давно не использованные.
+    """
+
+    def __init__(self, max_entries=TEXT_CACHE_ENTRIES):
+        """
+        Инициализация кэша.
+
+        :param max_entries: Максимальное количество надписей в кэше.
+        """
+        self.max_entries = max_entries
+        self.fonts = {}  # (гарнитура, размер) -> шрифт
+        self.texts = OrderedDict()  # Ключ надписи -> поверхность
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, face=None, size=24):
+        """
+        Получение шрифта.
+
+        :param face: Имя системного шрифта или None для шрифта pygame
+        по умолчанию.
+        :param size: Размер шрифта.
+        :return: Объект pygame.font.Font.
+        """
+        key = (face, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if face is None:
+                font = pygame.font.Font(None, size)
+            else:
+                font = pygame.font.SysFont(face, size)
+            self.fonts[key] = font
+        return font
+
+    def render(
+        self, text, size, color=(255, 255, 255), *, face=None, antialias=True
+    ):
+        """
+        Получение изображения надписи.
+
+        :param text: Текст надписи.
+        :param size: Размер шрифта.
+        :param color: Цвет текста.
+        :param face: Имя системного шрифта или None для шрифта
+        по умолчанию.
+        :param antialias: True для сглаженного текста.
+        :return: Поверхность с надписью.
+        """
+        key = (text, face, size, tuple(color), antialias)
+        surface = self.texts.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.texts.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font(face, size).render(text, antialias, color)
+        self.texts[key] = surface
+        if len(self.texts) > self.max_entries:
+            self.texts.popitem(last=False)
+        return surface
+
+    def report(self):
+        """Статистика кэша."""
+        return {
+            "fonts": len(self.fonts),
+            "texts": len(self.texts),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Общий кэш текста игры
+text_cache = TextCache()
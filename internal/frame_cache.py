@@ -0,0 +1,62 @@
+"""
+Модуль кэша подготовленных кадров анимаций.
+Хранит увеличенные и отражённые варианты кадров, чтобы не вызывать
+pygame.transform.scale и pygame.transform.flip каждый кадр.
+"""
+
+import pygame
+from assets import surface_bytes
+
+
+class FrameCache:
+    """
+    Кэш кадров с ключом (персонаж, анимация, кадр, масштаб, отражение).
+    Кадры хранятся в менеджере ресурсов и вытесняются им
+    при превышении бюджета памяти.
+    """
+
+    def __init__(self, animations, manager):
+        """
+        Инициализация кэша.
+
+        :param animations: Реестр анимаций {персонаж: {анимация: [кадры]}}.
+        :param manager: Менеджер ресурсов, в котором хранятся кадры.
+        """
+        self.animations = animations
+        self.manager = manager
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, character, animation, frame, scale=1, flip=False):
+        """
+        Получение подготовленного кадра.
+
+        :param character: Имя персонажа.
+        :param animation: Имя анимации.
+        :param frame: Номер кадра.
+        :param scale: Коэффициент масштабирования.
+        :param flip: True, если кадр нужно отразить по горизонтали.
+        :return: Поверхность с кадром.
+        """
+        key = ("frame", character, animation, frame, scale, flip)
+        surface = self.manager.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.animations[character][animation][frame]
+        if scale != 1:
+            surface = pygame.transform.scale(
+                surface,
+                (surface.get_width() * scale, surface.get_height() * scale),
+            )
+        if flip:
+            surface = pygame.transform.flip(surface, True, False)
+        return self.manager.put(key, surface, surface_bytes(surface))
+
+    def warm(self, character, animation, scale=1, flips=(False, True)):
+        """Заблаговременная подготовка всех кадров анимации."""
+        for frame in range(len(self.animations[character][animation])):
+            for flip in flips:
+                self.get(character, animation, frame, scale, flip)
@@ -0,0 +1,120 @@
+"""
+Безоконный режим боя.
+Бой шагается без окна и без отрисовки (видеодрайвер SDL dummy)
+с неограниченной скоростью: по сценарию нажатий или по записи ввода,
+сделанной в игре (переменная окружения GAME_RECORD_INPUT).
+Запись хранит зерно генератора случайных чисел боя, поэтому
+бой повторяется шаг в шаг.
+Кадры персонажей не загружаются, достаточно манифеста анимаций.
+
+Запуск (отчёт о бое выводится в формате JSON):
+    python headless.py --p1 Knight --p2 Wizard --ticks 3600 --seed 1
+    python headless.py --script input.json --output result.json
+
+Сценарий — список нажатий [шаг, "down" или "up", имя клавиши],
+например [[10, "down", "w"], [40, "down", "d"], [90, "up", "d"]],
+или запись ввода {"seed": зерно, "events": [нажатия]}
+(--seed, если указан, заменяет зерно записи).
+Событие [шаг, "clear", ""] — потеря фокуса окном (клавиши отпущены).
+"""
+
+import argparse
+import json
+import os
+import time
+
+# Окно не создаётся, звук не нужен, приветствие pygame
+# не должно попадать в отчёт
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+# pylint: disable=C0413
+import pygame  # noqa: E402
+from battle import Battle  # noqa: E402
+from charecters import x  # noqa: E402
+from constants import (  # noqa: E402
+    CURRENT_CHARACTER_PLAYER1,
+    CURRENT_CHARACTER_PLAYER2,
+    SIMULATION_HZ,
+)
+
+
+def load_script(path):
+    """
+    Загрузка сценария нажатий из JSON-файла.
+
+    :return: Кортеж (нажатия, зерно записи или None).
+    """
+    with open(path, encoding="utf-8") as script_file:
+        script = json.load(script_file)
+    if isinstance(script, dict):
+        return script["events"], script["seed"]
+    return script, None
+
+
+def run_battle(characters, script=(), ticks=SIMULATION_HZ * 60, *, seed=None):
+    """
+    Прогон боя без окна.
+
+    :param characters: Персонажи игроков (Player 1, Player 2).
+    :param script: Нажатия [шаг, "down", "up" или "clear", имя клавиши].
+    :param ticks: Количество шагов боя (SIMULATION_HZ шагов в секунду).
+    :param seed: Зерно генератора случайных чисел
+    (одинаковое зерно и сценарий дают одинаковый бой).
+    :return: Бой после последнего шага.
+    """
+    pygame.init()  # Нужен для имён клавиш; окно не создаётся
+    battle = Battle(characters, x, seed=seed)
+    events = sorted(script, key=lambda event: event[0])
+    index = 0
+    for tick in range(ticks):
+        # Нажатия шага обрабатываются до самого шага, как в игре
+        while index < len(events) and events[index][0] <= tick:
+            _, kind, name = events[index]
+            if kind == "clear":
+                battle.focus_lost()
+            elif kind == "down":
+                battle.key_down(pygame.key.key_code(name))
+            else:
+                battle.key_up(pygame.key.key_code(name))
+            index += 1
+        battle.step()
+    return battle
+
+
+def main():
+    """Запуск безоконного боя из командной строки."""
+    parser = argparse.ArgumentParser(description="Бой без окна")
+    parser.add_argument(
+        "--p1", choices=list(x), default=CURRENT_CHARACTER_PLAYER1
+    )
+    parser.add_argument(
+        "--p2", choices=list(x), default=CURRENT_CHARACTER_PLAYER2
+    )
+    parser.add_argument("--ticks", type=int, default=SIMULATION_HZ * 60)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--script", help="JSON-файл со сценарием нажатий")
+    parser.add_argument("--output", help="Файл для отчёта вместо вывода")
+    args = parser.parse_args()
+
+    script, seed = load_script(args.script) if args.script else ((), None)
+    if args.seed is not None:
+        seed = args.seed
+    start = time.perf_counter()
+    battle = run_battle((args.p1, args.p2), script, args.ticks, seed=seed)
+    elapsed = time.perf_counter() - start
+    pygame.quit()
+
+    report = battle.summary()
+    report["seconds"] = round(elapsed, 3)
+    report["ticks_per_second"] = round(args.ticks / elapsed) if elapsed else 0
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
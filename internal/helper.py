@@ -2,20 +2,62 @@
 Модуль хелпер функций для игры
 """
 
+import functools
 import os
 import sys
 
+from asset_pack import PACK_NAME, AssetPack
+
+
+def base_path():
+    """Папка с ресурсами (работает и в .exe, и в обычном запуске)."""
+    if getattr(sys, "frozen", False):
+        return sys._MEIPASS  # pylint: disable=W0212
+    return os.path.abspath(os.path.dirname(__file__))
+
 
 def resource_path(relative_path):
     """
     Возвращает правильный путь для ресурсов
     (работает и в .exe, и в обычном запуске).
     """
-    if getattr(sys, "frozen", False):
-        base_path = sys._MEIPASS  # pylint: disable=W0212
-    else:
-        base_path = os.path.abspath(os.path.dirname(__file__))
-        print(base_path)
-        print(relative_path)
+    return os.path.join(base_path(), relative_path)
+
+
+@functools.cache
+def get_asset_pack():
+    """
+    Архив ресурсов или None, если архив не собран.
+    Архив ищется и открывается один раз за запуск.
+    """
+    pack_path = os.path.join(base_path(), PACK_NAME)
+    return AssetPack(pack_path) if os.path.exists(pack_path) else None
+
+
+def resource_name(path):
+    """Имя ресурса в архиве: путь относительно папки ресурсов."""
+    full_path = os.path.normpath(os.path.join(base_path(), path))
+    return os.path.relpath(full_path, base_path()).replace(os.sep, "/")
+
 
-    return os.path.join(base_path, relative_path)
+def resource_exists(path):
+    """Проверка наличия ресурса в архиве или на диске."""
+    pack = get_asset_pack()
+    if pack is not None:
+        if resource_name(path) in pack:
+            return True
+    return os.path.exists(os.path.join(base_path(), path))
+
+
+def read_resource(path):
+    """
+    Чтение ресурса: из архива (memoryview без копирования),
+    а если архива нет или файла в нём нет — с диска.
+    """
+    pack = get_asset_pack()
+    if pack is not None:
+        name = resource_name(path)
+        if name in pack:
+            return pack.view(name)
+    with open(os.path.join(base_path(), path), "rb") as resource_file:
+        return resource_file.read()
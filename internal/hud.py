@@ -0,0 +1,162 @@
+"""
+Модуль интерфейса боя (HUD).
+Элементы интерфейса хранят заранее отрисованные поверхности
+и перерисовывают их, только когда меняется отображаемое значение.
+"""
+
+from abc import ABC, abstractmethod
+
+import pygame
+from fonts import text_cache
+
+BAR_WIDTH = 200
+BAR_HEIGHT = 20
+BAR_SPACING = 30  # Расстояние между верхними краями полосок
+TITLE_HEIGHT = 20  # Место под имя игрока над первой полоской
+
+
+class HudElement(ABC):
+    """
+    Абстрактный элемент интерфейса с собственной поверхностью.
+    Наследники определяют, какое значение они показывают (read)
+    и как его рисовать (redraw).
+    """
+
+    def __init__(self, rect):
+        """
+        :param rect: Прямоугольник элемента на экране.
+        """
+        self.rect = pygame.Rect(rect)
+        self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.value = None
+
+    @abstractmethod
+    def read(self, player):
+        """Значение, которое показывает элемент для игрока."""
+
+    @abstractmethod
+    def redraw(self):
+        """Отрисовка текущего значения на поверхность элемента."""
+
+    def update(self, value):
+        """
+        Обновление значения элемента.
+
+        :return: True, если значение изменилось и элемент перерисован.
+        """
+        if value == self.value:
+            return False
+        self.value = value
+        self.surface.fill((0, 0, 0, 0))
+        self.redraw()
+        return True
+
+    def draw(self, surface):
+        """Отрисовка элемента на экран."""
+        surface.blit(self.surface, self.rect)
+
+
+class StatBar(HudElement):
+    """Полоска характеристики игрока (HP, защита, мана, выносливость)."""
+
+    def __init__(self, x, y, attribute, max_value, color, label, title=None):
+        """
+        :param x: Координата X полоски.
+        :param y: Координата Y полоски.
+        :param attribute: Имя атрибута игрока с текущим значением.
+        :param max_value: Максимальное значение.
+        :param color: Цвет заполнения.
+        :param label: Название полоски.
+        :param title: Имя игрока над полоской (опционально).
+        """
+        self.top = TITLE_HEIGHT if title else 0
+        super().__init__((x, y - self.top, BAR_WIDTH, BAR_HEIGHT + self.top))
+        self.attribute = attribute
+        self.max_value = max_value
+        self.color = color
+        self.label = label
+        self.title = title
+
+    def read(self, player):
+        """Текущее значение характеристики игрока."""
+        return int(getattr(player, self.attribute))
+
+    def redraw(self):
+        """Отрисовка полоски на поверхность элемента."""
+        surface = self.surface
+        bar_rect = pygame.Rect(0, self.top, BAR_WIDTH, BAR_HEIGHT)
+
+        # Фон, заполнение и рамка полоски
+        pygame.draw.rect(surface, (50, 50, 50), bar_rect)
+        fill_rect = bar_rect.copy()
+        fill_rect.width = int((self.value / self.max_value) * BAR_WIDTH)
+        pygame.draw.rect(surface, self.color, fill_rect)
+        pygame.draw.rect(surface, (255, 255, 255), bar_rect, 1)
+
+        # Значение по центру полоски
+        text_surface = text_cache.render(
+            f"{self.value}/{self.max_value}", 20, (0, 0, 0)
+        )
+        surface.blit(
+            text_surface,
+            (
+                (BAR_WIDTH - text_surface.get_width()) // 2,
+                bar_rect.y + (BAR_HEIGHT - text_surface.get_height()) // 2,
+            ),
+        )
+
+        # Название полоски в левом углу
+        surface.blit(
+            text_cache.render(self.label, 16, (0, 0, 0)),
+            (bar_rect.x + 5, bar_rect.y + 2),
+        )
+
+        # Имя игрока над полоской
+        if self.title:
+            surface.blit(text_cache.render(self.title, 20), (0, 0))
+
+
+class PlayerHud:
+    """
+    Интерфейс одного игрока: набор элементов, которые перерисовываются
+    только при изменении своих значений.
+    """
+
+    def __init__(self, player_name, x, y, bars):
+        """
+        :param player_name: Имя игрока (выводится над первой полоской).
+        :param x: Координата X интерфейса.
+        :param y: Координата Y первой полоски.
+        :param bars: Полоски в виде кортежей
+        (атрибут, максимум, цвет, название).
+        """
+        self.elements = [
+            StatBar(
+                x,
+                y + index * BAR_SPACING,
+                *stat,
+                title=player_name if index == 0 else None,
+            )
+            for index, stat in enumerate(bars)
+        ]
+
+    def update(self, player):
+        """
+        Обновление элементов по состоянию игрока.
+
+        :return: Прямоугольники перерисованных элементов.
+        """
+        return [
+            element.rect
+            for element in self.elements
+            if element.update(element.read(player))
+        ]
+
+    def add_to(self, frame_renderer):
+        """
+        Добавление элементов в кадр отрисовщика. Элемент попадает
+        на экран заново, только если его область отмечена изменённой
+        (см. update и DirtyRenderer.mark_dirty) или её задел спрайт.
+        """
+        for element in self.elements:
+            frame_renderer.widget(element, element.rect, element.draw)
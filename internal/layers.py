@@ -0,0 +1,43 @@
+"""
+Модуль кэша статичных слоёв экрана.
+Фон экрана вместе с неизменной разметкой (сетки инвентаря, подписи,
+иконки предметов) собирается в одну поверхность один раз,
+а каждый кадр поверх неё рисуются только анимированные элементы.
+"""
+
+from assets import surface_bytes
+
+
+class LayerCache:
+    """
+    Кэш собранных слоёв с ключом (имя слоя, подпись содержимого).
+    Слои хранятся в менеджере ресурсов и вытесняются им
+    при превышении бюджета памяти.
+    """
+
+    def __init__(self, manager):
+        """
+        Инициализация кэша.
+
+        :param manager: Менеджер ресурсов, в котором хранятся слои.
+        """
+        self.manager = manager
+        self.builds = 0
+
+    def get(self, name, signature, build):
+        """
+        Получение собранного слоя.
+
+        :param name: Имя слоя.
+        :param signature: Подпись содержимого слоя (строки и числа);
+        при её изменении слой собирается заново.
+        :param build: Функция без аргументов, собирающая слой.
+        :return: Поверхность со слоем.
+        """
+        key = ("layer", name, signature)
+        layer = self.manager.get(key)
+        if layer is None:
+            self.builds += 1
+            layer = build()
+            self.manager.put(key, layer, surface_bytes(layer))
+        return layer
@@ -0,0 +1,172 @@
+"""
+Модуль фоновой загрузки ресурсов.
+Читает и декодирует изображения в пуле потоков, а приводит к формату
+экрана и регистрирует их в менеджере ресурсов в основном потоке,
+раз в кадр.
+"""
+
+import itertools
+import logging
+import os
+import queue
+import threading
+
+import pygame
+from assets import asset_path, decode_image_data, read_image_file
+
+logger = logging.getLogger(__name__)
+
+# Приоритеты загрузки (меньше — раньше)
+PRIORITY_SCENE = 0  # Ресурсы текущего экрана
+PRIORITY_NEXT = 1  # Ресурсы экранов, на которые можно перейти
+PRIORITY_BACKGROUND = 2  # Всё остальное
+
+
+class AssetLoadError(RuntimeError):
+    """Ошибка фоновой загрузки изображений, нужных для отрисовки."""
+
+    def __init__(self, errors):
+        """
+        :param errors: Словарь {путь: ошибка загрузки}.
+        """
+        super().__init__(
+            "Не удалось загрузить: "
+            + ", ".join(
+                f"{path} ({error!r})" for path, error in errors.items()
+            )
+        )
+        self.errors = errors
+
+
+class AssetLoader:
+    """
+    Загрузчик изображений в пуле потоков с приоритетами.
+    Потоки только читают и декодируют файлы, менеджер ресурсов
+    изменяется исключительно в основном потоке в методе pump.
+    """
+
+    def __init__(self, manager, workers=None):
+        """
+        Инициализация загрузчика.
+
+        :param manager: Менеджер ресурсов, куда попадают изображения.
+        :param workers: Количество потоков (по умолчанию по числу ядер,
+        но не больше 4).
+        """
+        self.manager = manager
+        self.requests = queue.PriorityQueue()  # (приоритет, номер, путь)
+        self.results = queue.Queue()  # (путь, хэш, поверхность или ошибка)
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+        self.started = set()  # Пути, взятые потоками в работу
+        self.requested = set()
+        self.done = set()
+        self.errors = {}  # Путь -> ошибка загрузки
+        self.workers = [
+            threading.Thread(target=self._work, daemon=True)
+            for _ in range(workers or min(4, os.cpu_count() or 1))
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def request(self, paths, priority=PRIORITY_BACKGROUND):
+        """
+        Постановка изображений в очередь загрузки.
+        Повторный запрос с более высоким приоритетом поднимает
+        ещё не начатую загрузку в очереди.
+
+        :param paths: Пути к изображениям относительно ресурсов.
+        :param priority: Приоритет загрузки.
+        """
+        for path in paths:
+            if path in self.done:
+                continue
+            self.requested.add(path)
+            self.requests.put((priority, next(self.counter), path))
+
+    def _work(self):
+        """Цикл потока: чтение и декодирование изображений из очереди."""
+        while True:
+            _, _, path = self.requests.get()
+            with self.lock:
+                if path in self.started:
+                    continue
+                self.started.add(path)
+            try:
+                full_path = asset_path(path)
+                digest, data = read_image_file(full_path)
+                surface = decode_image_data(data, full_path)
+                self.results.put((path, digest, surface))
+            except Exception as error:  # pylint: disable=W0718
+                # Любая ошибка отмечает путь как обработанный,
+                # иначе экран загрузки ждал бы его бесконечно
+                self.results.put((path, None, error))
+
+    @staticmethod
+    def finalize(surface):
+        """
+        Приведение декодированного изображения к формату экрана
+        (convert или convert_alpha), если окно уже создано.
+        Вызывается только в основном потоке.
+        """
+        if pygame.display.get_surface() is None:
+            return surface
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
+
+    def pump(self, limit=None):
+        """
+        Регистрация готовых изображений в менеджере ресурсов.
+        Вызывается в основном потоке раз в кадр.
+
+        :param limit: Максимальное количество изображений за вызов.
+        :return: Количество зарегистрированных изображений.
+        """
+        count = 0
+        while limit is None or count < limit:
+            try:
+                path, digest, result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if digest is None:
+                # Ошибка не теряется: она попадает в журнал, а нужные
+                # экрану пути проверяет raise_errors
+                self.errors[path] = result
+                logger.error("Не удалось загрузить %s: %r", path, result)
+            else:
+                self.manager.add_decoded(path, digest, self.finalize(result))
+            self.done.add(path)
+            count += 1
+        return count
+
+    def progress(self, paths=None):
+        """
+        Прогресс загрузки.
+
+        :param paths: Пути, по которым считается прогресс
+        (по умолчанию все запрошенные).
+        :return: Доля загруженных изображений от 0 до 1.
+        """
+        paths = self.requested if paths is None else set(paths)
+        if not paths:
+            return 1.0
+        return len(paths & self.done) / len(paths)
+
+    def is_done(self, paths=None):
+        """Проверка, загружены ли все указанные изображения."""
+        return self.progress(paths) >= 1.0
+
+    def raise_errors(self, paths=None):
+        """
+        Проверка ошибок загрузки указанных изображений.
+
+        :param paths: Пути для проверки (по умолчанию все запрошенные).
+        :raises AssetLoadError: Если какие-то из них не загрузились.
+        """
+        paths = self.requested if paths is None else set(paths)
+        errors = {
+            path: error for path, error in self.errors.items() if path in paths
+        }
+        if errors:
+            raise AssetLoadError(errors)
@@ -6,8 +6,15 @@
 import json
 import os
 import random
+from functools import partial
+
+# Профилировщик импортируется первым, чтобы замерить импорт остальных модулей
+from profiler import boot_profiler  # isort: split
 
 import pygame
+from animation_states import AnimationClock
+from assets import ImageList, asset_manager
+from battle import Battle, sprite_topleft
 from buttons import (
     b_left_player1,
     b_left_player2,
@@ -18,7 +25,13 @@ from buttons import (
     menu_buttons,
     settings_buttons,
 )
-from charecters import Player, player1_animations, player2_animations, x
+from charecters import (
+    character_table,
+    frame_cache,
+    player1_animations,
+    player2_animations,
+    x,
+)
 from constants import (
     CELL_SIZE,
     COLS,
@@ -27,40 +40,67 @@ from constants import (
     CURRENT_ANIMATION_PLAYER2,
     CURRENT_CHARACTER_PLAYER1,
     CURRENT_CHARACTER_PLAYER2,
-    CURRENT_FRAME_PLAYER1,
-    CURRENT_FRAME_PLAYER2,
-    FRAME_DELAY,
-    FRAME_TIME,
     OFFSET_X1,
     OFFSET_X2,
     OFFSET_Y,
     PADDING,
+    RENDER_FPS,
     ROWS,
     ROWS_1,
     SCREEN_HEIGHT,
     SCREEN_WIDTH,
+    SPRITE_SCALE,
+    TITLE_FONT,
 )
+from fonts import text_cache
 from helper import resource_path
+from hud import PlayerHud
+from layers import LayerCache
+from loader import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_NEXT,
+    PRIORITY_SCENE,
+    AssetLoader,
+)
+from projectiles import projectile_images
+from render import DirtyRenderer
+from ui import UiRouter
 
 # Инициализация Pygame
-pygame.init()
-pygame.font.init()
-font = pygame.font.SysFont("candara", 46)
+with boot_profiler.phase("pygame.init (main)"):
+    pygame.init()
+    pygame.font.init()
+with boot_profiler.phase("font"):
+    # Системный шрифт заголовков ищется один раз при запуске
+    text_cache.font(TITLE_FONT, 46)
 
 # Настройки экрана
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+with boot_profiler.phase("display.set_mode"):
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+# Отрисовка по изменённым областям экрана
+# (отключается переменной окружения GAME_DIRTY_RECTS=0)
+renderer = DirtyRenderer(screen, os.environ.get("GAME_DIRTY_RECTS") != "0")
+# Статичные слои экранов (фон вместе с неизменной разметкой)
+layer_cache = LayerCache(asset_manager)
 
-# Инициализация игроков
-player1 = None
-player2 = None
+# Бой и интерфейс игроков (создаются при переходе на поле сражения)
+battle = None
+arrow_images = None  # Изображения стрел (вправо, влево)
+hud_player1 = None
+hud_player2 = None
 
 # Загрузка фоновых изображений
-backgrounds = [
-    pygame.image.load(resource_path("assets/Maps/castle.png")),
-    pygame.image.load(resource_path("assets/Maps/dead forest.png")),
-    pygame.image.load(resource_path("assets/Maps/terrace.png")),
-    pygame.image.load(resource_path("assets/Maps/throne room.png")),
-]
+# (изображения загружаются через менеджер ресурсов при первом обращении)
+backgrounds = ImageList(
+    asset_manager,
+    [
+        "assets/Maps/castle.png",
+        "assets/Maps/dead forest.png",
+        "assets/Maps/terrace.png",
+        "assets/Maps/throne room.png",
+    ],
+)
 
 clock = pygame.time.Clock()
 RUNNING = True
@@ -69,21 +109,158 @@ game_state = {
     "show_battle_field": False,
     "mouse_pos": (0, 0),
     "show_settings": False,
-    "main_background": backgrounds[1],
+    "main_background": backgrounds.paths[1],  # Путь к фону боя
 }
 
-# Добавляем переменную для отслеживания времени восстановления
-REGEN_TIME = pygame.time.get_ticks()
+# Ставим в очередь подгрузку персонажей, видимых на экране выбора
+player1_animations.prefetch_neighbours(CURRENT_CHARACTER_PLAYER1)
+player2_animations.prefetch_neighbours(CURRENT_CHARACTER_PLAYER2)
+
+
+def current_scene():
+    """Имя текущего экрана игры."""
+    if game_state["show_battle_field"]:
+        return "battle"
+    if game_state["show_inventory"]:
+        return "inventory"
+    if game_state["show_settings"]:
+        return "settings"
+    return "menu"
+
+
+def scene_assets(scene):
+    """Пути к изображениям, необходимым для отрисовки экрана."""
+    if scene == "battle":
+        return [game_state["main_background"]]
+    if scene == "inventory":
+        buttons = [
+            *inventory_buttons,
+            b_left_player1,
+            b_right_player1,
+            b_left_player2,
+            b_right_player2,
+        ]
+        characters = {CURRENT_CHARACTER_PLAYER1, CURRENT_CHARACTER_PLAYER2}
+        return [
+            backgrounds.paths[3],
+            *(path for button in buttons for path in button.image_paths),
+            *(path for name in characters for path in x.asset_paths(name)),
+        ]
+    if scene == "settings":
+        return [
+            backgrounds.paths[3],
+            *(
+                path
+                for button in settings_buttons
+                for path in button.image_paths
+            ),
+        ]
+    return [
+        backgrounds.paths[1],
+        *(path for button in menu_buttons for path in button.image_paths),
+    ]
+
+
+def draw_loading_screen(screen_surface, progress):
+    """Отрисовка экрана загрузки с полосой прогресса."""
+    screen_surface.fill((20, 20, 20))
+    bar_x, bar_y = SCREEN_WIDTH // 2 - 300, SCREEN_HEIGHT // 2
+    pygame.draw.rect(screen_surface, (50, 50, 50), (bar_x, bar_y, 600, 30))
+    pygame.draw.rect(
+        screen_surface, (255, 168, 91), (bar_x, bar_y, int(600 * progress), 30)
+    )
+    pygame.draw.rect(
+        screen_surface, (255, 255, 255), (bar_x, bar_y, 600, 30), 1
+    )
+    draw_text(
+        screen_surface,
+        f"Loading... {int(progress * 100)}%",
+        36,
+        SCREEN_WIDTH // 2,
+        bar_y - 50,
+    )
+
+
+def run_loading_screen(screen_surface):
+    """
+    Показ экрана загрузки, пока не готовы ресурсы главного меню.
+    Остальные ресурсы догружаются в фоне во время игры.
+
+    :return: False, если окно закрыли во время загрузки.
+    :raises AssetLoadError: Если изображения меню не загрузились.
+    """
+    menu_assets = scene_assets("menu")
+    while not asset_loader.is_done(menu_assets):
+        for loading_event in pygame.event.get():
+            if loading_event.type == pygame.QUIT:
+                return False
+        asset_loader.pump()
+        draw_loading_screen(screen_surface, asset_loader.progress(menu_assets))
+        pygame.display.flip()
+        clock.tick(60)
+    # Без изображений главного меню играть нельзя
+    asset_loader.raise_errors(menu_assets)
+    return True
+
+
+# Фоновая загрузка ресурсов: сначала главное меню, затем остальные экраны
+asset_loader = AssetLoader(asset_manager)
+asset_loader.request(scene_assets("menu"), PRIORITY_SCENE)
+asset_loader.request(scene_assets("inventory"), PRIORITY_NEXT)
+asset_loader.request(scene_assets("settings"), PRIORITY_NEXT)
+asset_loader.request(backgrounds.paths, PRIORITY_BACKGROUND)
+for character in x:
+    asset_loader.request(x.asset_paths(character), PRIORITY_BACKGROUND)
+
+
+def draw_button(screen_surface, button, outline):
+    """Отрисовка кнопки (с обводкой, если она нужна)."""
+    button.paint(screen_surface)
+    if outline:
+        button.draw_outline(screen_surface)
+
+
+def add_button(frame_renderer, button, outline=False):
+    """
+    Добавление кнопки в кадр.
+    Кнопка под мышью или в фокусе клавиатуры рисуется с обводкой.
+    """
+    frame_renderer.widget(
+        button,
+        button.rect.inflate(10, 10),  # Вместе с обводкой
+        draw_button,
+        button,
+        outline or button.is_hovered or ui.is_focused(current_scene(), button),
+        state=button.is_pressed,
+    )
+
 
+def draw_menu(frame_renderer):
+    """Отрисовка главного меню."""
+    frame_renderer.begin(backgrounds[1])
+    for button in menu_buttons:
+        add_button(frame_renderer, button)
 
-def draw_settings(screen_surface):
+
+def build_settings_layer():
+    """Сборка статичного слоя экрана настроек: фон и заголовок."""
+    layer = backgrounds[3].convert()
+    label = text_cache.render(
+        "Choose battle background", 46, (255, 168, 91), face=TITLE_FONT
+    )
+    layer.blit(label, (SCREEN_WIDTH // 2 - 250, 75))
+    return layer
+
+
+def draw_settings(frame_renderer):
     """Отрисовка экрана настроек."""
-    label = font.render("Choose battle background", True, (255, 168, 91))
-    screen_surface.blit(backgrounds[3], (0, 0))
-    screen_surface.blit(label, (SCREEN_WIDTH // 2 - 250, 75))
+    frame_renderer.begin(
+        layer_cache.get(
+            "settings", (backgrounds.paths[3],), build_settings_layer
+        )
+    )
     for btn in settings_buttons:
-        btn.paint(screen_surface)
-        btn.draw_outline(screen_surface)
+        add_button(frame_renderer, btn, outline=True)
 
 
 inventory_path = resource_path("inventory.json")
@@ -111,327 +288,165 @@ def load_inventory(file_path):
 inventory_data = load_inventory(inventory_path)
 
 inventory_player1 = {
-    (int(k.split(",")[0]), int(k.split(",")[1])): pygame.image.load(
-        resource_path(v)
-    )
+    (int(k.split(",")[0]), int(k.split(",")[1])): asset_manager.load_image(v)
     for k, v in inventory_data["player1"].items()
 }
 inventory_player2 = {
-    (int(k.split(",")[0]), int(k.split(",")[1])): pygame.image.load(
-        resource_path(v)
-    )
+    (int(k.split(",")[0]), int(k.split(",")[1])): asset_manager.load_image(v)
     for k, v in inventory_data["player2"].items()
 }
 
 extra_cells_player1 = {
-    (int(k.split(",")[0]), int(k.split(",")[1])): pygame.image.load(
-        resource_path(v)
-    )
+    (int(k.split(",")[0]), int(k.split(",")[1])): asset_manager.load_image(v)
     for k, v in inventory_data["extra_cells"]["player1"].items()
 }
 extra_cells_player2 = {
-    (int(k.split(",")[0]), int(k.split(",")[1])): pygame.image.load(
-        resource_path(v)
-    )
+    (int(k.split(",")[0]), int(k.split(",")[1])): asset_manager.load_image(v)
     for k, v in inventory_data["extra_cells"]["player2"].items()
 }
 
+# Версия содержимого инвентарей: по ней кэшируются слои с инвентарём.
+# Код, меняющий предметы в инвентарях, увеличивает её на 1
+inventory_version = 0
+
 
 def draw_text(surface, text, size, x, y, color=(255, 255, 255)):
     """Отрисовка текста на экране."""
-    font = pygame.font.Font(None, size)
-    text_surface = font.render(text, True, color)
+    text_surface = text_cache.render(text, size, color)
     text_rect = text_surface.get_rect()
     # Центрируем текст по горизонтали и устанавливаем верхнюю точку
     text_rect.midtop = (x, y)
     surface.blit(text_surface, text_rect)
 
 
-def draw_stats_bar(
-    surface,
-    x,
-    y,
-    width,
-    height,
-    current,
-    max_value,
-    color,
-    label,
-    player_name,
-    is_first_bar=False,
-):
-    """Отрисовка полоски статистики (HP или защита)."""
-    # Рисуем фон полоски
-    pygame.draw.rect(surface, (50, 50, 50), (x, y, width, height))
-
-    # Рисуем полоску
-    bar_width = int((current / max_value) * width)
-    pygame.draw.rect(surface, color, (x, y, bar_width, height))
-
-    # Рисуем рамку
-    pygame.draw.rect(surface, (255, 255, 255), (x, y, width, height), 1)
-
-    # Создаем текст с значением
-    font = pygame.font.Font(None, 20)
-    value_text = f"{current}/{max_value}"
-    text_surface = font.render(value_text, True, (0, 0, 0))
-
-    # Вычисляем позицию для текста (по центру полоски)
-    text_x = x + (width - text_surface.get_width()) // 2
-    text_y = y + (height - text_surface.get_height()) // 2
-
-    # Рисуем текст
-    surface.blit(text_surface, (text_x, text_y))
-
-    # Рисуем название полоски в левом углу
-    label_font = pygame.font.Font(None, 16)
-    label_surface = label_font.render(label, True, (0, 0, 0))
-    surface.blit(label_surface, (x + 5, y + 2))
-
-    # Рисуем имя игрока только над первым хотбаром
-    if is_first_bar:
-        player_font = pygame.font.Font(None, 20)
-        player_surface = player_font.render(player_name, True, (255, 255, 255))
-        surface.blit(player_surface, (x, y - 20))
-
-
-def draw_battle_field(screen_surface):
-    """Отрисовка поля сражения."""
-    global player1, player2
-    screen_surface.blit(game_state["main_background"], (0, 0))
-
-    screen_surface.blit(game_state["main_background"], (0, 0))
-
-    # Если персонажи еще не созданы, создаем их
-    if player1 is None or player2 is None:
-        # Создаем персонажей с базовыми характеристиками
-        player1 = Player(
-            CURRENT_CHARACTER_PLAYER1,  # character
-            200,  # st_x
-            SCREEN_HEIGHT - 600,  # st_y
-            100,  # hp
-            50,  # defend
-            10,  # speed_run
-            15,  # jump_height
-            5,  # speed_walk
-            x[CURRENT_CHARACTER_PLAYER1],  # animations
-        )
+# Полоски маны и выносливости: (цвет, название)
+RESOURCE_BARS = {
+    "mana": ((0, 0, 255), "Mana"),
+    "stamina": ((255, 165, 0), "Stamina"),
+}
 
-        player2 = Player(
-            CURRENT_CHARACTER_PLAYER2,  # character
-            SCREEN_WIDTH - 300,  # st_x
-            SCREEN_HEIGHT - 600,  # st_y
-            100,  # hp
-            50,  # defend
-            10,  # speed_run
-            15,  # jump_height
-            5,  # speed_walk
-            x[CURRENT_CHARACTER_PLAYER2],  # animations
-        )
 
-        # Инициализация кадров анимации
-        global \
-            CURRENT_FRAME_PLAYER1, \
-            CURRENT_FRAME_PLAYER2, \
-            CURRENT_ANIMATION_PLAYER1, \
-            CURRENT_ANIMATION_PLAYER2
-        CURRENT_FRAME_PLAYER1 = 0
-        CURRENT_FRAME_PLAYER2 = 0
-        CURRENT_ANIMATION_PLAYER1 = "idle"
-        CURRENT_ANIMATION_PLAYER2 = "idle"
-
-    # Ограничиваем движение персонажей
-    if player1 is not None:
-        # Ограничение по X для player1 (только левая граница экрана)
-        player1.st_x = max(50, min(player1.st_x, SCREEN_WIDTH - 100))
-        # Ограничение по Y для player1
-        player1.st_y = max(50, min(player1.st_y, SCREEN_HEIGHT - 100))
-        player1.ground_y = (
-            SCREEN_HEIGHT - 600
-        )  # Обновляем позицию земли для player1
-
-    if player2 is not None:
-        # Ограничение по X для player2 (только правая граница экрана)
-        player2.st_x = max(50, min(player2.st_x, SCREEN_WIDTH - 100))
-        # Ограничение по Y для player2
-        player2.st_y = max(50, min(player2.st_y, SCREEN_HEIGHT - 100))
-        player2.ground_y = (
-            SCREEN_HEIGHT - 600
-        )  # Обновляем позицию земли для player2
-
-    # Отрисовываем персонажей с масштабированием
-    current_animation_p1 = player1.animations[CURRENT_ANIMATION_PLAYER1]
-    # Проверяем и корректируем индекс кадра для player1
-    if CURRENT_FRAME_PLAYER1 >= len(current_animation_p1):
-        CURRENT_FRAME_PLAYER1 = 0
-    frame_p1 = current_animation_p1[CURRENT_FRAME_PLAYER1]
-    # Масштабируем спрайт player1 (увеличиваем в 2 раза)
-    scaled_frame_p1 = pygame.transform.scale(
-        frame_p1, (frame_p1.get_width() * 2, frame_p1.get_height() * 2)
-    )
-    # Отражаем спрайт player1 по горизонтали, если он движется влево
-    if player1.direction == -1:
-        scaled_frame_p1 = pygame.transform.flip(scaled_frame_p1, True, False)
-    screen_surface.blit(
-        scaled_frame_p1,
+def player_bars(character):
+    """Полоски интерфейса игрока: HP, защита и мана или выносливость."""
+    kind = character_table.ids[character]
+    resource = character_table.resources[kind]
+    return [
+        ("hp", character_table.hp[kind], (255, 0, 0), "HP"),
+        ("defend", character_table.defend[kind], (0, 255, 0), "Def"),
         (
-            player1.st_x - frame_p1.get_width() // 2,
-            player1.st_y - frame_p1.get_height() // 2,
+            resource,
+            character_table.resource_max[kind],
+            *RESOURCE_BARS[resource],
         ),
-    )
-    # Отрисовываем подсказку над первым игроком (центрированную)
-    draw_text(
-        screen_surface,
-        "Player 1",
-        24,
-        player1.st_x + 50,
-        player1.st_y,
-        (255, 255, 255),
-    )
+    ]
+
 
-    current_animation_p2 = player2.animations[CURRENT_ANIMATION_PLAYER2]
-    # Проверяем и корректируем индекс кадра для player2
-    if CURRENT_FRAME_PLAYER2 >= len(current_animation_p2):
-        CURRENT_FRAME_PLAYER2 = 0
-    frame_p2 = current_animation_p2[CURRENT_FRAME_PLAYER2]
-    # Масштабируем спрайт player2 (увеличиваем в 2 раза)
-    scaled_frame_p2 = pygame.transform.scale(
-        frame_p2, (frame_p2.get_width() * 2, frame_p2.get_height() * 2)
+def start_battle():
+    """Создание боя выбранных персонажей и интерфейса игроков."""
+    global battle, hud_player1, hud_player2, arrow_images
+    characters = (CURRENT_CHARACTER_PLAYER1, CURRENT_CHARACTER_PLAYER2)
+    battle = Battle(
+        characters,
+        x,
+        pygame.time.get_ticks(),
+        # Зерно сохраняется в записи нажатий, чтобы бой повторялся
+        seed=random.randrange(2**32),
+        # Анимации закреплены в памяти на время боя
+        animations=[x.acquire(name) for name in characters],
     )
-    # Отражаем спрайт player2 по горизонтали, если он движется вправо
-    if player2.direction == -1:
-        scaled_frame_p2 = pygame.transform.flip(scaled_frame_p2, True, False)
-    screen_surface.blit(
-        scaled_frame_p2,
-        (
-            player2.st_x - frame_p2.get_width() // 2,
-            player2.st_y - frame_p2.get_height() // 2,
-        ),
+    # Запись нажатий для повтора боя в безоконном режиме (headless.py)
+    if os.environ.get("GAME_RECORD_INPUT"):
+        battle.recording = []
+
+    # Интерфейс игроков: у мага мана, у остальных выносливость
+    hud_player1 = PlayerHud(
+        "Player 1", 50, 50, player_bars(CURRENT_CHARACTER_PLAYER1)
     )
-    # Отрисовываем подсказку над вторым игроком (центрированную)
-    draw_text(
-        screen_surface,
+    hud_player2 = PlayerHud(
         "Player 2",
-        24,
-        player2.st_x + 50,
-        player2.st_y,
-        (255, 255, 255),
-    )
-
-    # Отрисовываем статистику для первого игрока
-    draw_stats_bar(
-        screen_surface,
-        50,
+        SCREEN_WIDTH - 250,
         50,
-        200,
-        20,
-        player1.hp,
-        100,
-        (255, 0, 0),
-        "HP",
-        "Player 1",
-        True,
+        player_bars(CURRENT_CHARACTER_PLAYER2),
     )
-    draw_stats_bar(
-        screen_surface,
-        50,
-        80,
-        200,
-        20,
-        player1.defend,
-        50,
-        (0, 255, 0),
-        "Def",
-        "Player 1",
+
+    # Заранее готовим увеличенные кадры стойки обоих персонажей
+    for name in characters:
+        frame_cache.warm(name, "idle", SPRITE_SCALE)
+    arrow_images = projectile_images(asset_manager, SPRITE_SCALE)
+
+
+def end_battle():
+    """
+    Завершение боя: сохранение записанных нажатий
+    и снятие закрепления анимаций персонажей.
+    """
+    global battle
+    if battle.recording is not None:
+        with open(
+            os.environ["GAME_RECORD_INPUT"], "w", encoding="utf-8"
+        ) as record_file:
+            json.dump(
+                {"seed": battle.seed, "events": battle.recording},
+                record_file,
+            )
+    for fighter in battle.fighters:
+        x.release(fighter.player.character)
+    battle = None
+
+
+def draw_battle_field(frame_renderer):
+    """Отрисовка поля сражения."""
+    frame_renderer.begin(
+        layer_cache.get(
+            "battle",
+            (game_state["main_background"], inventory_version),
+            build_battle_layer,
+        )
     )
-    # Отображаем ману для мага или выносливость для остальных
-    if CURRENT_CHARACTER_PLAYER1 == "Wizard":
-        draw_stats_bar(
-            screen_surface,
-            50,
-            110,
-            200,
-            20,
-            int(player1.mana),
-            100,
-            (0, 0, 255),
-            "Mana",
-            "Player 1",
+
+    # Отрисовываем персонажей с масштабированием в положении,
+    # интерполированном между двумя последними шагами симуляции
+    for label, fighter in zip(("Player 1", "Player 2"), battle.fighters):
+        player = fighter.player
+        st_x, st_y = fighter.position(battle.alpha)
+        frame = player.animations[fighter.animation][fighter.frame]
+        # Берём из кэша спрайт, увеличенный в SPRITE_SCALE раз
+        # и отражённый по горизонтали, если персонаж движется влево
+        scaled_frame = frame_cache.get(
+            player.character,
+            fighter.animation,
+            fighter.frame,
+            SPRITE_SCALE,
+            player.direction == -1,
         )
-    else:
-        draw_stats_bar(
-            screen_surface,
-            50,
-            110,
-            200,
-            20,
-            int(player1.stamina),
-            100,
-            (255, 165, 0),
-            "Stamina",
-            "Player 1",
+        frame_renderer.sprite(
+            scaled_frame, sprite_topleft((st_x, st_y), frame.get_size())
+        )
+        # Отрисовываем подсказку над игроком (центрированную)
+        label_surface = text_cache.render(label, 24)
+        frame_renderer.sprite(
+            label_surface,
+            label_surface.get_rect(midtop=(st_x + 50, st_y)).topleft,
         )
 
-    # Отрисовываем статистику для второго игрока
-    draw_stats_bar(
-        screen_surface,
-        SCREEN_WIDTH - 250,
-        50,
-        200,
-        20,
-        player2.hp,
-        100,
-        (255, 0, 0),
-        "HP",
-        "Player 2",
-        True,
-    )
-    draw_stats_bar(
-        screen_surface,
-        SCREEN_WIDTH - 250,
-        80,
-        200,
-        20,
-        player2.defend,
-        50,
-        (0, 255, 0),
-        "Def",
-        "Player 2",
+    # Стрелы рисуются вместе, одним вызовом blits
+    frame_renderer.sprite_batch(
+        battle.projectiles.blit_sequence(arrow_images, battle.alpha)
     )
-    # Отображаем ману для мага или выносливость для остальных
-    if CURRENT_CHARACTER_PLAYER2 == "Wizard":
-        draw_stats_bar(
-            screen_surface,
-            SCREEN_WIDTH - 250,
-            110,
-            200,
-            20,
-            int(player2.mana),
-            100,
-            (0, 0, 255),
-            "Mana",
-            "Player 2",
-        )
-    else:
-        draw_stats_bar(
-            screen_surface,
-            SCREEN_WIDTH - 250,
-            110,
-            200,
-            20,
-            int(player2.stamina),
-            100,
-            (255, 165, 0),
-            "Stamina",
-            "Player 2",
-        )
 
-    return screen_surface
+    # Интерфейс игроков: полоски перерисовываются,
+    # только когда меняются их значения
+    frame_renderer.mark_dirty(
+        hud_player1.update(battle.fighters[0].player)
+        + hud_player2.update(battle.fighters[1].player)
+    )
+    hud_player1.add_to(frame_renderer)
+    hud_player2.add_to(frame_renderer)
 
 
 def draw_inventory_grid(screen_surface, offset_x, inventory, label_text):
     """Отрисовка сетки инвентаря для игрока."""
-    label = font.render(label_text, True, (255, 255, 255))
+    label = text_cache.render(label_text, 46, (255, 255, 255), face=TITLE_FONT)
     screen_surface.blit(
         label, (offset_x + (CELL_SIZE * 5 + PADDING * 4) / 2.7, OFFSET_Y - 250)
     )
@@ -465,64 +480,71 @@ def draw_inventory_grid(screen_surface, offset_x, inventory, label_text):
                 )
 
 
-def draw_inventory(screen_surface):
-    """Отрисовка инвентаря."""
-    global CURRENT_FRAME_PLAYER1, CURRENT_FRAME_PLAYER2, FRAME_TIME
+# Часы анимаций персонажей на экране выбора (Player 1, Player 2)
+preview_clocks = (AnimationClock(), AnimationClock())
 
-    screen_surface.blit(backgrounds[3], (0, 0))
 
-    # Обновление кадра анимации для Player 1 и Player 2
-    current_time = pygame.time.get_ticks()
-    if current_time - FRAME_TIME > FRAME_DELAY:
-        FRAME_TIME = current_time
-        CURRENT_FRAME_PLAYER1 = (CURRENT_FRAME_PLAYER1 + 1) % len(
-            player1_animations[CURRENT_CHARACTER_PLAYER1][
-                CURRENT_ANIMATION_PLAYER1
-            ]
-        )
-        CURRENT_FRAME_PLAYER2 = (CURRENT_FRAME_PLAYER2 + 1) % len(
-            player2_animations[CURRENT_CHARACTER_PLAYER2][
-                CURRENT_ANIMATION_PLAYER2
-            ]
+def preview_durations(character, animation):
+    """Длительности кадров анимации персонажа на экране выбора."""
+    return character_table.frame_durations(
+        character_table.ids[character],
+        animation,
+        x.frame_counts(character)[animation],
+    )
+
+
+def draw_inventory(frame_renderer):
+    """Отрисовка инвентаря."""
+    frame_renderer.begin(
+        layer_cache.get(
+            "inventory",
+            (backgrounds.paths[3], inventory_version),
+            build_inventory_layer,
         )
+    )
 
-    # Отрисовка персонажа Player 1
-    current_animation_player1 = player1_animations[CURRENT_CHARACTER_PLAYER1][
-        CURRENT_ANIMATION_PLAYER1
-    ]
-    character_image_player1 = current_animation_player1[CURRENT_FRAME_PLAYER1]
-    # Масштабируем спрайт player1 (увеличиваем в 2 раза)
-    scaled_character_image_player1 = pygame.transform.scale(
-        character_image_player1,
-        (
-            character_image_player1.get_width() * 2,
-            character_image_player1.get_height() * 2,
+    # У каждого персонажа свои часы анимации
+    current_time = pygame.time.get_ticks()
+    frame_player1 = preview_clocks[0].advance(
+        current_time,
+        preview_durations(
+            CURRENT_CHARACTER_PLAYER1, CURRENT_ANIMATION_PLAYER1
+        ),
+    )
+    frame_player2 = preview_clocks[1].advance(
+        current_time,
+        preview_durations(
+            CURRENT_CHARACTER_PLAYER2, CURRENT_ANIMATION_PLAYER2
         ),
     )
+
+    # Отрисовка персонажа Player 1
+    # Берём из кэша спрайт player1, увеличенный в 2 раза
+    scaled_character_image_player1 = frame_cache.get(
+        CURRENT_CHARACTER_PLAYER1,
+        CURRENT_ANIMATION_PLAYER1,
+        frame_player1,
+        2,
+    )
     character_rect_player1 = scaled_character_image_player1.get_rect(
         center=(
             OFFSET_X1 + (COLS * (CELL_SIZE + PADDING)) // 2,
             OFFSET_Y - 150,
         )
     )
-    screen_surface.blit(scaled_character_image_player1, character_rect_player1)
+    frame_renderer.sprite(
+        scaled_character_image_player1, character_rect_player1.topleft
+    )
 
     # Отрисовка персонажа Player 2
-    current_animation_player2 = player2_animations[CURRENT_CHARACTER_PLAYER2][
-        CURRENT_ANIMATION_PLAYER2
-    ]
-    character_image_player2 = current_animation_player2[CURRENT_FRAME_PLAYER2]
-    # Масштабируем спрайт player2 (увеличиваем в 2 раза)
-    scaled_character_image_player2 = pygame.transform.scale(
-        character_image_player2,
-        (
-            character_image_player2.get_width() * 2,
-            character_image_player2.get_height() * 2,
-        ),
-    )
-    # Отражаем спрайт player2 по горизонтали
-    scaled_character_image_player2 = pygame.transform.flip(
-        scaled_character_image_player2, True, False
+    # Берём из кэша спрайт player2, увеличенный в 2 раза
+    # и отражённый по горизонтали
+    scaled_character_image_player2 = frame_cache.get(
+        CURRENT_CHARACTER_PLAYER2,
+        CURRENT_ANIMATION_PLAYER2,
+        frame_player2,
+        2,
+        True,
     )
     character_rect_player2 = scaled_character_image_player2.get_rect(
         center=(
@@ -530,105 +552,154 @@ def draw_inventory(screen_surface):
             OFFSET_Y - 150,
         )
     )
-    screen_surface.blit(scaled_character_image_player2, character_rect_player2)
+    frame_renderer.sprite(
+        scaled_character_image_player2, character_rect_player2.topleft
+    )
 
     # Отрисовка кнопок переключения персонажей
-    b_left_player1.paint(screen_surface)
-    b_right_player1.paint(screen_surface)
-    b_left_player2.paint(screen_surface)
-    b_right_player2.paint(screen_surface)
-
-    # Отрисовка инвентаря игроков
-    draw_inventory_grid(
-        screen_surface,
-        OFFSET_X1,
-        inventory_player1,
-        "Player 1",
-    )
-    draw_inventory_grid(
-        screen_surface,
-        OFFSET_X2,
-        inventory_player2,
-        "Player 2",
-    )
+    for button in (
+        b_left_player1,
+        b_right_player1,
+        b_left_player2,
+        b_right_player2,
+    ):
+        add_button(frame_renderer, button)
 
-    draw_battle_inventory()
-    b_play.paint(screen_surface)
+    add_button(frame_renderer, b_play)
 
 
-def draw_battle_inventory():
-    """Отрисовка инвентаря для боя."""
+def battle_inventory_offset_y():
+    """Координата Y инвентаря для боя."""
     if game_state["show_battle_field"]:
-        battle_inventory_offset_y = (
-            OFFSET_Y + ROWS * (CELL_SIZE + PADDING) + 200
-        )
-    else:
-        battle_inventory_offset_y = (
-            OFFSET_Y + ROWS * (CELL_SIZE + PADDING) + 50
-        )
+        return OFFSET_Y + ROWS * (CELL_SIZE + PADDING) + 200
+    return OFFSET_Y + ROWS * (CELL_SIZE + PADDING) + 50
+
 
+def battle_inventory_rect(offset_x):
+    """Прямоугольник инвентаря для боя игрока."""
     # Смещение для центрирования инвентаря для боя
     center_offset = (COLS - COLS_1) * (CELL_SIZE + PADDING) // 2
+    return pygame.Rect(
+        offset_x + center_offset,
+        battle_inventory_offset_y(),
+        COLS_1 * (CELL_SIZE + PADDING),
+        ROWS_1 * (CELL_SIZE + PADDING),
+    )
+
 
-    # Отрисовка инвентаря для боя игрока 1
+def draw_battle_inventory(screen_surface, offset_x, extra_cells):
+    """Отрисовка инвентаря для боя игрока."""
+    grid_rect = battle_inventory_rect(offset_x)
     for row in range(ROWS_1):
         for col in range(COLS_1):
-            x = OFFSET_X1 + col * (CELL_SIZE + PADDING) + center_offset
-            y = battle_inventory_offset_y + row * (CELL_SIZE + PADDING)
+            x = grid_rect.x + col * (CELL_SIZE + PADDING)
+            y = grid_rect.y + row * (CELL_SIZE + PADDING)
             pygame.draw.rect(
-                screen,
+                screen_surface,
                 (192, 192, 192),
                 (x + 4, y + 4, CELL_SIZE - 8, CELL_SIZE - 8),
                 2,
             )
             pygame.draw.rect(
-                screen,
+                screen_surface,
                 (64, 64, 64),
                 (x + 2, y + 2, CELL_SIZE - 4, CELL_SIZE - 4),
                 2,
             )
             pygame.draw.rect(
-                screen, (0, 0, 0), (x, y, CELL_SIZE, CELL_SIZE), 2
+                screen_surface, (0, 0, 0), (x, y, CELL_SIZE, CELL_SIZE), 2
             )
 
-            if (row, col) in extra_cells_player1:
-                screen.blit(
+            if (row, col) in extra_cells:
+                screen_surface.blit(
                     pygame.transform.scale(
-                        extra_cells_player1[(row, col)], (CELL_SIZE, CELL_SIZE)
+                        extra_cells[(row, col)], (CELL_SIZE, CELL_SIZE)
                     ),
                     (x, y),
                 )
 
-    # Отрисовка инвентаря для боя игрока 2
-    for row in range(ROWS_1):
-        for col in range(COLS_1):
-            x = OFFSET_X2 + col * (CELL_SIZE + PADDING) + center_offset
-            y = battle_inventory_offset_y + row * (CELL_SIZE + PADDING)
-            pygame.draw.rect(
-                screen,
-                (192, 192, 192),
-                (x + 4, y + 4, CELL_SIZE - 8, CELL_SIZE - 8),
-                2,
-            )
-            pygame.draw.rect(
-                screen,
-                (64, 64, 64),
-                (x + 2, y + 2, CELL_SIZE - 4, CELL_SIZE - 4),
-                2,
-            )
-            pygame.draw.rect(
-                screen, (0, 0, 0), (x, y, CELL_SIZE, CELL_SIZE), 2
-            )
 
-            if (row, col) in extra_cells_player2:
-                screen.blit(
-                    pygame.transform.scale(
-                        extra_cells_player2[(row, col)], (CELL_SIZE, CELL_SIZE)
-                    ),
-                    (x, y),
-                )
+def draw_battle_inventories(screen_surface):
+    """Отрисовка инвентарей для боя обоих игроков."""
+    draw_battle_inventory(screen_surface, OFFSET_X1, extra_cells_player1)
+    draw_battle_inventory(screen_surface, OFFSET_X2, extra_cells_player2)
+
+
+def build_inventory_layer():
+    """
+    Сборка статичного слоя экрана выбора персонажей:
+    фон, сетки инвентаря с подписями и инвентари для боя.
+    """
+    layer = backgrounds[3].convert()
+    draw_inventory_grid(layer, OFFSET_X1, inventory_player1, "Player 1")
+    draw_inventory_grid(layer, OFFSET_X2, inventory_player2, "Player 2")
+    draw_battle_inventories(layer)
+    return layer
+
+
+def build_battle_layer():
+    """Сборка статичного слоя поля сражения: фон и инвентари для боя."""
+    layer = asset_manager.load_image(game_state["main_background"]).convert()
+    draw_battle_inventories(layer)
+    return layer
 
 
+# Экран загрузки до первого интерактивного кадра
+with boot_profiler.phase("loading screen"):
+    RUNNING = run_loading_screen(screen)
+SCENE = current_scene()
+boot_profiler.finish()
+
+
+def switch_character_player1(_game_state, step):
+    """Переключение Player 1 на соседнего персонажа (step = -1 или 1)."""
+    global CURRENT_CHARACTER_PLAYER1, CURRENT_ANIMATION_PLAYER1
+    characters = list(player1_animations.keys())
+    current_index = characters.index(CURRENT_CHARACTER_PLAYER1)
+    CURRENT_CHARACTER_PLAYER1 = characters[
+        (current_index + step) % len(characters)
+    ]
+    CURRENT_ANIMATION_PLAYER1 = "idle"
+    preview_clocks[0].reset()
+    # Подгружаем соседей выбранного персонажа заранее
+    player1_animations.prefetch_neighbours(CURRENT_CHARACTER_PLAYER1)
+
+
+def switch_character_player2(_game_state, step):
+    """Переключение Player 2 на соседнего персонажа (step = -1 или 1)."""
+    global CURRENT_CHARACTER_PLAYER2, CURRENT_ANIMATION_PLAYER2
+    characters = list(player2_animations.keys())
+    current_index = characters.index(CURRENT_CHARACTER_PLAYER2)
+    CURRENT_CHARACTER_PLAYER2 = characters[
+        (current_index + step) % len(characters)
+    ]
+    CURRENT_ANIMATION_PLAYER2 = "idle"
+    preview_clocks[1].reset()
+    # Подгружаем соседей выбранного персонажа заранее
+    player2_animations.prefetch_neighbours(CURRENT_CHARACTER_PLAYER2)
+
+
+# Кнопки переключения персонажей
+b_left_player1.action = partial(switch_character_player1, step=-1)
+b_right_player1.action = partial(switch_character_player1, step=1)
+b_left_player2.action = partial(switch_character_player2, step=-1)
+b_right_player2.action = partial(switch_character_player2, step=1)
+
+# Кнопки экранов меню в порядке отрисовки
+ui = UiRouter(
+    {
+        "menu": menu_buttons,
+        "inventory": [
+            b_left_player1,
+            b_right_player1,
+            b_left_player2,
+            b_right_player2,
+            *inventory_buttons,
+        ],
+        "settings": settings_buttons,
+    }
+)
+
 # Игровой цикл
 while RUNNING:
     # Обработка событий
@@ -636,505 +707,74 @@ while RUNNING:
         if event.type == pygame.QUIT:
             RUNNING = False
 
-        # Обработка клавиш на поле сражения
-        if game_state["show_battle_field"] and player1 and player2:
-            if event.type == pygame.KEYDOWN:
-                # Обработка нажатий клавиш для Player 1
-                if event.key == pygame.K_w:
-                    player1.jump()
-                    CURRENT_ANIMATION_PLAYER1 = "jump"
-                elif event.key == pygame.K_c:
-                    # Проверяем наличие стамины/маны для атаки
-                    if (
-                        CURRENT_CHARACTER_PLAYER1 == "Wizard"
-                        and player1.mana >= 5
-                    ) or (
-                        CURRENT_CHARACTER_PLAYER1 != "Wizard"
-                        and player1.stamina >= 5
-                    ):
-                        # Расходуем стамину/ману
-                        if CURRENT_CHARACTER_PLAYER1 == "Wizard":
-                            player1.mana -= 5
-                        else:
-                            player1.stamina -= 5
-                        # Случайный выбор анимации атаки в зависимости от персонажа
-                        if CURRENT_CHARACTER_PLAYER1 == "Archer":
-                            CURRENT_ANIMATION_PLAYER1 = random.choice(
-                                ["shot_1", "shot_2"]
-                            )
-                        elif CURRENT_CHARACTER_PLAYER1 == "Enchantress":
-                            CURRENT_ANIMATION_PLAYER1 = random.choice(
-                                [
-                                    "attack_1",
-                                    "attack_2",
-                                    "attack_3",
-                                    "attack_4",
-                                ]
-                            )
-                        elif CURRENT_CHARACTER_PLAYER1 == "Knight":
-                            CURRENT_ANIMATION_PLAYER1 = random.choice(
-                                [
-                                    "attack_1",
-                                    "attack_2",
-                                    "attack_3",
-                                    "attack_4",
-                                ]
-                            )
-                        elif CURRENT_CHARACTER_PLAYER1 == "Musketeer":
-                            CURRENT_ANIMATION_PLAYER1 = random.choice(
-                                [
-                                    "attack_1",
-                                    "attack_2",
-                                    "attack_3",
-                                    "attack_4",
-                                ]
-                            )
-                        elif CURRENT_CHARACTER_PLAYER1 == "Swordsman":
-                            CURRENT_ANIMATION_PLAYER1 = random.choice(
-                                ["attack_1", "attack_2", "attack_3"]
-                            )
-                        elif CURRENT_CHARACTER_PLAYER1 == "Wizard":
-                            CURRENT_ANIMATION_PLAYER1 = random.choice(
-                                ["attack_1", "attack_2", "attack_3"]
-                            )
-                        CURRENT_FRAME_PLAYER1 = (
-                            0  # Сбрасываем кадр при выборе новой анимации
-                        )
-
-                # Обработка нажатий клавиш для Player 2
-                if event.key == pygame.K_i:
-                    player2.jump()
-                    CURRENT_ANIMATION_PLAYER2 = "jump"
-                elif event.key == pygame.K_n:
-                    # Проверяем наличие стамины/маны для атаки
-                    if (
-                        CURRENT_CHARACTER_PLAYER2 == "Wizard"
-                        and player2.mana >= 5
-                    ) or (
-                        CURRENT_CHARACTER_PLAYER2 != "Wizard"
-                        and player2.stamina >= 5
-                    ):
-                        # Расходуем стамину/ману
-                        if CURRENT_CHARACTER_PLAYER2 == "Wizard":
-                            player2.mana -= 5
-                        else:
-                            player2.stamina -= 5
-                        # Случайный выбор анимации атаки в зависимости от персонажа
-                        if CURRENT_CHARACTER_PLAYER2 == "Archer":
-                            CURRENT_ANIMATION_PLAYER2 = random.choice(
-                                ["shot_1", "shot_2"]
-                            )
-                        elif CURRENT_CHARACTER_PLAYER2 == "Enchantress":
-                            CURRENT_ANIMATION_PLAYER2 = random.choice(
-                                [
-                                    "attack_1",
-                                    "attack_2",
-                                    "attack_3",
-                                    "attack_4",
-                                ]
-                            )
-                        elif CURRENT_CHARACTER_PLAYER2 == "Knight":
-                            CURRENT_ANIMATION_PLAYER2 = random.choice(
-                                [
-                                    "attack_1",
-                                    "attack_2",
-                                    "attack_3",
-                                    "attack_4",
-                                ]
-                            )
-                        elif CURRENT_CHARACTER_PLAYER2 == "Musketeer":
-                            CURRENT_ANIMATION_PLAYER2 = random.choice(
-                                [
-                                    "attack_1",
-                                    "attack_2",
-                                    "attack_3",
-                                    "attack_4",
-                                ]
-                            )
-                        elif CURRENT_CHARACTER_PLAYER2 == "Swordsman":
-                            CURRENT_ANIMATION_PLAYER2 = random.choice(
-                                ["attack_1", "attack_2", "attack_3"]
-                            )
-                        elif CURRENT_CHARACTER_PLAYER2 == "Wizard":
-                            CURRENT_ANIMATION_PLAYER2 = random.choice(
-                                ["attack_1", "attack_2", "attack_3"]
-                            )
-                        CURRENT_FRAME_PLAYER2 = (
-                            0  # Сбрасываем кадр при выборе новой анимации
-                        )
-
-            if event.type == pygame.KEYUP:
-                # Возвращаем анимацию idle при отпускании клавиш
-                if event.key in (pygame.K_a, pygame.K_d):
-                    CURRENT_ANIMATION_PLAYER1 = "idle"
-                if event.key in (pygame.K_j, pygame.K_l):
-                    CURRENT_ANIMATION_PLAYER2 = "idle"
+        # Клавиши управления переводятся в действия игроков
+        if battle is not None:
+            battle.handle_event(event)
 
         if event.type == pygame.MOUSEBUTTONDOWN:
             game_state["mouse_pos"] = pygame.mouse.get_pos()
 
-            if game_state["show_inventory"]:
-                # Обрабатываем кнопки переключения персонажей Player 1
-                if b_left_player1.is_clicked(game_state["mouse_pos"]):
-                    # Переключение на предыдущего персонажа для Player 1
-                    characters = list(player1_animations.keys())
-                    current_index = characters.index(CURRENT_CHARACTER_PLAYER1)
-                    CURRENT_CHARACTER_PLAYER1 = characters[
-                        (current_index - 1) % len(characters)
-                    ]
-                    CURRENT_ANIMATION_PLAYER1 = "idle"
-                    CURRENT_FRAME_PLAYER1 = 0
-                elif b_right_player1.is_clicked(game_state["mouse_pos"]):
-                    # Переключение на следующего персонажа для Player 1
-                    characters = list(player1_animations.keys())
-                    current_index = characters.index(CURRENT_CHARACTER_PLAYER1)
-                    CURRENT_CHARACTER_PLAYER1 = characters[
-                        (current_index + 1) % len(characters)
-                    ]
-                    CURRENT_ANIMATION_PLAYER1 = "idle"
-                    CURRENT_FRAME_PLAYER1 = 0
-
-                # Обрабатываем кнопки переключения персонажей Player 2
-                if b_left_player2.is_clicked(game_state["mouse_pos"]):
-                    # Переключение на предыдущего персонажа для Player 2
-                    characters = list(player2_animations.keys())
-                    current_index = characters.index(CURRENT_CHARACTER_PLAYER2)
-                    CURRENT_CHARACTER_PLAYER2 = characters[
-                        (current_index - 1) % len(characters)
-                    ]
-                    CURRENT_ANIMATION_PLAYER2 = "idle"
-                    CURRENT_FRAME_PLAYER2 = 0
-                elif b_right_player2.is_clicked(game_state["mouse_pos"]):
-                    # Переключение на следующего персонажа для Player 2
-                    characters = list(player2_animations.keys())
-                    current_index = characters.index(CURRENT_CHARACTER_PLAYER2)
-                    CURRENT_CHARACTER_PLAYER2 = characters[
-                        (current_index + 1) % len(characters)
-                    ]
-                    CURRENT_ANIMATION_PLAYER2 = "idle"
-                    CURRENT_FRAME_PLAYER2 = 0
-
-                # Обрабатываем кнопки инвентаря
-                for button in inventory_buttons:
-                    if button.is_clicked(game_state["mouse_pos"]):
-                        button.funct(game_state, screen, backgrounds)
-
-            elif game_state["show_settings"]:
-                # Обрабатываем кнопки настроек
-                for button in settings_buttons:
-                    if button.is_clicked(game_state["mouse_pos"]):
-                        button.funct(game_state, screen, backgrounds)
-
-            elif not game_state[
-                "show_battle_field"
-            ]:  # Добавляем проверку на поле боя
-                # Обрабатываем основные кнопки только если не на поле боя
-                for button in menu_buttons:
-                    if button.is_clicked(game_state["mouse_pos"]):
-                        button.funct(game_state, screen, backgrounds)
+        # Нажатия, наведение мыши и фокус клавиатуры для кнопок меню
+        ui.handle_event(current_scene(), event, pygame.time.get_ticks())
 
-    # Обновление состояния персонажей
-    if game_state["show_battle_field"] and player1 and player2:
-        # Обновление кадров анимации с задержкой
-        current_time = pygame.time.get_ticks()
-
-        # Автоматическое восполнение маны/стамины
-        if current_time - REGEN_TIME > 1000:  # Каждую секунду
-            REGEN_TIME = (
-                current_time  # Обновляем время последнего восстановления
-            )
+    # Действия кнопок выполняются по окончании анимации нажатия
+    ui.update(pygame.time.get_ticks(), game_state)
 
-            # Восполнение для Player 1
-            if CURRENT_CHARACTER_PLAYER1 == "Wizard":
-                player1.mana = min(
-                    100, player1.mana + 1
-                )  # Восполняем 1 ману в секунду
-            else:
-                player1.stamina = min(
-                    100, player1.stamina + 2
-                )  # Восполняем 2 стамины в секунду
-
-            # Восполнение для Player 2
-            if CURRENT_CHARACTER_PLAYER2 == "Wizard":
-                player2.mana = min(
-                    100, player2.mana + 1
-                )  # Восполняем 1 ману в секунду
-            else:
-                player2.stamina = min(
-                    100, player2.stamina + 2
-                )  # Восполняем 2 стамины в секунду
-
-        # Определяем задержку в зависимости от анимации
-        NEW_FRAME_DELAY = FRAME_DELAY
-        # Замедляем idle_2 для Wizard
-        if (
-            CURRENT_CHARACTER_PLAYER1 == "Wizard"
-            and CURRENT_ANIMATION_PLAYER1 == "idle_2"
-        ):
-            NEW_FRAME_DELAY = (
-                FRAME_DELAY * 4
-            )  # Увеличиваем задержку в 500 раз для idle_2 анимации Wizard
-        elif (
-            CURRENT_CHARACTER_PLAYER2 == "Wizard"
-            and CURRENT_ANIMATION_PLAYER2 == "idle_2"
-        ):
-            NEW_FRAME_DELAY = (
-                FRAME_DELAY * 4
-            )  # Увеличиваем задержку в 500 раз для idle_2 анимации Wizard
-
-        if current_time - FRAME_TIME > NEW_FRAME_DELAY:
-            FRAME_TIME = current_time
-            # Обновляем кадры анимации
-            CURRENT_FRAME_PLAYER1 = (CURRENT_FRAME_PLAYER1 + 1) % len(
-                player1.animations[CURRENT_ANIMATION_PLAYER1]
-            )
-            CURRENT_FRAME_PLAYER2 = (CURRENT_FRAME_PLAYER2 + 1) % len(
-                player2.animations[CURRENT_ANIMATION_PLAYER2]
-            )
+    # Бой начинается на первом кадре поля сражения
+    if game_state["show_battle_field"] and battle is None:
+        start_battle()
 
-            # Проверяем завершение анимации атаки или прыжка
-            if CURRENT_FRAME_PLAYER1 == 0 and CURRENT_ANIMATION_PLAYER1 in [
-                "attack_1",
-                "attack_2",
-                "attack_3",
-                "attack_4",
-                "shot_1",
-                "shot_2",
-                "jump",
-            ]:
-                # Выбор анимации бездействия
-                if (
-                    CURRENT_ANIMATION_PLAYER1 == "idle_2"
-                    and CURRENT_FRAME_PLAYER1
-                    == len(player1.animations["idle_2"]) - 1
-                ):
-                    CURRENT_ANIMATION_PLAYER1 = "idle"
-                    CURRENT_FRAME_PLAYER1 = 0
-                elif (
-                    CURRENT_ANIMATION_PLAYER1 == "idle"
-                    and random.random() < 0.004
-                ):  # 0.4% шанс выбора idle_2
-                    CURRENT_ANIMATION_PLAYER1 = "idle_2"
-                    CURRENT_FRAME_PLAYER1 = 0
-                else:
-                    CURRENT_ANIMATION_PLAYER1 = "idle"
-                CURRENT_FRAME_PLAYER1 = 0
-
-            if CURRENT_FRAME_PLAYER2 == 0 and CURRENT_ANIMATION_PLAYER2 in [
-                "attack_1",
-                "attack_2",
-                "attack_3",
-                "attack_4",
-                "shot_1",
-                "shot_2",
-                "jump",
-            ]:
-                # Выбор анимации бездействия
-                if (
-                    CURRENT_ANIMATION_PLAYER2 == "idle_2"
-                    and CURRENT_FRAME_PLAYER2
-                    == len(player2.animations["idle_2"]) - 1
-                ):
-                    CURRENT_ANIMATION_PLAYER2 = "idle"
-                    CURRENT_FRAME_PLAYER2 = 0
-                elif (
-                    CURRENT_ANIMATION_PLAYER2 == "idle"
-                    and random.random() < 0.004
-                ):  # 0.4% шанс выбора idle_2
-                    CURRENT_ANIMATION_PLAYER2 = "idle_2"
-                    CURRENT_FRAME_PLAYER2 = 0
-                else:
-                    CURRENT_ANIMATION_PLAYER2 = "idle"
-                CURRENT_FRAME_PLAYER2 = 0
-
-        # Обработка постоянно зажатых клавиш для Player 1
-        keys = pygame.key.get_pressed()
-        # Проверяем анимацию атаки в первую очередь, но не отменяем движение
-        if CURRENT_ANIMATION_PLAYER1 in [
-            "attack_1",
-            "attack_2",
-            "attack_3",
-            "attack_4",
-            "shot_1",
-            "shot_2",
-        ]:
-            # Сохраняем движение во время атаки только если персонаж не Archer
-            if CURRENT_CHARACTER_PLAYER1 != "Archer":
-                if keys[pygame.K_a]:
-                    player1.st_x -= player1.speed_walk
-                    player1.direction = -1
-                elif keys[pygame.K_d]:
-                    player1.st_x += player1.speed_walk
-                    player1.direction = 1
-        elif player1.is_jumping:
-            CURRENT_ANIMATION_PLAYER1 = "jump"
-            # Сохраняем движение во время прыжка
-            if keys[pygame.K_a]:
-                player1.st_x -= player1.speed_walk
-                player1.direction = -1
-            elif keys[pygame.K_d]:
-                player1.st_x += player1.speed_walk
-                player1.direction = 1
-        elif keys[pygame.K_a]:
-            player1.move(-1)
-            CURRENT_ANIMATION_PLAYER1 = "walk"
-        elif keys[pygame.K_d]:
-            player1.move(1)
-            CURRENT_ANIMATION_PLAYER1 = "walk"
-        elif (
-            CURRENT_ANIMATION_PLAYER1 == "jump"
-            and player1.st_y >= player1.ground_y
-        ):
-            # Если персонаж достиг земли и анимация прыжка все еще активна, возвращаемся к idle
-            CURRENT_ANIMATION_PLAYER1 = "idle"
-            CURRENT_FRAME_PLAYER1 = 0
-        elif CURRENT_ANIMATION_PLAYER1 not in [
-            "attack_1",
-            "attack_2",
-            "attack_3",
-            "attack_4",
-            "shot_1",
-            "shot_2",
-            "jump",
-        ]:
-            # Выбор анимации бездействия в зависимости от персонажа
-            if CURRENT_CHARACTER_PLAYER1 == "Archer":
-                CURRENT_ANIMATION_PLAYER1 = (
-                    "idle"  # У Archer только одна анимация бездействия
-                )
-            elif CURRENT_CHARACTER_PLAYER1 == "Wizard":
-                # Для Wizard idle_2 проигрывается только один раз и очень редко
-                if (
-                    CURRENT_ANIMATION_PLAYER1 == "idle_2"
-                    and CURRENT_FRAME_PLAYER1
-                    == len(player1.animations["idle_2"]) - 1
-                ):
-                    CURRENT_ANIMATION_PLAYER1 = "idle"
-                    CURRENT_FRAME_PLAYER1 = 0
-                elif (
-                    CURRENT_ANIMATION_PLAYER1 == "idle"
-                    and random.random() < 0.004
-                ):  # 0.4% шанс выбора idle_2
-                    CURRENT_ANIMATION_PLAYER1 = "idle_2"
-                    CURRENT_FRAME_PLAYER1 = 0
-            else:
-                # Проверяем наличие idle_2 анимации
-                if "idle_2" in player1.animations:
-                    CURRENT_ANIMATION_PLAYER1 = random.choice(
-                        ["idle", "idle_2"]
-                    )
-                else:
-                    CURRENT_ANIMATION_PLAYER1 = "idle"
-
-        # Обработка постоянно зажатых клавиш для Player 2
-        # Проверяем анимацию атаки в первую очередь, но не отменяем движение
-        if CURRENT_ANIMATION_PLAYER2 in [
-            "attack_1",
-            "attack_2",
-            "attack_3",
-            "attack_4",
-            "shot_1",
-            "shot_2",
-        ]:
-            # Сохраняем движение во время атаки только если персонаж не Archer
-            if CURRENT_CHARACTER_PLAYER2 != "Archer":
-                if keys[pygame.K_j]:
-                    player2.st_x -= player2.speed_walk
-                    player2.direction = -1
-                elif keys[pygame.K_l]:
-                    player2.st_x += player2.speed_walk
-                    player2.direction = 1
-        elif player2.is_jumping:
-            CURRENT_ANIMATION_PLAYER2 = "jump"
-            # Сохраняем движение во время прыжка
-            if keys[pygame.K_j]:
-                player2.st_x -= player2.speed_walk
-                player2.direction = -1
-            elif keys[pygame.K_l]:
-                player2.st_x += player2.speed_walk
-                player2.direction = 1
-        elif keys[pygame.K_j]:
-            player2.move(-1)
-            CURRENT_ANIMATION_PLAYER2 = "walk"
-        elif keys[pygame.K_l]:
-            player2.move(1)
-            CURRENT_ANIMATION_PLAYER2 = "walk"
-        elif (
-            CURRENT_ANIMATION_PLAYER2 == "jump"
-            and player2.st_y >= player2.ground_y
-        ):
-            # Если персонаж достиг земли и анимация прыжка все еще активна, возвращаемся к idle
-            CURRENT_ANIMATION_PLAYER2 = "idle"
-            CURRENT_FRAME_PLAYER2 = 0
-        elif CURRENT_ANIMATION_PLAYER2 not in [
-            "attack_1",
-            "attack_2",
-            "attack_3",
-            "attack_4",
-            "shot_1",
-            "shot_2",
-            "jump",
-        ]:
-            # Выбор анимации бездействия в зависимости от персонажа
-            if CURRENT_CHARACTER_PLAYER2 == "Archer":
-                CURRENT_ANIMATION_PLAYER2 = (
-                    "idle"  # У Archer только одна анимация бездействия
-                )
-            elif CURRENT_CHARACTER_PLAYER2 == "Wizard":
-                # Для Wizard idle_2 проигрывается только один раз и очень редко
-                if (
-                    CURRENT_ANIMATION_PLAYER2 == "idle_2"
-                    and CURRENT_FRAME_PLAYER2
-                    == len(player2.animations["idle_2"]) - 1
-                ):
-                    CURRENT_ANIMATION_PLAYER2 = "idle"
-                    CURRENT_FRAME_PLAYER2 = 0
-                elif (
-                    CURRENT_ANIMATION_PLAYER2 == "idle"
-                    and random.random() < 0.004
-                ):  # 0.4% шанс выбора idle_2
-                    CURRENT_ANIMATION_PLAYER2 = "idle_2"
-                    CURRENT_FRAME_PLAYER2 = 0
-            else:
-                # Проверяем наличие idle_2 анимации
-                if "idle_2" in player2.animations:
-                    CURRENT_ANIMATION_PLAYER2 = random.choice(
-                        ["idle", "idle_2"]
-                    )
-                else:
-                    CURRENT_ANIMATION_PLAYER2 = "idle"
-
-        player1.update()
-        player2.update()
-
-    # Отрисовка текущего фона
+    # Обновление состояния персонажей
+    if battle is not None:
+        # Шаги симуляции идут с постоянной частотой SIMULATION_HZ
+        # независимо от частоты кадров
+        battle.advance(pygame.time.get_ticks())
+
+    # Отрисовка текущего экрана
     if game_state["show_battle_field"]:
-        draw_battle_field(screen)  # Отображаем поле сражения
-        draw_battle_inventory()
+        draw_battle_field(renderer)  # Отображаем поле сражения
 
     elif game_state["show_inventory"]:
-        draw_inventory(screen)  # Отображаем инвентарь
+        draw_inventory(renderer)  # Отображаем инвентарь
 
     elif game_state["show_settings"]:
-        draw_settings(screen)  # Отображаем настройки
+        draw_settings(renderer)  # Отображаем настройки
 
     else:
-        screen.blit(backgrounds[1], (0, 0))  # Отображаем основной фон
-
-    # Отрисовка кнопок в главном меню
-    if (
-        not game_state["show_inventory"]
-        and not game_state["show_battle_field"]
-        and not game_state["show_settings"]
-    ):
-        for button in menu_buttons:
-            button.paint(screen)
-
-    # Обновление экрана
-    pygame.display.flip()
+        draw_menu(renderer)  # Отображаем главное меню
+
+    # Обновление изменённых областей экрана
+    renderer.end()
+
+    # Ресурсы нового экрана загружаются в первую очередь,
+    # а сам экран перерисовывается целиком
+    if current_scene() != SCENE:
+        # С поля сражения ушли: анимации бойцов больше не закреплены
+        if battle is not None and SCENE == "battle":
+            end_battle()
+        ui.leave(SCENE)
+        SCENE = current_scene()
+        renderer.invalidate()
+        asset_loader.request(scene_assets(SCENE), PRIORITY_SCENE)
+    asset_loader.pump(limit=4)
+
+    # Фоновая подгрузка анимаций вне боя (по одной анимации за кадр)
+    if not game_state["show_battle_field"]:
+        x.load_pending()
 
     # Контроль FPS
-    clock.tick(60)
+    clock.tick(RENDER_FPS)
 
 # Завершение
 pygame.quit()
+
+# Сохранение записанных нажатий боя
+if battle is not None:
+    end_battle()
+
+# Отчёт о содержимом менеджера ресурсов и статистика отрисовки
+# (для отладки потребления памяти и производительности)
+if os.environ.get("GAME_ASSET_REPORT"):
+    print(json.dumps(asset_manager.report(), indent=4))
+    print(json.dumps(renderer.report(), indent=4))
+    print(json.dumps(text_cache.report(), indent=4))
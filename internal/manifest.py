@@ -0,0 +1,101 @@
+"""
+Модуль манифеста анимаций персонажей.
+Манифест собирается один раз сканированием папки assets/Characters
+и хранит для каждой анимации число кадров, размер кадров
+и расположение кадров в атласе (offsets, заполняется при сборке
+атласа). Непрозрачные области кадров хранятся отдельно,
+в файлах форм (см. модуль shapes).
+
+Сборка манифеста (перед сборкой атласов):
+    python manifest.py
+"""
+
+import json
+import os
+
+import pygame
+from helper import read_resource, resource_exists, resource_path
+
+MANIFEST_PATH = "assets/manifest.json"  # Путь относительно ресурсов
+MANIFEST_VERSION = 1
+CHARACTERS_DIR = "assets/Characters"
+
+
+def frame_path(character, folder, index):
+    """Путь к файлу кадра анимации относительно ресурсов."""
+    return f"{CHARACTERS_DIR}/{character}/{folder}/{index}0.png"
+
+
+def scan_characters():
+    """
+    Сканирование папки с персонажами.
+    Размер кадров берётся из первого кадра каждой анимации,
+    остальные кадры не открываются.
+
+    :return: Манифест в виде словаря (атлас не собран).
+    """
+    characters = {}
+    root = resource_path(CHARACTERS_DIR)
+    for character in sorted(os.listdir(root)):
+        character_dir = os.path.join(root, character)
+        if not os.path.isdir(character_dir):
+            continue
+        animations = {}
+        for folder in sorted(os.listdir(character_dir)):
+            folder_dir = os.path.join(character_dir, folder)
+            if not os.path.isdir(folder_dir):
+                continue
+            count = len(
+                [
+                    name
+                    for name in os.listdir(folder_dir)
+                    if name.endswith(".png")
+                ]
+            )
+            for i in range(count):
+                if not os.path.exists(os.path.join(folder_dir, f"{i}0.png")):
+                    raise ValueError(
+                        f"Пропущен кадр {i}0.png в {character}/{folder}"
+                    )
+            animation = {
+                "folder": folder,
+                "count": count,
+                "size": list(
+                    pygame.image.load(
+                        resource_path(frame_path(character, folder, 0))
+                    ).get_size()
+                ),
+                "offsets": [],  # Кадры в листах атласа (см. модуль atlas)
+            }
+            animations[folder] = animation
+        characters[character] = {"sheets": [], "animations": animations}
+    return {"version": MANIFEST_VERSION, "characters": characters}
+
+
+def save_manifest(manifest):
+    """Сохранение манифеста в папку ресурсов."""
+    with open(resource_path(MANIFEST_PATH), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, separators=(",", ":"))
+
+
+def load_manifest():
+    """
+    Загрузка манифеста.
+    Если манифест не собран, папка с персонажами сканируется
+    заново: получается тот же манифест, но без атласа.
+    """
+    if resource_exists(MANIFEST_PATH):
+        manifest = json.loads(bytes(read_resource(MANIFEST_PATH)))
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    return scan_characters()
+
+
+def main():
+    """Сборка манифеста."""
+    save_manifest(scan_characters())
+    print(resource_path(MANIFEST_PATH))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Модуль профилировщика запуска игры.
+Замеряет время импорта модулей, этапов инициализации и декодирования
+изображений по группам ресурсов до первого интерактивного кадра.
+
+Включение:
+    GAME_BOOT_PROFILE=1 — вывести отчёт в консоль;
+    GAME_BOOT_PROFILE=boot.json — сохранить отчёт в файл;
+    или флаг командной строки --profile-boot[=boot.json].
+"""
+
+import importlib.abc
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+def profile_target(argv, environ):
+    """
+    Куда выводить отчёт профилировщика.
+
+    :return: "-" для консоли, путь к файлу или None, если профилировщик
+    выключен.
+    """
+    for arg in argv[1:]:
+        if arg == "--profile-boot":
+            return "-"
+        if arg.startswith("--profile-boot="):
+            return arg.split("=", 1)[1]
+    value = environ.get("GAME_BOOT_PROFILE", "")
+    if value in ("", "0"):
+        return None
+    return "-" if value == "1" else value
+
+
+def asset_group(path):
+    """
+    Группа ресурса для отчёта: папка внутри assets,
+    для персонажей — папка персонажа.
+    """
+    parts = path.replace(os.sep, "/").split("/")
+    if "assets" in parts:
+        parts = parts[parts.index("assets") + 1 :]
+    if len(parts) > 2 and parts[0] == "Characters":
+        return f"Characters/{parts[1]}"
+    return parts[0] if len(parts) > 1 else "other"
+
+
+class TimedLoader:
+    """Обёртка загрузчика модуля, замеряющая время его выполнения."""
+
+    def __init__(self, loader, name, profiler):
+        self.loader = loader
+        self.name = name
+        self.profiler = profiler
+
+    def __getattr__(self, attr):
+        """Остальные атрибуты берутся у исходного загрузчика."""
+        return getattr(self.loader, attr)
+
+    def create_module(self, spec):
+        """Создание модуля исходным загрузчиком."""
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        """Выполнение модуля с замером времени."""
+        with self.profiler.phase(f"import {self.name}"):
+            self.loader.exec_module(module)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """
+    Поисковик модулей, который ничего не ищет сам, а оборачивает
+    загрузчики верхнеуровневых модулей, найденные остальными поисковиками
+    (в том числе загрузчиком PyInstaller в собранной игре).
+    """
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        """Поиск спецификации модуля и подмена её загрузчика."""
+        if "." in fullname:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = TimedLoader(spec.loader, fullname, self.profiler)
+        return spec
+
+
+class BootProfiler:
+    """
+    Профилировщик запуска.
+    Все методы ничего не делают, если профилировщик выключен.
+    """
+
+    def __init__(self, target):
+        """
+        :param target: "-" для вывода в консоль, путь к JSON-файлу
+        или None, чтобы выключить профилировщик.
+        """
+        self.target = target
+        self.enabled = target is not None
+        self.started = time.perf_counter()
+        self.phases = []  # (имя, начало, длительность, декодировано байт)
+        self.groups = {}  # Группа ресурсов -> статистика декодирования
+        self.decoded_bytes = 0
+        self.lock = threading.Lock()
+        self.import_timer = None
+        if self.enabled:
+            self.import_timer = ImportTimer(self)
+            sys.meta_path.insert(0, self.import_timer)
+
+    @contextmanager
+    def phase(self, name):
+        """Замер длительности этапа запуска."""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        decoded_before = self.decoded_bytes
+        try:
+            yield
+        finally:
+            self.phases.append(
+                (
+                    name,
+                    started - self.started,
+                    time.perf_counter() - started,
+                    self.decoded_bytes - decoded_before,
+                )
+            )
+
+    def record_decode(self, path, file_bytes, pixel_bytes, seconds):
+        """
+        Учёт декодирования изображения (вызывается из любого потока).
+
+        :param path: Путь к изображению.
+        :param file_bytes: Размер файла в байтах.
+        :param pixel_bytes: Размер декодированных пикселей в байтах.
+        :param seconds: Время декодирования.
+        """
+        if not self.enabled:
+            return
+        group = asset_group(path)
+        with self.lock:
+            stats = self.groups.setdefault(
+                group,
+                {"files": 0, "file_bytes": 0, "pixel_bytes": 0, "seconds": 0},
+            )
+            stats["files"] += 1
+            stats["file_bytes"] += file_bytes
+            stats["pixel_bytes"] += pixel_bytes
+            stats["seconds"] += seconds
+            self.decoded_bytes += pixel_bytes
+
+    def report(self):
+        """Отчёт о запуске в виде словаря."""
+        return {
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "python": sys.version.split()[0],
+            "total_seconds": time.perf_counter() - self.started,
+            "decoded_bytes": self.decoded_bytes,
+            "phases": [
+                {
+                    "name": name,
+                    "start": start,
+                    "seconds": seconds,
+                    "decoded_bytes": decoded_bytes,
+                }
+                for name, start, seconds, decoded_bytes in sorted(
+                    self.phases, key=lambda phase: phase[1]
+                )
+            ],
+            "asset_groups": self.groups,
+        }
+
+    def finish(self):
+        """
+        Завершение профилирования: вывод отчёта и отключение замеров.
+        Вызывается на первом интерактивном кадре.
+        """
+        if not self.enabled:
+            return
+        self.enabled = False
+        if self.import_timer in sys.meta_path:
+            sys.meta_path.remove(self.import_timer)
+        report = json.dumps(self.report(), indent=4)
+        if self.target == "-":
+            print(report)
+        else:
+            with open(self.target, "w", encoding="utf-8") as report_file:
+                report_file.write(report)
+
+
+# Общий профилировщик запуска
+boot_profiler = BootProfiler(profile_target(sys.argv, os.environ))
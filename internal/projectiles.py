@@ -0,0 +1,178 @@
+"""
+Модуль снарядов (стрел).
+Снаряды хранятся в заранее выделенном пуле: живые снаряды занимают
+начало списка, исчезнувший снаряд меняется местами с последним живым,
+поэтому во время боя объекты не создаются и не удаляются.
+Все снаряды сдвигаются и проверяются на попадание одним проходом
+за шаг боя и рисуются одним вызовом Surface.blits.
+"""
+
+import pygame
+from assets import surface_bytes
+
+PROJECTILE_CAPACITY = 64  # Начальный размер пула снарядов
+
+ARROW_IMAGE = "assets/Characters/Archer/Arrow.png"
+ARROW_SIZE = (48, 48)  # Размер изображения стрелы
+ARROW_BOX = (3, 23, 43, 3)  # Непрозрачная часть изображения стрелы
+ARROW_SPEED = 20  # Скорость стрелы (пикселей за кадр PHYSICS_FPS)
+
+# Атаки, выпускающие стрелу: (персонаж, анимация) ->
+# (кадр выстрела, наконечник стрелы на этом кадре в координатах кадра)
+RANGED_ATTACKS = {
+    ("Archer", "shot_1"): (9, (94, 93)),
+    ("Archer", "shot_2"): (9, (104, 92)),
+}
+
+
+def projectile_images(manager, scale=1):
+    """
+    Изображения стрелы, летящей вправо и влево.
+
+    :param manager: Менеджер ресурсов, в котором хранятся изображения.
+    :param scale: Коэффициент масштабирования.
+    :return: Кортеж (вправо, влево).
+    """
+    size = (ARROW_SIZE[0] * scale, ARROW_SIZE[1] * scale)
+    right = manager.load_image(ARROW_IMAGE, size)
+    key = ("projectile", ARROW_IMAGE, scale, True)
+    left = manager.get(key)
+    if left is None:
+        left = pygame.transform.flip(right, True, False)
+        manager.put(key, left, surface_bytes(left))
+    return right, left
+
+
+class Projectile:
+    """Снаряд: положение центра, скорость, владелец и урон."""
+
+    __slots__ = ("x", "y", "previous_x", "velocity_x", "owner", "damage")
+
+    def __init__(self):
+        """Пустой снаряд пула."""
+        self.x = self.y = self.previous_x = self.velocity_x = 0.0
+        self.owner = None
+        self.damage = 0
+
+
+class ProjectilePool:
+    """
+    Пул снарядов одного вида.
+    Живые снаряды — items[:count]; положение снаряда — центр
+    его непрозрачной части.
+    """
+
+    def __init__(self, scale=1, capacity=PROJECTILE_CAPACITY):
+        """
+        :param scale: Масштаб, в котором снаряды рисуются на поле.
+        :param capacity: Количество заранее созданных снарядов.
+        """
+        self.items = [Projectile() for _ in range(capacity)]
+        self.count = 0
+        box = pygame.Rect(ARROW_BOX)
+        # Область попадания переиспользуется для всех снарядов
+        self.hitbox = pygame.Rect(0, 0, box.width * scale, box.height * scale)
+        # Смещение центра снаряда от угла изображения: вправо и влево
+        self.offsets = (
+            (box.centerx * scale, box.centery * scale),
+            ((ARROW_SIZE[0] - box.centerx) * scale, box.centery * scale),
+        )
+        self.spawned = 0
+        self.hits = 0
+
+    def __len__(self):
+        """Количество живых снарядов."""
+        return self.count
+
+    def spawn(self, x, y, velocity_x, owner, damage):
+        """
+        Выпуск снаряда.
+
+        :param x: Координата X центра снаряда.
+        :param y: Координата Y центра снаряда.
+        :param velocity_x: Скорость (пикселей за кадр PHYSICS_FPS);
+        знак задаёт направление полёта.
+        :param owner: Выпустивший снаряд персонаж (его снаряд не задевает).
+        :param damage: Урон до учёта защиты цели.
+        :return: Снаряд.
+        """
+        if self.count == len(self.items):
+            # Пул заполнен: расширяем его вдвое
+            self.items.extend(Projectile() for _ in range(self.count or 1))
+        item = self.items[self.count]
+        item.x = item.previous_x = x
+        item.y = y
+        item.velocity_x = velocity_x
+        item.owner = owner
+        item.damage = damage
+        self.count += 1
+        self.spawned += 1
+        return item
+
+    def despawn(self, index):
+        """Удаление снаряда: на его место переносится последний живой."""
+        items = self.items
+        last = self.count - 1
+        items[index], items[last] = items[last], items[index]
+        items[last].owner = None
+        self.count = last
+
+    def clear(self):
+        """Удаление всех снарядов."""
+        for index in range(self.count):
+            self.items[index].owner = None
+        self.count = 0
+
+    def update(self, dt, world, left, right):
+        """
+        Полёт и попадания всех снарядов за один шаг.
+        Попавший или вылетевший за границы поля снаряд удаляется.
+
+        :param dt: Прошедшее время в кадрах PHYSICS_FPS.
+        :param world: Области уязвимости текущего шага (CollisionWorld).
+        :param left: Левая граница поля.
+        :param right: Правая граница поля.
+        """
+        items, hitbox = self.items, self.hitbox
+        half_width, half_height = hitbox.width / 2, hitbox.height / 2
+        # Обход с конца: на место удалённого снаряда
+        # переносится уже обработанный
+        for index in range(self.count - 1, -1, -1):
+            item = items[index]
+            item.previous_x = item.x
+            item.x += item.velocity_x * dt
+            hitbox.topleft = (
+                round(item.x - half_width),
+                round(item.y - half_height),
+            )
+            if hitbox.right < left or hitbox.left > right:
+                self.despawn(index)
+                continue
+            targets = world.query(hitbox, exclude=item.owner)
+            if targets:
+                for target in targets:
+                    target.take_damage(item.damage)
+                self.hits += 1
+                self.despawn(index)
+
+    def blit_sequence(self, images, alpha=1.0):
+        """
+        Снаряды для отрисовки одним вызовом Surface.blits.
+
+        :param images: Изображения (вправо, влево), см. projectile_images.
+        :param alpha: Доля шага для интерполяции (0..1).
+        :return: Список (изображение, левый верхний угол).
+        """
+        offsets = self.offsets
+        sequence = []
+        for item in self.items[: self.count]:
+            flip = item.velocity_x < 0
+            offset_x, offset_y = offsets[flip]
+            x = item.previous_x + (item.x - item.previous_x) * alpha
+            sequence.append(
+                (
+                    images[flip],
+                    (round(x - offset_x), round(item.y - offset_y)),
+                )
+            )
+        return sequence
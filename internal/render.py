@@ -0,0 +1,210 @@
+"""
+Модуль отрисовки по изменённым областям (dirty rectangles).
+Вместо перерисовки всего экрана и pygame.display.flip() каждый кадр
+восстанавливает из фона только области, где что-то изменилось,
+и передаёт их список в pygame.display.update().
+
+Отключение (перерисовка всего экрана каждый кадр):
+    GAME_DIRTY_RECTS=0
+"""
+
+import pygame
+
+
+class DirtyRenderer:
+    """
+    Отрисовщик кадра по изменённым областям.
+
+    Кадр состоит из фона, спрайтов и виджетов. Спрайты (персонажи,
+    подписи над ними) перерисовываются каждый кадр. Виджеты (полоски
+    характеристик, кнопки, сетки инвентаря) рисуются поверх спрайтов
+    и перерисовываются, только если изменилось их состояние или их
+    задел спрайт. Весь экран перерисовывается при смене фона
+    и после вызова invalidate (например, при смене экрана игры).
+    """
+
+    def __init__(self, screen, enabled=True):
+        """
+        Инициализация отрисовщика.
+
+        :param screen: Поверхность экрана.
+        :param enabled: False, чтобы перерисовывать весь экран каждый кадр.
+        """
+        self.screen = screen
+        self.enabled = enabled
+        self.background = None
+        self.opaque = None  # Копия фона без прозрачности
+        self.full = True  # Нужна перерисовка всего экрана
+        self.sprites = []  # (поверхность, прямоугольник) текущего кадра
+        self.widgets = []  # (ключ, прямоугольник, состояние, отрисовка)
+        self.dirty = []  # Области, отмеченные изменёнными в этом кадре
+        self.previous = []  # Прямоугольники спрайтов прошлого кадра
+        self.drawn = {}  # Ключ -> (прямоугольник, состояние) на экране
+        self.screen_pixels = screen.get_width() * screen.get_height()
+        self.frames = 0
+        self.full_frames = 0
+        self.updated_pixels = 0
+
+    def invalidate(self):
+        """Перерисовать весь экран в следующем кадре."""
+        self.full = True
+
+    def begin(self, background):
+        """
+        Начало кадра.
+
+        :param background: Фон экрана размером с экран.
+        """
+        if background is not self.background:
+            # Восстановление из фона без прозрачности — это простое
+            # копирование пикселей, без смешивания со старым кадром
+            self.background = background
+            self.opaque = (
+                background.convert()
+                if background.get_flags() & pygame.SRCALPHA
+                else background
+            )
+            self.full = True
+        self.sprites = []
+        self.widgets = []
+        self.dirty = []
+
+    def mark_dirty(self, rects):
+        """
+        Отметка изменившихся областей кадра (например, перерисованных
+        элементов интерфейса): они восстанавливаются из фона,
+        а задетые ими виджеты рисуются заново.
+
+        :param rects: Прямоугольники на экране.
+        """
+        self.dirty.extend(pygame.Rect(rect) for rect in rects)
+
+    def sprite(self, surface, pos):
+        """
+        Добавление спрайта, перерисовываемого каждый кадр.
+
+        :param surface: Изображение спрайта.
+        :param pos: Координаты левого верхнего угла.
+        :return: Прямоугольник спрайта на экране.
+        """
+        rect = surface.get_rect(topleft=pos)
+        self.sprites.append((surface, rect))
+        return rect
+
+    def sprite_batch(self, sequence):
+        """
+        Добавление группы спрайтов (например, снарядов).
+
+        :param sequence: Пары (изображение, левый верхний угол).
+        """
+        self.sprites.extend(
+            (surface, surface.get_rect(topleft=pos))
+            for surface, pos in sequence
+        )
+
+    def widget(self, key, rect, draw, *args, state=None):
+        """
+        Добавление виджета, перерисовываемого только при изменении.
+
+        :param key: Уникальный ключ виджета на экране.
+        :param rect: Прямоугольник, внутри которого рисует виджет.
+        :param draw: Функция отрисовки, вызывается как draw(screen, *args).
+        :param args: Аргументы функции отрисовки; их изменение
+        перерисовывает виджет.
+        :param state: Дополнительное состояние виджета, изменение
+        которого перерисовывает виджет (например, нажата ли кнопка).
+        """
+        self.widgets.append((key, pygame.Rect(rect), (args, state), draw))
+
+    def _changed_widgets(self, erase, sprite_rects):
+        """
+        Виджеты, которые нужно перерисовать в этом кадре.
+        Прямоугольники перерисовываемых виджетов добавляются в erase.
+        """
+        changed = []
+        pending = list(self.widgets)
+        found = True
+        # Стирание одного виджета может задеть соседний,
+        # поэтому проверяем, пока находятся новые виджеты
+        while found:
+            found = False
+            for item in list(pending):
+                key, rect, state, _ = item
+                drawn = self.drawn.get(key)
+                if not (
+                    self.full
+                    or drawn != (rect, state)
+                    or rect.collidelist(erase) != -1
+                    or rect.collidelist(sprite_rects) != -1
+                ):
+                    continue
+                pending.remove(item)
+                changed.append(item)
+                erase.append(rect)
+                if drawn is not None and drawn[0] != rect:
+                    erase.append(drawn[0])
+                found = True
+        return changed
+
+    def end(self):
+        """
+        Завершение кадра: отрисовка и обновление изменённых областей.
+
+        :return: Список обновлённых прямоугольников
+        (None, если обновлён весь экран).
+        """
+        if not self.enabled:
+            self.full = True
+        sprite_rects = [rect for _, rect in self.sprites]
+        keys = {key for key, _, _, _ in self.widgets}
+        # Стираются спрайты прошлого кадра, исчезнувшие виджеты
+        # и отмеченные изменёнными области
+        erase = (
+            list(self.previous)
+            + [
+                rect
+                for key, (rect, _) in self.drawn.items()
+                if key not in keys
+            ]
+            + self.dirty
+        )
+        changed = self._changed_widgets(erase, sprite_rects)
+
+        if self.full:
+            self.screen.blit(self.opaque, (0, 0))
+        else:
+            # Прямоугольники обрезаются по экрану, иначе при отрицательных
+            # координатах область фона смещается относительно экрана
+            screen_rect = self.screen.get_rect()
+            erase = [rect.clip(screen_rect) for rect in erase]
+            for rect in erase:
+                self.screen.blit(self.opaque, rect, rect)
+        # Все спрайты кадра рисуются одним вызовом
+        self.screen.blits(self.sprites, doreturn=False)
+        for _, _, (args, _), draw in changed:
+            draw(self.screen, *args)
+
+        self.drawn = {
+            key: (rect, state) for key, rect, state, _ in self.widgets
+        }
+        self.previous = sprite_rects
+        self.frames += 1
+        if self.full:
+            self.full = False
+            self.full_frames += 1
+            self.updated_pixels += self.screen_pixels
+            pygame.display.flip()
+            return None
+        dirty = erase + sprite_rects
+        self.updated_pixels += sum(rect.width * rect.height for rect in dirty)
+        pygame.display.update(dirty)
+        return dirty
+
+    def report(self):
+        """Статистика отрисовки."""
+        return {
+            "enabled": self.enabled,
+            "frames": self.frames,
+            "full_frames": self.full_frames,
+            "updated_screens": self.updated_pixels / self.screen_pixels,
+        }
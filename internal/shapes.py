@@ -0,0 +1,223 @@
+"""
+Модуль форм кадров для столкновений.
+Для каждого кадра анимации заранее (при сборке атласов) сохраняются
+маска непрозрачных пикселей и её ограничивающий прямоугольник.
+Увеличенные и отражённые варианты, совпадающие с тем, что рисуется
+на поле сражения, готовятся один раз при загрузке персонажа.
+Файл форм начинается с числа кадров каждой анимации: при загрузке
+оно сверяется с манифестом, и устаревший файл не сопоставит маски
+чужим кадрам.
+
+Формы собираются вместе с атласами (python atlas.py)
+или отдельно:
+    python shapes.py
+"""
+
+import os
+import struct
+import zlib
+
+import pygame
+from helper import read_resource, resource_exists, resource_path
+from manifest import frame_path, load_manifest
+
+SHAPES_DIR = "assets/shapes"  # Папка с формами относительно ресурсов
+SHAPE_SCALES = (1, 2)  # Масштабы, для которых готовятся формы
+# Заголовок файла: сигнатура и количество анимаций,
+# за ним число кадров каждой анимации (uint16) в порядке манифеста
+SHAPES_HEADER = struct.Struct("<4sH")
+SHAPES_MAGIC = b"SHP1"
+# Заголовок кадра: размер кадра и ограничивающий прямоугольник маски
+FRAME_HEADER = struct.Struct("<HHhhHH")
+# Порог прозрачности, как в pygame.mask.from_surface
+ALPHA_TABLE = bytes(0 if alpha <= 127 else 1 for alpha in range(256))
+
+
+def shapes_path(character):
+    """Путь к файлу форм персонажа относительно ресурсов."""
+    return f"{SHAPES_DIR}/{character}.bin"
+
+
+def mask_bounds(mask):
+    """Прямоугольник, охватывающий все пиксели маски."""
+    rects = mask.get_bounding_rects()
+    if not rects:
+        return pygame.Rect(0, 0, 0, 0)
+    return rects[0].unionall(rects[1:])
+
+
+def encode_frame(surface):
+    """Кадр в виде заголовка и байтов маски (1 байт на пиксель)."""
+    pixels = pygame.image.tobytes(surface, "RGBA")[3::4].translate(ALPHA_TABLE)
+    bounds = mask_bounds(pygame.mask.from_surface(surface))
+    return FRAME_HEADER.pack(*surface.get_size(), *bounds) + pixels
+
+
+def frame_counts(entry):
+    """Число кадров каждой анимации персонажа в порядке манифеста."""
+    return tuple(
+        animation["count"] for animation in entry["animations"].values()
+    )
+
+
+def build_shapes(character, entry, out_dir):
+    """
+    Сборка файла форм одного персонажа.
+
+    :param character: Имя персонажа.
+    :param entry: Запись персонажа в манифесте.
+    :param out_dir: Папка, куда сохраняется файл.
+    :return: Количество кадров.
+    """
+    frames = [
+        encode_frame(
+            pygame.image.load(
+                resource_path(frame_path(character, animation["folder"], i))
+            )
+        )
+        for animation in entry["animations"].values()
+        for i in range(animation["count"])
+    ]
+    counts = frame_counts(entry)
+    header = SHAPES_HEADER.pack(SHAPES_MAGIC, len(counts)) + struct.pack(
+        f"<{len(counts)}H", *counts
+    )
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, f"{character}.bin"), "wb") as file:
+        file.write(zlib.compress(header + b"".join(frames)))
+    return len(frames)
+
+
+class FrameShape:
+    """
+    Формы одного кадра: прямоугольники и маски для каждого масштаба
+    и направления. Координаты отсчитываются от левого верхнего угла
+    подготовленного (увеличенного и отражённого) кадра.
+    """
+
+    __slots__ = ("rects", "masks")
+
+    def __init__(self, surface, bounds):
+        """
+        :param surface: Кадр маски (8 бит, прозрачный цвет 0).
+        :param bounds: Ограничивающий прямоугольник маски.
+        """
+        width, height = surface.get_size()
+        mask = pygame.mask.from_surface(surface)
+        flipped_mask = pygame.mask.from_surface(
+            pygame.transform.flip(surface, True, False)
+        )
+        self.rects = {}
+        self.masks = {}
+        for scale in SHAPE_SCALES:
+            for flip, source in ((False, mask), (True, flipped_mask)):
+                rect = pygame.Rect(bounds)
+                if flip:
+                    rect.x = width - rect.right
+                self.rects[(scale, flip)] = pygame.Rect(
+                    rect.x * scale,
+                    rect.y * scale,
+                    rect.width * scale,
+                    rect.height * scale,
+                )
+                self.masks[(scale, flip)] = (
+                    source
+                    if scale == 1
+                    else source.scale((width * scale, height * scale))
+                )
+
+
+def decode_shapes(data, entry):
+    """
+    Формы кадров персонажа из содержимого файла форм.
+
+    :return: Словарь {анимация: [FrameShape]}.
+    :raises ValueError: Если файл собран для других кадров
+    (не совпадает число кадров с манифестом).
+    """
+    data = zlib.decompress(data)
+    magic, animations = SHAPES_HEADER.unpack_from(data, 0)
+    offset = SHAPES_HEADER.size
+    counts = (
+        struct.unpack_from(f"<{animations}H", data, offset)
+        if magic == SHAPES_MAGIC
+        else None
+    )
+    if counts != frame_counts(entry):
+        raise ValueError(
+            "Файл форм не соответствует манифесту анимаций, "
+            "пересоберите его: python atlas.py"
+        )
+    offset += 2 * animations
+    shapes = {}
+    for name, animation in entry["animations"].items():
+        frames = shapes[name] = []
+        for _ in range(animation["count"]):
+            width, height, *bounds = FRAME_HEADER.unpack_from(data, offset)
+            offset += FRAME_HEADER.size
+            surface = pygame.image.frombytes(
+                data[offset : offset + width * height], (width, height), "P"
+            )
+            offset += width * height
+            surface.set_colorkey(0)
+            frames.append(FrameShape(surface, bounds))
+    return shapes
+
+
+def shapes_bytes(shapes):
+    """Объём памяти, занятой масками (1 бит на пиксель)."""
+    return sum(
+        mask.get_size()[0] * mask.get_size()[1] // 8
+        for frames in shapes.values()
+        for frame in frames
+        for mask in frame.masks.values()
+    )
+
+
+class ShapeRegistry:
+    """
+    Реестр форм кадров персонажей.
+    Формы загружаются при первом обращении к персонажу и хранятся
+    в менеджере ресурсов; кадры анимаций для этого не нужны.
+    """
+
+    def __init__(self, manifest, manager):
+        """
+        :param manifest: Манифест анимаций (см. модуль manifest).
+        :param manager: Менеджер ресурсов, в котором хранятся формы.
+        """
+        self.manifest = manifest["characters"]
+        self.manager = manager
+
+    def get(self, character):
+        """
+        Формы кадров персонажа.
+
+        :return: Словарь {анимация: [FrameShape]} или None,
+        если формы не собраны.
+        """
+        key = ("shapes", character)
+        shapes = self.manager.get(key)
+        if shapes is None:
+            path = shapes_path(character)
+            if not resource_exists(path):
+                return None
+            try:
+                shapes = decode_shapes(
+                    bytes(read_resource(path)), self.manifest[character]
+                )
+            except ValueError as error:
+                raise ValueError(f"{path}: {error}") from error
+            self.manager.put(key, shapes, shapes_bytes(shapes))
+        return shapes
+
+
+def main():
+    """Сборка форм для всех персонажей."""
+    out_dir = resource_path(SHAPES_DIR)
+    for character, entry in load_manifest()["characters"].items():
+        print(character, build_shapes(character, entry, out_dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Модуль пространственного индекса.
+Прямоугольники раскладываются по ячейкам равномерной сетки,
+поэтому поиск просматривает только элементы нужных ячеек
+и не зависит от общего числа элементов.
+"""
+
+from collections import defaultdict
+
+INDEX_CELL_SIZE = 128  # Размер ячейки пространственного индекса
+
+
+class SpatialIndex:
+    """
+    Пространственный индекс прямоугольников на равномерной сетке.
+    Используется интерфейсом меню (поиск виджета по точке)
+    и системой столкновений (поиск по прямоугольнику).
+    """
+
+    def __init__(self, cell_size=INDEX_CELL_SIZE):
+        """
+        :param cell_size: Размер ячейки сетки в пикселях.
+        """
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)  # (столбец, строка) -> элементы
+
+    def _cell_keys(self, rect):
+        """Ячейки, которые задевает rect (включая правый и нижний край)."""
+        size = self.cell_size
+        for col in range(int(rect.left) // size, int(rect.right) // size + 1):
+            for row in range(
+                int(rect.top) // size, int(rect.bottom) // size + 1
+            ):
+                yield col, row
+
+    def insert(self, rect, item):
+        """Добавление элемента во все ячейки, которые задевает rect."""
+        for key in self._cell_keys(rect):
+            self.cells[key].append(item)
+
+    def query(self, pos):
+        """Элементы ячейки, в которую попадает точка."""
+        return self.cells.get(
+            (int(pos[0]) // self.cell_size, int(pos[1]) // self.cell_size), ()
+        )
+
+    def query_rect(self, rect):
+        """
+        Элементы ячеек, которые задевает rect.
+        Элемент из нескольких ячеек возвращается один раз.
+        """
+        found = {}
+        for key in self._cell_keys(rect):
+            for item in self.cells.get(key, ()):
+                found[id(item)] = item
+        return list(found.values())
+
+    def clear(self):
+        """Удаление всех элементов."""
+        self.cells.clear()
@@ -0,0 +1,139 @@
+"""
+Модуль интерфейса меню.
+Хранит виджеты каждого экрана в пространственном индексе и направляет
+нажатия, наведение мыши и фокус клавиатуры верхнему виджету.
+"""
+
+import pygame
+from spatial import SpatialIndex
+
+# Клавиши, нажимающие виджет в фокусе
+ACTIVATE_KEYS = (pygame.K_RETURN, pygame.K_KP_ENTER, pygame.K_SPACE)
+
+
+class UiScreen:
+    """
+    Экран интерфейса: виджеты в порядке отрисовки (последний сверху),
+    виджет под мышью и виджет в фокусе клавиатуры.
+    """
+
+    def __init__(self, widgets):
+        """
+        :param widgets: Виджеты экрана (кнопки) в порядке отрисовки.
+        """
+        self.widgets = list(widgets)
+        self.index = None  # Строится при первом поиске
+        self.hovered = None
+        self.focused = None
+
+    def widget_at(self, pos):
+        """Верхний виджет в точке или None."""
+        if self.index is None:
+            self.index = SpatialIndex()
+            for order, widget in enumerate(self.widgets):
+                # Края включаются, как в Buttons.is_clicked
+                self.index.insert(widget.rect.inflate(2, 2), (order, widget))
+        hits = [
+            (order, widget)
+            for order, widget in self.index.query(pos)
+            if widget.is_clicked(pos)
+        ]
+        return max(hits, key=lambda hit: hit[0])[1] if hits else None
+
+    def hover(self, pos):
+        """Обновление виджета под мышью."""
+        widget = self.widget_at(pos)
+        if widget is self.hovered:
+            return
+        if self.hovered is not None:
+            self.hovered.is_hovered = False
+        if widget is not None:
+            widget.is_hovered = True
+        self.hovered = widget
+
+    def clear_hover(self):
+        """Сброс виджета под мышью."""
+        if self.hovered is not None:
+            self.hovered.is_hovered = False
+            self.hovered = None
+
+    def move_focus(self, step):
+        """Перемещение фокуса клавиатуры на соседний виджет."""
+        if not self.widgets:
+            return
+        if self.focused is None:
+            index = 0 if step > 0 else len(self.widgets) - 1
+        else:
+            index = (self.widgets.index(self.focused) + step) % len(
+                self.widgets
+            )
+        self.focused = self.widgets[index]
+
+
+class UiRouter:
+    """
+    Маршрутизатор событий интерфейса.
+    Направляет события в экран, активный в данный момент, нажимает
+    виджеты и выполняет их действия по окончании анимации нажатия.
+    """
+
+    def __init__(self, screens):
+        """
+        :param screens: Словарь {имя экрана: виджеты экрана}.
+        """
+        self.screens = {
+            name: UiScreen(widgets) for name, widgets in screens.items()
+        }
+        self.pressed = []  # Виджеты, ожидающие окончания анимации
+
+    def is_focused(self, scene, widget):
+        """Проверка, находится ли виджет в фокусе на экране."""
+        screen = self.screens.get(scene)
+        return screen is not None and screen.focused is widget
+
+    def leave(self, scene):
+        """
+        Уход с экрана: наведение мыши сбрасывается, чтобы при возврате
+        на экран кнопка не оставалась подсвеченной.
+        """
+        screen = self.screens.get(scene)
+        if screen is not None:
+            screen.clear_hover()
+
+    def handle_event(self, scene, event, now):
+        """
+        Обработка события на экране.
+
+        :param scene: Имя активного экрана.
+        :param event: Событие pygame.
+        :param now: Текущее время pygame.time.get_ticks().
+        :return: True, если событие обработано интерфейсом.
+        """
+        screen = self.screens.get(scene)
+        if screen is None:
+            return False
+        widget = None
+        if event.type == pygame.MOUSEMOTION:
+            screen.hover(event.pos)
+            return screen.hovered is not None
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            widget = screen.widget_at(event.pos)
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_TAB:
+                screen.move_focus(-1 if event.mod & pygame.KMOD_SHIFT else 1)
+                return True
+            if event.key in ACTIVATE_KEYS:
+                widget = screen.focused
+        if widget is None:
+            return False
+        # Пока предыдущее нажатие не завершено, новые не принимаются
+        if not self.pressed:
+            widget.press(now)
+            self.pressed.append(widget)
+        return True
+
+    def update(self, now, game_state):
+        """Выполнение действий виджетов, анимация нажатия которых прошла."""
+        for widget in list(self.pressed):
+            if widget.update(now, game_state):
+                self.pressed.remove(widget)